@@ -1,6 +1,7 @@
 import streamlit as st
 import sys
 import os
+import uuid
 
 # Modül yolunu ekle
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -9,6 +10,12 @@ from modules.speech_to_text import SpeechToText
 from modules.text_to_speech import TextToSpeech
 from modules.intent_classifier import IntentClassifier
 from modules.command_handler import CommandHandler
+from modules.assistant import Assistant
+from modules.metrics import METRICS
+from modules.online_learner import enable_online_learning
+from modules.profiling import PROFILER, summarize
+from modules.reminder_scheduler import ReminderScheduler
+from modules.store_pool import DEFAULT_USER
 
 # Sayfa yapılandırması
 st.set_page_config(
@@ -78,32 +85,24 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Session state başlatma
-if 'conversation_history' not in st.session_state:
-    st.session_state.conversation_history = []
-
-if 'stt' not in st.session_state:
-    st.session_state.stt = None
-
-if 'tts' not in st.session_state:
-    st.session_state.tts = None
-
-if 'classifier' not in st.session_state:
-    st.session_state.classifier = None
-
-if 'handler' not in st.session_state:
-    st.session_state.handler = None
+if 'assistant' not in st.session_state:
+    st.session_state.assistant = None
 
 if 'initialized' not in st.session_state:
     st.session_state.initialized = False
 
+if 'user_id' not in st.session_state:
+    st.session_state.user_id = DEFAULT_USER
+
+# Formun bir sonraki gönderiminin kimliği; işlendikten sonra yenilenir
+if 'pending_request_id' not in st.session_state:
+    st.session_state.pending_request_id = uuid.uuid4().hex
+
 
 @st.cache_resource
 def load_models():
     """Modelleri yükler (cache ile)."""
     with st.spinner("🔄 Sistem başlatılıyor..."):
-        # Speech-to-Text (base model - hız/doğruluk dengesi)
-        stt = SpeechToText(model_size="base")
-
         # Text-to-Speech
         tts = TextToSpeech()
 
@@ -115,42 +114,41 @@ def load_models():
             st.info("📚 Model eğitiliyor, lütfen bekleyin...")
             classifier.train()
             classifier.save_model()
+        classifier.predict("merhaba")  # Vektörleştiriciyi ısıt
+
+        # Emin olunamayan ifadeler kuyruğa düşer, düzeltmeler arka planda öğrenilir
+        enable_online_learning(classifier)
 
         # Command Handler
         handler = CommandHandler()
 
-    return stt, tts, classifier, handler
+        # Hatırlatıcı zamanlayıcısı (zamanı gelenleri sesli bildirir)
+        scheduler = ReminderScheduler(handler.stores)
+        scheduler.add_listener(lambda reminder: tts.speak(f"Hatırlatma: {reminder['text']}"))
+        handler.scheduler = scheduler
+        scheduler.start()
+
+    assistant = Assistant(classifier, handler, tts=tts)
+
+    # Whisper (torch ile) arka planda yüklenir; bu sırada yazılı komutlar çalışır
+    assistant.load_stt_async(lambda: SpeechToText(model_size="base"))
+
+    return assistant
 
 
-def process_voice_command(duration=5):
+def process_voice_command(duration=5, user_id=None, profile=None):
     """Sesli komutu işler."""
     try:
-        # Ses kaydet ve tanı
-        with st.spinner("🎤 Kayıt yapılıyor..."):
-            text = st.session_state.stt.listen_and_transcribe(duration=duration)
+        # Kayıt, tanıma, komut ve sesli yanıt tek pipeline'da
+        with st.spinner("🎤 Kayıt yapılıyor..."), PROFILER.profile(profile) as run:
+            result = st.session_state.assistant.listen(duration=duration, user_id=user_id)
+            run.tag = result.intent
 
-        if not text:
+        if not result.ok:
             st.error("❌ Ses tanınamadı, lütfen tekrar deneyin.")
             return None, None
 
-        # Intent tahmin et
-        intent, confidence = st.session_state.classifier.predict(text)
-
-        # Komutu işle
-        response = st.session_state.handler.handle_command(intent, text, confidence)
-
-        # Konuşmayı kaydet
-        st.session_state.conversation_history.append({
-            'user': text,
-            'assistant': response,
-            'intent': intent,
-            'confidence': confidence
-        })
-
-        # Sesli yanıt ver
-        st.session_state.tts.speak(response)
-
-        return text, response
+        return result.text, result.response
 
     except Exception as e:
         st.error(f"❌ Hata: {e}")
@@ -169,42 +167,105 @@ def main():
     with st.sidebar:
         st.header("⚙️ Ayarlar")
 
+        # Kullanıcı (notlar ve hatırlatıcılar kullanıcıya özeldir)
+        st.text_input("👤 Kullanıcı", key="user_id")
+        user_id = st.session_state.user_id.strip() or DEFAULT_USER
+
         # Kayıt süresi
         duration = st.slider("🎙️ Kayıt Süresi (saniye)", 3, 10, 5)
 
+        # Komut başına cProfile kaydı (ASSISTANT_PROFILE=1 ile hep açık)
+        profile = st.toggle("🔬 Profil Kaydı", value=PROFILER.enabled)
+
         st.divider()
 
         # İstatistikler
         st.header("📊 İstatistikler")
-        st.metric("Toplam Konuşma", len(st.session_state.conversation_history))
+        assistant = st.session_state.assistant
+        st.metric("Toplam Konuşma", len(assistant.history(user_id)) if assistant else 0)
 
-        if st.session_state.handler:
-            notes_count = len(st.session_state.handler.notes)
-            reminders_count = len(st.session_state.handler.reminders)
+        if assistant:
+            handler = assistant.handler
+
+            with handler.stores.acquire(user_id) as store:
+                notes_count = store.count_notes()
+                reminders_count = store.count_reminders()
 
             st.metric("📝 Kaydedilen Notlar", notes_count)
             st.metric("⏰ Aktif Hatırlatıcılar", reminders_count)
 
+            # Zamanı gelen hatırlatıcıları göster
+            if handler.scheduler:
+                for reminder in handler.scheduler.pop_fired(user_id):
+                    st.toast(f"🔔 Hatırlatma: {reminder['text']}")
+                    st.warning(f"🔔 {reminder['time'][11:16]} - {reminder['text']}")
+
+            # Aşama başına gecikme (kayıt, tanıma, sınıflandırma, komut, kayıt, ses)
+            stage_stats = METRICS.summary()
+            if stage_stats:
+                with st.expander("📈 Aşama Süreleri"):
+                    for stage, stats in stage_stats.items():
+                        st.caption(f"**{stage}** · {stats['count']} ölçüm · "
+                                   f"p50 {stats['p50_ms']:.1f} ms · p95 {stats['p95_ms']:.1f} ms")
+
+                    # Intent'lerin hangi katmanda çözüldüğü (exact/keyword/model/fallback)
+                    tier_stats = assistant.classifier.tier_stats()
+                    st.caption(" · ".join(f"{tier} %{stats['share'] * 100:.0f}"
+                                          for tier, stats in tier_stats.items()))
+
+            # Handler başına çağrı sayısı ve gecikme
+            handler_stats = handler.registry.stats()
+            if handler_stats:
+                with st.expander("⏱️ Komut Süreleri"):
+                    for intent, stats in handler_stats.items():
+                        st.caption(f"**{intent}** · {stats['calls']} çağrı · "
+                                   f"p50 {stats['p50_ms']:.1f} ms · p95 {stats['p95_ms']:.1f} ms")
+
+            # Kullanıcının düşük güvenli ifadelerini etiketle; model düzeltmeyi arka planda öğrenir
+            feedback = assistant.classifier.feedback
+            if feedback:
+                pending = feedback.pending(user_id, limit=5)
+                with st.expander(f"🧠 Öğrenme ({feedback.stats(user_id or DEFAULT_USER)['pending']} bekleyen)"):
+                    tags = [item['tag'] for item in assistant.classifier.intents]
+                    for item in pending:
+                        st.caption(f"\"{item['text']}\" → {item['predicted']} (%{item['confidence'] * 100:.0f})")
+                        intent = st.selectbox("Doğru intent", tags, key=f"feedback_{item['id']}",
+                                              label_visibility="collapsed")
+                        if st.button("✅ Öğret", key=f"feedback_btn_{item['id']}"):
+                            assistant.classifier.label_feedback(item['id'], intent, user_id=user_id)
+                            st.rerun()
+                    learner = assistant.classifier.learner
+                    if learner and learner.updates:
+                        st.caption(f"{learner.updates} düzeltme öğrenildi · "
+                                   f"son güncelleme {learner.last_update_ms:.1f} ms")
+
+            # Son profil kaydının en pahalı fonksiyonları
+            if PROFILER.last_path:
+                with st.expander("🔬 Son Profil"):
+                    st.caption(PROFILER.last_path)
+                    st.code(summarize(PROFILER.last_path, limit=10), language=None)
+
         st.divider()
 
         # Notlar ve Hatırlatıcılar
         st.header("📋 Hızlı Erişim")
 
         if st.button("📝 Notlarımı Göster"):
-            if st.session_state.handler:
-                response = st.session_state.handler._handle_note_list("")
+            if assistant:
+                response = assistant.handler.handle_command('note_list', "", 1.0, user_id=user_id)
                 st.info(response)
 
         if st.button("⏰ Hatırlatıcılarımı Göster"):
-            if st.session_state.handler:
-                response = st.session_state.handler._handle_reminder_list("")
+            if assistant:
+                response = assistant.handler.handle_command('reminder_list', "", 1.0, user_id=user_id)
                 st.info(response)
 
         st.divider()
 
         # Temizleme
         if st.button("🗑️ Konuşma Geçmişini Temizle"):
-            st.session_state.conversation_history = []
+            if assistant:
+                assistant.clear_history(user_id)
             st.success("✅ Geçmiş temizlendi!")
 
         st.divider()
@@ -217,6 +278,7 @@ def main():
             - 📅 "Bugün ne günü?"
             - 🧮 "5 artı 3 kaç eder?"
             - 📝 "Market listesi not al"
+            - 🔎 "Marketle ilgili notlarım"
             - ⏰ "Yarın saat 9'da bana hatırlat"
             - 📚 "Çalışma önerisi ver"
             - 💪 "Motive et beni"
@@ -236,44 +298,48 @@ def main():
         # Modelleri yükle
         if not st.session_state.initialized:
             try:
-                stt, tts, classifier, handler = load_models()
-                st.session_state.stt = stt
-                st.session_state.tts = tts
-                st.session_state.classifier = classifier
-                st.session_state.handler = handler
+                st.session_state.assistant = load_models()
                 st.session_state.initialized = True
                 st.success("✅ Sistem hazır! Konuşmaya başlayabilirsiniz.")
             except Exception as e:
                 st.error(f"❌ Sistem başlatma hatası: {e}")
                 st.stop()
 
+        # Ses tanıma hazır olana kadar yalnızca yazılı komutlar
+        assistant = st.session_state.assistant
+        if assistant.stt_loading:
+            st.info("⏳ Ses tanıma yükleniyor... Bu sırada yazılı komut verebilirsiniz.")
+        elif not assistant.stt_ready:
+            st.warning(f"⚠ Ses tanıma kullanılamıyor: {assistant.stt_error}")
+
         # Ses kayıt butonu
-        if st.button("🎤 Kayıt Başlat", key="record_btn"):
-            user_text, assistant_response = process_voice_command(duration=duration)
+        if st.button("🎤 Kayıt Başlat", key="record_btn", disabled=not assistant.stt_ready):
+            user_text, assistant_response = process_voice_command(duration=duration, user_id=user_id,
+                                                                  profile=profile)
 
-        # Metin girişi (alternatif)
+        # Metin girişi (alternatif): yalnızca gönderildiğinde işlenir; buton,
+        # slider vb. yüzünden olan yeniden çalıştırmalar komutu tekrarlamaz
         st.divider()
-        text_input = st.text_input("💬 Veya buraya yazın:", placeholder="Komutunuzu yazın...")
+        with st.form("text_command", clear_on_submit=True):
+            text_input = st.text_input("💬 Veya buraya yazın:", placeholder="Komutunuzu yazın...")
+            submitted = st.form_submit_button("Gönder")
 
-        if text_input:
-            intent, confidence = st.session_state.classifier.predict(text_input)
-            response = st.session_state.handler.handle_command(intent, text_input, confidence)
+        if submitted and text_input.strip():
+            request_id = st.session_state.pending_request_id
+            st.session_state.pending_request_id = uuid.uuid4().hex
 
-            st.session_state.conversation_history.append({
-                'user': text_input,
-                'assistant': response,
-                'intent': intent,
-                'confidence': confidence
-            })
-
-            # Sesli yanıt
-            st.session_state.tts.speak(response)
+            # Aynı kimlikle ikinci kez gelirse asistan ilk sonucu döndürür
+            with PROFILER.profile(profile) as run:
+                result = st.session_state.assistant.process_text(text_input, user_id=user_id, wait=False,
+                                                                 request_id=request_id)
+                run.tag = result.intent
 
         # Konuşma geçmişi
         st.divider()
 
-        if st.session_state.conversation_history:
-            for idx, conv in enumerate(reversed(st.session_state.conversation_history[-10:])):
+        history = st.session_state.assistant.history(user_id, limit=10)
+        if history:
+            for idx, conv in enumerate(reversed(history)):
                 # Kullanıcı mesajı
                 st.markdown(f"""
                 <div class="chat-message user-message">
@@ -289,6 +355,27 @@ def main():
                 </div>
                 """, unsafe_allow_html=True)
 
+        # Tüm geçmiş diskte; arama ve sayfalama ile eski turlara erişilir
+        with st.expander("📜 Geçmiş Konuşmalar"):
+            query = st.text_input("🔎 Geçmişte ara", key="history_query")
+            if query.strip():
+                terms, total, turns = st.session_state.assistant.search_history(query, user_id=user_id)
+                st.caption(f"{total} eşleşme" if terms else "Arama terimi bulunamadı")
+            else:
+                cursor = st.session_state.get('history_cursor')
+                turns = st.session_state.assistant.history_page(user_id, limit=20, before_id=cursor)
+
+                col_newer, col_older = st.columns(2)
+                if cursor is not None and col_newer.button("⬆️ En yeniler"):
+                    st.session_state.history_cursor = None
+                    st.rerun()
+                if len(turns) == 20 and col_older.button("⬇️ Daha eski"):
+                    st.session_state.history_cursor = turns[-1]['id']
+                    st.rerun()
+
+            for turn in turns:
+                st.markdown(f"`{turn['timestamp']}` **{turn['user']}** → {turn['assistant']}")
+
     with col2:
         st.header("📚 Komut Örnekleri")
 
@@ -306,6 +393,7 @@ def main():
             "📝 Not Alma": [
                 "Market listesi not al",
                 "Notlarımı göster",
+                "Marketle ilgili notlarım",
                 "Notları sil"
             ],
             "⏰ Hatırlatıcı": [
@@ -0,0 +1,99 @@
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.adaptive_stt import AdaptiveSpeechToText, _percentile
+
+
+class SimulatedModel:
+    """Sabit RTF ile bekleyen sahte model (Whisper olmadan denetleyiciyi ölçmek için)."""
+
+    def __init__(self, rtf, sample_rate=16000):
+        self.rtf = rtf
+        self.sample_rate = sample_rate
+        self.calls = 0
+
+    def transcribe_audio(self, audio_data=None, audio_file=None, language="tr"):
+        self.calls += 1
+        time.sleep(self.rtf * len(audio_data) / self.sample_rate)
+        return "metin"
+
+    def close(self):
+        pass
+
+
+def run(stt, phases, clip_seconds):
+    """
+    Aşamalı yük: her aşamada (süre, saniyedeki istek) ile istek gönderir.
+
+    Returns:
+        list: İstek başına toplam gecikme (saniye)
+    """
+    audio = np.zeros(int(clip_seconds * 16000), dtype=np.float32)
+    latencies = []
+    lock = threading.Lock()
+    threads = []
+
+    def request():
+        start = time.perf_counter()
+        stt.transcribe_audio(audio_data=audio)
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+    for duration, rate in phases:
+        end = time.monotonic() + duration
+        while time.monotonic() < end:
+            thread = threading.Thread(target=request)
+            thread.start()
+            threads.append(thread)
+            time.sleep(1 / rate)
+
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uyarlamalı ses tanıma katmanı: patlamalı yükte p95 gecikme")
+    parser.add_argument('--slo', type=float, default=1.0, help="p95 hedefi (saniye)")
+    parser.add_argument('--clip', type=float, default=2.0, help="İstek başına ses süresi (saniye)")
+    parser.add_argument('--scale', type=float, default=1.0, help="Aşama sürelerini ölçekler")
+    args = parser.parse_args()
+
+    # tiny/base/small için CPU'daki kabaca RTF oranları
+    rtfs = {'tiny': 0.04, 'base': 0.1, 'small': 0.3}
+    # Sakin → patlama → sakin
+    phases = [(4 * args.scale, 1.0), (6 * args.scale, 10.0), (8 * args.scale, 1.0)]
+
+    print("=" * 66)
+    print(f"UYARLAMALI STT BENCHMARK (hedef p95 {args.slo * 1000:.0f} ms, {args.clip:.1f} sn ses)")
+    print("=" * 66)
+    print(f"{'yapılandırma':<14} {'istek':>6} {'p50 ms':>8} {'p95 ms':>8} {'geçiş':>6}  katman payları")
+
+    for name, tiers in (('sabit base', ('base',)), ('uyarlamalı', ('tiny', 'base', 'small'))):
+        models = {tier: SimulatedModel(rtfs[tier]) for tier in tiers}
+        stt = AdaptiveSpeechToText(models, start='base', slo_seconds=args.slo, down_after=0.5,
+                                   up_after=3.0 * args.scale)
+        # Isınmada ölçülen RTF'nin yerine
+        for tier, model in models.items():
+            stt.controller.observe(tier, 1.0, model.rtf)
+
+        latencies = run(stt, phases, args.clip)
+        total = sum(model.calls for model in models.values())
+        shares = " ".join(f"{tier} %{model.calls / total * 100:.0f}" for tier, model in models.items())
+        print(f"{name:<14} {len(latencies):>6} {_percentile(latencies, 0.5) * 1000:>8.0f} "
+              f"{_percentile(latencies, 0.95) * 1000:>8.0f} {stt.controller.switches:>6}  {shares}")
+
+        for decision in stt.controller.decisions():
+            print(f"    {decision['from']} → {decision['to']} ({decision['reason']}, "
+                  f"tahmin {decision['predicted_ms']:.0f} ms, sıra {decision['queue']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.audio_input import InputSession
+
+
+def callback_allocations(blocksize, calls):
+    """
+    Callback'i sentetik bloklarla çağırır ve tracemalloc ile ölçer.
+
+    Returns:
+        tuple: (tepe bayt, net bayt, blok boyutu bayt)
+    """
+    session = InputSession(blocksize=blocksize)
+    session._opened_at = time.perf_counter()
+    indata = np.random.default_rng(0).standard_normal((blocksize, 1)).astype(np.float32)
+
+    # Isınma: ilk çağrıdaki tek seferlik nesneler ölçüme girmesin
+    for _ in range(10):
+        session._callback(indata, blocksize, None, None)
+
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for _ in range(calls):
+        session._callback(indata, blocksize, None, None)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - base, current - base, indata.nbytes
+
+
+def per_command_startup(sd, sample_rate, blocksize):
+    """Her komutta cihaz açan yol (sd.rec gibi): açılıştan ilk bloğa kadar geçen süre."""
+    first = []
+    start = time.perf_counter()
+    stream = sd.InputStream(samplerate=sample_rate, blocksize=blocksize, channels=1, dtype='float32',
+                            callback=lambda *args: first or first.append(time.perf_counter()))
+    stream.start()
+    while not first:
+        time.sleep(0.001)
+    stream.stop()
+    stream.close()
+    return (first[0] - start) * 1000
+
+
+def persistent_startup(session):
+    """Açık akış: tetikten sonraki ilk yeni bloğa kadar geçen süre."""
+    start = time.perf_counter()
+    trigger = session.buffer.written
+    while session.buffer.written == trigger:
+        time.sleep(0.001)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sürekli mikrofon akışı: başlangıç gecikmesi ve callback bellek ayırma")
+    parser.add_argument('--trials', type=int, default=10)
+    parser.add_argument('--blocksize', type=int, default=512)
+    parser.add_argument('--calls', type=int, default=10000, help="Bellek ölçümünde callback çağrısı")
+    args = parser.parse_args()
+
+    print("=" * 66)
+    print("MİKROFON AKIŞI BENCHMARK")
+    print("=" * 66)
+
+    peak, net, block_bytes = callback_allocations(args.blocksize, args.calls)
+    print(f"Callback ({args.calls} çağrı, {block_bytes} baytlık blok):")
+    print(f"  tepe ek bellek: {peak} bayt · net: {net} bayt")
+    if peak < block_bytes:
+        print("  ✓ Callback ses verisi için bellek ayırmıyor (yalnızca geçici dizi görünümleri)")
+    else:
+        print("  ❌ Callback blok boyutunda bellek ayırıyor")
+
+    try:
+        import sounddevice as sd
+        sd.check_input_settings(samplerate=16000, channels=1, dtype='float32')
+    except Exception as e:
+        print(f"\n⚠ Mikrofon yok, gecikme ölçümü atlandı: {e}")
+        return
+
+    cold = [per_command_startup(sd, 16000, args.blocksize) for _ in range(args.trials)]
+
+    session = InputSession(blocksize=args.blocksize)
+    session.start()
+    time.sleep(0.5)
+    warm = [persistent_startup(session) for _ in range(args.trials)]
+    session.stop()
+
+    print(f"\nİlk bloğa kadar gecikme ({args.trials} deneme, p50):")
+    print(f"  komut başına açılış: {statistics.median(cold):7.1f} ms")
+    print(f"  açık akış:           {statistics.median(warm):7.1f} ms "
+          f"(+{session.pre_roll * 1000:.0f} ms tetik öncesi ses)")
+    print(f"  komut başına kazanç: {statistics.median(cold) - statistics.median(warm):7.1f} ms")
+    print(f"  oturum ilk açılışı:  {session.startup_ms:7.1f} ms (yalnızca bir kez)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import glob
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import soundfile as sf
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.batch_transcriber import BatchTranscriber
+from modules.speech_to_text import SpeechToText
+
+
+def load_clips(wav_dir, count, seconds, sample_rate):
+    """WAV klasöründen klip yükler; yoksa sabit tohumlu sentetik ses üretir."""
+    clips = []
+    if wav_dir:
+        for path in sorted(glob.glob(os.path.join(wav_dir, '*.wav')))[:count]:
+            audio, rate = sf.read(path, dtype='float32')
+            if audio.ndim > 1:
+                audio = audio.mean(axis=1)
+            if rate != sample_rate:
+                print(f"⚠ {path} {rate} Hz, atlandı (16 kHz gerekli)")
+                continue
+            clips.append(audio)
+
+    if not clips:
+        # Konuşma değil; yalnızca decode maliyetini ölçmek için ses benzeri sinyal
+        rng = np.random.default_rng(0)
+        t = np.arange(int(seconds * sample_rate)) / sample_rate
+        for n in range(count):
+            tone = 0.1 * np.sin(2 * np.pi * (180 + 20 * n) * t) * (1 + np.sin(2 * np.pi * 3 * t))
+            clips.append((tone + 0.01 * rng.standard_normal(len(t))).astype(np.float32))
+    return clips
+
+
+def run_level(transcribe, clips, concurrency, per_client):
+    """concurrency istemci, her biri per_client isteği sırayla gönderir."""
+    latencies = []
+    lock = threading.Lock()
+
+    def client(index):
+        local = []
+        for n in range(per_client):
+            audio = clips[(index + n) % len(clips)]
+            start = time.perf_counter()
+            transcribe(audio)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return (len(latencies) / elapsed,
+            latencies[len(latencies) // 2],
+            latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Toplu (batch) ve tekli transkripsiyon karşılaştırması")
+    parser.add_argument('--model-size', default='base')
+    parser.add_argument('--wav-dir', help="16 kHz mono WAV klasörü (yoksa sentetik ses)")
+    parser.add_argument('--seconds', type=float, default=3.0, help="Sentetik klip uzunluğu")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--per-client', type=int, default=4)
+    parser.add_argument('--max-batch', type=int, default=8)
+    parser.add_argument('--max-wait', type=float, default=0.02)
+    args = parser.parse_args()
+
+    stt = SpeechToText(model_size=args.model_size)
+    clips = load_clips(args.wav_dir, 16, args.seconds, stt.sample_rate)
+
+    # Tekli yol: modele aynı anda tek istek girer (aynı model nesnesi paylaşılır)
+    model_lock = threading.Lock()
+
+    def transcribe_single(audio):
+        with model_lock:
+            return stt.transcribe_batch([audio])[0]
+
+    batcher = BatchTranscriber(stt, max_batch=args.max_batch, max_wait=args.max_wait)
+
+    print("=" * 72)
+    print(f"TOPLU TRANSKRİPSİYON BENCHMARK (model={args.model_size}, max_batch={args.max_batch}, "
+          f"max_wait={args.max_wait * 1000:.0f} ms)")
+    print("=" * 72)
+    print(f"{'eşzamanlı':>10} {'mod':>7} {'istek/s':>9} {'p50 ms':>9} {'p95 ms':>9}")
+
+    transcribe_single(clips[0])  # Isınma
+
+    for concurrency in args.concurrency:
+        for name, transcribe in (('tekli', transcribe_single), ('batch', batcher.transcribe)):
+            throughput, p50, p95 = run_level(transcribe, clips, concurrency, args.per_client)
+            print(f"{concurrency:>10} {name:>7} {throughput:>9.2f} {p50 * 1000:>9.0f} {p95 * 1000:>9.0f}")
+
+    print(f"\nOrtalama batch boyutu: {batcher.mean_batch_size():.2f}")
+    batcher.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.calculator import calculate, compile_expression, evaluate, tokenize
+
+
+EXPRESSIONS = [
+    "5 artı 3 kaç eder",
+    "yüz yirmi beş çarpı iki",
+    "iki bin üç yüz eksi üç yüz elli",
+    "üç virgül beş artı bir virgül yirmi beş",
+    "parantez aç iki artı üç parantez kapat çarpı dört",
+    "200'ün yüzde 15'i",
+    "2 üzeri 10",
+    "10'dan 4'ü çıkar",
+]
+
+
+def bench(label, func, number):
+    seconds = timeit.timeit(func, number=number)
+    per_call = seconds / (number * len(EXPRESSIONS)) * 1e6
+    print(f"{label:<32} {per_call:8.2f} µs/ifade")
+
+
+def main():
+    print("=" * 60)
+    print("HESAP MAKİNESİ BENCHMARK")
+    print("=" * 60)
+
+    number = 2000
+
+    bench("tokenize", lambda: [tokenize(e) for e in EXPRESSIONS], number)
+
+    def cold():
+        compile_expression.cache_clear()
+        for e in EXPRESSIONS:
+            calculate(e)
+
+    bench("calculate (soğuk önbellek)", cold, number)
+
+    for e in EXPRESSIONS:
+        calculate(e)
+    bench("calculate (sıcak önbellek)", lambda: [calculate(e) for e in EXPRESSIONS], number)
+
+    trees = [compile_expression(e) for e in EXPRESSIONS]
+    bench("evaluate (yalnızca AST)", lambda: [evaluate(t) for t in trees], number)
+
+    print(f"\nÖnbellek: {compile_expression.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.intent_classifier import DEFAULT_TIERS, IntentClassifier
+from modules.metrics import METRICS
+from corpus import CORPUS
+
+
+def build_corpus(classifier):
+    """Kalıp tekrarları (trafiğin çoğu) ve replay cümleleri (serbest ifade)."""
+    repeats = [(pattern, intent['tag']) for intent in classifier.intents for pattern in intent['patterns']]
+    return {'kalıp tekrarı': repeats, 'serbest ifade': list(CORPUS)}
+
+
+def measure(classifier, corpus, rounds):
+    latencies = []
+    correct = 0
+    for _ in range(rounds):
+        for text, expected in corpus:
+            start = time.perf_counter()
+            intent, _ = classifier.predict(text)
+            latencies.append(time.perf_counter() - start)
+            correct += intent == expected
+    latencies.sort()
+    return (statistics.median(latencies) * 1e6,
+            latencies[int(len(latencies) * 0.95)] * 1e6,
+            correct / (len(corpus) * rounds))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Katmanlı intent çözümleme: gecikme ve doğruluk")
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    # Ölçüm sırasında aşama metrikleri kapalı (karşılaştırmayı etkilemesin)
+    METRICS.enabled = False
+
+    baseline = IntentClassifier(tiers=('model', 'fallback'))
+    cascade = IntentClassifier(tiers=DEFAULT_TIERS)
+    if not (baseline.load_model() and cascade.load_model()):
+        print("⚠ Kayıtlı model yok, taban çizgisi yalnızca Jaccard katmanı")
+
+    print("=" * 72)
+    print("KATMANLI INTENT ÇÖZÜMLEME BENCHMARK")
+    print("=" * 72)
+    print(f"{'korpus':<15} {'yol':<10} {'p50 µs':>9} {'p95 µs':>9} {'doğruluk':>9}")
+
+    for name, corpus in build_corpus(cascade).items():
+        for label, classifier in (('tek model', baseline), ('katmanlı', cascade)):
+            p50, p95, accuracy = measure(classifier, corpus, args.rounds)
+            print(f"{name:<15} {label:<10} {p50:>9.1f} {p95:>9.1f} {accuracy:>9.1%}")
+
+    print("\nKatman payları (katmanlı yol):")
+    for tier, stats in cascade.tier_stats().items():
+        print(f"  {tier:<10} {stats['hits']:>7}  {stats['share']:>6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.entity_extractor import extract_entities
+
+
+UTTERANCES = [
+    "saat kaç",
+    "yarın 14.30'da toplantıyı hatırlat",
+    "30 dakika sonra çay içmeyi hatırlat",
+    "iki saat otuz dakika sonra uyar",
+    "cuma akşam yedide spora gitmeyi hatırlat",
+    "45 dakikalık pomodoro başlat",
+    "yüz yirmi beş artı üç virgül beş",
+    "marketle ilgili notlarım",
+]
+
+
+def main():
+    print("=" * 60)
+    print("VARLIK ÇIKARMA BENCHMARK")
+    print("=" * 60)
+
+    number = 2000
+    for utterance in UTTERANCES:
+        seconds = timeit.timeit(lambda: extract_entities(utterance), number=number)
+        kinds = ', '.join(e.kind for e in extract_entities(utterance)) or '-'
+        print(f"{seconds / number * 1e6:8.1f} µs  '{utterance}' [{kinds}]")
+
+    seconds = timeit.timeit(lambda: [extract_entities(u) for u in UTTERANCES], number=number)
+    print(f"\nOrtalama: {seconds / (number * len(UTTERANCES)) * 1e6:.1f} µs/ifade")
+
+
+if __name__ == "__main__":
+    main()
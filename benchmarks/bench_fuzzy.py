@@ -0,0 +1,123 @@
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.intent_classifier import IntentClassifier
+from modules.turkish_text import fold_ascii
+
+
+# Sözlükte olmayan, yazımı doğru günlük kelimeler: düzeltilmemeleri gerekir.
+# Gürültülü korpus yalnızca kalıp kelimelerini bozduğu için yanlış düzeltmeyi
+# (ör. "market" → "marketle") ölçmez.
+CLEAN_WORDS = [
+    'market', 'marketten', 'zaman', 'zamanda', 'sınav', 'sınavım', 'okulda', 'kitap', 'kitabı',
+    'ekmek', 'süt', 'araba', 'telefon', 'bilgisayar', 'öğretmen', 'arkadaş', 'ödev', 'ödevim',
+    'sınıf', 'kahve', 'yemek', 'film', 'müzik', 'şarkı', 'doktor', 'hastane', 'toplantı',
+    'proje', 'rapor', 'ders', 'dersler', 'kütüphane', 'akşam', 'sabah', 'hafta', 'otobüs',
+    'annem', 'babam', 'kardeşim', 'fatura', 'kira', 'spor', 'koşu', 'doğum', 'hediye',
+    'saatler', 'havalar', 'notlar', 'planım', 'programı',
+]
+
+
+def add_noise(text, rng, rate):
+    """
+    ASR benzeri gürültü: Türkçe karakter kaybı ve kelime başına olasılıkla
+    tek harf silme, değiştirme veya bitişik harf yer değiştirmesi.
+    """
+    words = []
+    for word in fold_ascii(text).split():
+        if len(word) >= 4 and rng.random() < rate:
+            i = rng.randrange(1, len(word) - 1)
+            kind = rng.choice(('delete', 'replace', 'swap'))
+            if kind == 'delete':
+                word = word[:i] + word[i + 1:]
+            elif kind == 'replace':
+                word = word[:i] + rng.choice('abcdefghijklmnoprstuvyz') + word[i + 1:]
+            else:
+                word = word[:i - 1] + word[i] + word[i - 1] + word[i + 1:]
+        words.append(word)
+    return ' '.join(words)
+
+
+def noisy_corpus(classifier, rng, rate, copies):
+    """commands.json kalıplarından (gürültülü metin, beklenen intent) çiftleri."""
+    corpus = []
+    for intent in classifier.intents:
+        for pattern in intent['patterns']:
+            for _ in range(copies):
+                corpus.append((add_noise(pattern, rng, rate), intent['tag']))
+    return corpus
+
+
+def evaluate(corpus, predict):
+    unknown = correct = 0
+    for text, expected in corpus:
+        intent, _ = predict(text)
+        unknown += intent == 'unknown'
+        correct += intent == expected
+    return unknown / len(corpus), correct / len(corpus)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yazım hatası düzeltme: gecikme ve bilinmeyen oranı")
+    parser.add_argument('--rate', type=float, default=0.5, help="Kelime başına harf hatası olasılığı")
+    parser.add_argument('--copies', type=int, default=3, help="Kalıp başına gürültülü kopya")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    plain = IntentClassifier(fuzzy=False)
+    fuzzy = IntentClassifier(fuzzy=True)
+    has_model = plain.load_model() and fuzzy.load_model()
+
+    corpus = noisy_corpus(fuzzy, random.Random(args.seed), args.rate, args.copies)
+    tokens = sorted({token for text, _ in corpus for token in fuzzy._clean_text(text).split()})
+
+    print("=" * 66)
+    print(f"YAZIM DÜZELTME BENCHMARK ({len(fuzzy.speller)} kelimelik sözlük, "
+          f"{len(corpus)} gürültülü ifade)")
+    print("=" * 66)
+
+    # Önbelleksiz (ilk görülen token) ve önbellekli (tekrar eden token) sorgu
+    number = 20
+    speller = fuzzy.speller
+    cold = timeit.timeit(lambda: [speller._lookup(t) for t in tokens], number=number)
+    warm = timeit.timeit(lambda: [speller.lookup(t) for t in tokens], number=number)
+    print(f"Token sorgusu (soğuk):   {cold / (number * len(tokens)) * 1e6:8.2f} µs")
+    print(f"Token sorgusu (önbellek):{warm / (number * len(tokens)) * 1e6:8.2f} µs")
+
+    sample = [text for text, _ in corpus[:50]]
+    seconds = timeit.timeit(lambda: [fuzzy.preprocess_text(t) for t in sample], number=number)
+    print(f"İfade düzeltme:          {seconds / (number * len(sample)) * 1e6:8.2f} µs")
+
+    print(f"\n{'yol':<22} {'bilinmeyen':>11} {'doğruluk':>10}")
+    paths = [('kural (düzeltmesiz)', plain._rule_based_prediction),
+             ('kural (düzeltmeli)', fuzzy._rule_based_prediction)]
+    if has_model:
+        paths += [('model (düzeltmesiz)', plain.predict), ('model (düzeltmeli)', fuzzy.predict)]
+    else:
+        print("⚠ Kayıtlı model yok, yalnızca kural tabanlı yol ölçülüyor")
+
+    for name, predict in paths:
+        unknown_rate, accuracy = evaluate(corpus, predict)
+        print(f"{name:<22} {unknown_rate:>10.1%} {accuracy:>10.1%}")
+
+    # Yanlış düzeltme: doğru ama sözlükte olmayan kelimenin değiştirilmesi
+    clean = [word for word in CLEAN_WORDS if word not in fuzzy.speller]
+    rewritten = [(word, match[0]) for word in clean
+                 for match in [fuzzy.speller.lookup(word)] if match and match[0] != word]
+    print(f"\nSözlük dışı doğru kelime: {len(clean)} · değiştirilen: "
+          f"{len(rewritten)} ({len(rewritten) / len(clean):.1%})")
+    for word, corrected in rewritten:
+        print(f"  {word!r} → {corrected!r}")
+
+    print("\nÖrnekler:")
+    for text, _ in corpus[:8]:
+        print(f"  {text!r:<36} → {fuzzy.preprocess_text(text)!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.intent_classifier import IntentClassifier
+from modules.segmenter import UtteranceSegmenter
+
+
+SINGLE = [
+    "saat kaç",
+    "Saat kaç?",
+    "30 dakika sonra çay içmeyi hatırlat",
+    "yarın 14.30'da toplantıyı hatırlat",
+    "bunu not al yarın market",
+]
+
+COMPOUND = [
+    "saat kaç ve yarın 9'da spora gitmeyi hatırlat",
+    "merhaba, bugün ayın kaçı",
+    "fıkra anlat, bir de motivasyon ver",
+]
+
+
+def main():
+    classifier = IntentClassifier()
+    if not classifier.load_model():
+        print("⚠ Kayıtlı model yok, kural tabanlı sınıflandırma ölçülüyor")
+    segmenter = UtteranceSegmenter(classifier)
+
+    print("=" * 72)
+    print("BİRLEŞİK İFADE BÖLME BENCHMARK")
+    print("=" * 72)
+    print(f"{'predict µs':>11} {'segment µs':>11} {'ek µs':>8}  ifade")
+
+    number = 200
+    for utterance in SINGLE + COMPOUND:
+        base = timeit.timeit(lambda: classifier.predict(utterance), number=number) / number * 1e6
+        split = timeit.timeit(lambda: segmenter.segment(utterance), number=number) / number * 1e6
+        intents = ' + '.join(intent for _, intent, _ in segmenter.segment(utterance))
+        print(f"{base:>11.1f} {split:>11.1f} {split - base:>8.1f}  '{utterance}' [{intents}]")
+
+
+if __name__ == "__main__":
+    main()
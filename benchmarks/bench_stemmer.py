@@ -0,0 +1,64 @@
+import os
+import pickle
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.intent_classifier import IntentClassifier
+from modules.turkish_text import stem_word
+
+
+def vocabulary(classifier):
+    """Eğitim kalıplarının ön işlenmiş kelime kümesi."""
+    return {word for intent in classifier.intents for pattern in intent['patterns']
+            for word in classifier.preprocess_text(pattern).split()}
+
+
+def model_size(classifier):
+    """Eğitilmiş modelin özellik sayısı ve pickle boyutu (sklearn yoksa None)."""
+    try:
+        classifier.train()
+    except ImportError:
+        return None
+    data = pickle.dumps({'vectorizer': classifier.vectorizer, 'classifier': classifier.classifier})
+    return len(classifier.vectorizer.vocabulary_), len(data)
+
+
+def main():
+    plain = IntentClassifier(stem=False)
+    stemmed = IntentClassifier(stem=True)
+
+    words = [word for intent in plain.intents for pattern in intent['patterns']
+             for word in plain._clean_text(pattern).split()]
+    sentences = [pattern for intent in plain.intents for pattern in intent['patterns']]
+
+    print("=" * 64)
+    print(f"KÖK BULMA BENCHMARK ({len(words)} kelime, {len(sentences)} kalıp)")
+    print("=" * 64)
+
+    number = 50
+    cold = timeit.timeit(lambda: [stem_word.__wrapped__(w) for w in words], number=number)
+    warm = timeit.timeit(lambda: [stem_word(w) for w in words], number=number)
+    print(f"stem_word (önbelleksiz): {len(words) * number / cold:>12,.0f} kelime/s")
+    print(f"stem_word (önbellekli):  {len(words) * number / warm:>12,.0f} kelime/s")
+    print(f"Önbellek: {stem_word.cache_info()}")
+
+    for name, classifier in (('kök yok', plain), ('kök', stemmed)):
+        seconds = timeit.timeit(lambda: [classifier.preprocess_text(s) for s in sentences], number=number)
+        print(f"preprocess_text ({name}): {seconds / (number * len(sentences)) * 1e6:>8.2f} µs/ifade")
+
+    plain_vocab, stemmed_vocab = vocabulary(plain), vocabulary(stemmed)
+    print(f"\nKelime dağarcığı: {len(plain_vocab)} → {len(stemmed_vocab)} "
+          f"(%{(1 - len(stemmed_vocab) / len(plain_vocab)) * 100:.0f} azalma)")
+
+    plain_size, stemmed_size = model_size(plain), model_size(stemmed)
+    if plain_size and stemmed_size:
+        print(f"TF-IDF özellikleri: {plain_size[0]} → {stemmed_size[0]}")
+        print(f"Model boyutu:       {plain_size[1] / 1024:.1f} KB → {stemmed_size[1] / 1024:.1f} KB")
+    else:
+        print("⚠ scikit-learn yok, model boyutu ölçülmedi")
+
+
+if __name__ == "__main__":
+    main()
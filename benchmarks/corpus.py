@@ -0,0 +1,23 @@
+# Benchmark'ların paylaştığı ifade korpusu. Bağımlılığı yoktur; yalnızca
+# sınıflandırıcıyı ölçen benchmark'lar ses ve TTS yığını kurulu olmadan da çalışır.
+
+# (metin, beklenen intent) — train_model.py ve modül testlerindeki cümleler
+CORPUS = [
+    ("merhaba nasılsın", "greeting"),
+    ("saat kaç şimdi", "time"),
+    ("bugün ne günü", "date"),
+    ("5 artı 3 kaç eder", "calculator"),
+    ("yüz yirmi beş çarpı iki", "calculator"),
+    ("bunu not al yarın market", "note_add"),
+    ("notlarımı göster", "note_list"),
+    ("marketle ilgili notlarım", "note_search"),
+    ("30 dakika sonra çay içmeyi hatırlat", "reminder_add"),
+    ("yarın sabah 8'de hatırlat", "reminder_add"),
+    ("hatırlatıcılar neler", "reminder_list"),
+    ("çalışma önerisi ver", "study_advice"),
+    ("45 dakikalık pomodoro başlat", "study_timer"),
+    ("motivasyon lazım bana", "motivate"),
+    ("fıkra anlat", "joke"),
+    ("teşekkürler çok sağol", "thanks"),
+    ("görüşürüz", "goodbye"),
+]
@@ -0,0 +1,80 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Uygulamanın açılışta içe aktardığı modüller ve karşılaştırma için ağır bağımlılıklar
+TARGETS = [
+    "modules.speech_to_text",
+    "modules.intent_classifier",
+    "modules.command_handler",
+    "modules.assistant",
+    "modules.text_to_speech",
+    "whisper",
+    "sklearn.model_selection",
+]
+
+_LINE_RE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure(module):
+    """
+    Modülü temiz bir yorumlayıcıda -X importtime ile içe aktarır.
+
+    Returns:
+        tuple: (toplam µs, [(kümülatif µs, paket), ...]) veya hata mesajı
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+        env={**os.environ, "PYTHONPATH": ROOT},
+    )
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            cumulative, indent, name = int(match.group(2)), len(match.group(3)), match.group(4)
+            entries.append((cumulative, indent, name))
+
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "bilinmeyen hata"
+        return None, error
+
+    # En üst seviye satırların toplamı = modülün toplam içe aktarma süresi
+    top_level = min(indent for _, indent, _ in entries) if entries else 0
+    total = sum(cumulative for cumulative, indent, _ in entries if indent == top_level)
+
+    # En pahalı kök paketler (alt modüller kendi paketlerinin süresine dahildir)
+    roots = sorted(((cumulative, name) for cumulative, indent, name in entries if '.' not in name),
+                   reverse=True)
+    return total, roots
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Açılış içe aktarma süreleri (-X importtime)")
+    parser.add_argument('modules', nargs='*', default=TARGETS)
+    parser.add_argument('--top', type=int, default=5, help="Modül başına gösterilecek en pahalı paket")
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print("İÇE AKTARMA SÜRELERİ (soğuk yorumlayıcı, -X importtime)")
+    print("=" * 72)
+
+    for module in args.modules:
+        total, detail = measure(module)
+        if total is None:
+            print(f"{module:<28} {'-':>10}   ❌ {detail}")
+            continue
+
+        print(f"{module:<28} {total / 1000:>8.1f} ms")
+        for cumulative, name in detail[:args.top]:
+            print(f"    {name:<24} {cumulative / 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import asyncio
+import random
+import time
+
+import aiohttp
+
+
+UTTERANCES = [
+    "saat kaç",
+    "bugün ne günü",
+    "5 artı 3 kaç eder",
+    "yüz yirmi beş çarpı iki",
+    "yarın market alışverişini not al",
+    "notlarım neler",
+    "marketle ilgili notlarım",
+    "30 dakika sonra çay içmeyi hatırlat",
+    "çalışma önerisi ver",
+    "motive et beni",
+]
+
+
+def percentile(sorted_values, q):
+    """Sıralı listeden yüzdelik (en yakın sıra)."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def worker(session, url, deadline, users, latencies, statuses):
+    while time.perf_counter() < deadline:
+        payload = {'text': random.choice(UTTERANCES), 'user_id': random.choice(users)}
+        start = time.perf_counter()
+        try:
+            async with session.post(url, json=payload) as response:
+                await response.read()
+                status = response.status
+        except aiohttp.ClientError:
+            status = 'bağlantı hatası'
+        latencies.append(time.perf_counter() - start)
+        statuses[status] = statuses.get(status, 0) + 1
+
+
+async def run(url, concurrency, duration, users):
+    latencies = []
+    statuses = {}
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=60)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(worker(session, url, deadline, users, latencies, statuses)
+                               for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return latencies, statuses, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="server.py metin uç noktası için yük üretici")
+    parser.add_argument('--url', default='http://127.0.0.1:8080/api/command')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32, 128])
+    parser.add_argument('--duration', type=float, default=10.0, help="Seviye başına süre (saniye)")
+    parser.add_argument('--users', type=int, default=20, help="Rastgele seçilecek kullanıcı sayısı")
+    args = parser.parse_args()
+
+    users = [f"yuk{n}" for n in range(args.users)]
+
+    print("=" * 72)
+    print("SUNUCU YÜK TESTİ")
+    print("=" * 72)
+    print(f"{'eşzamanlı':>10} {'istek/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}   durumlar")
+
+    for concurrency in args.concurrency:
+        latencies, statuses, elapsed = asyncio.run(run(args.url, concurrency, args.duration, users))
+        ok = statuses.get(200, 0)
+        latencies.sort()
+        status_text = ', '.join(f"{status}: {count}" for status, count in sorted(statuses.items(), key=str))
+        print(f"{concurrency:>10} {ok / elapsed:>10.1f} "
+              f"{percentile(latencies, 0.50) * 1000:>9.1f} "
+              f"{percentile(latencies, 0.95) * 1000:>9.1f} "
+              f"{percentile(latencies, 0.99) * 1000:>9.1f}   {status_text}")
+
+
+if __name__ == "__main__":
+    main()
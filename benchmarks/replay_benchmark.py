@@ -0,0 +1,143 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.assistant import Assistant
+from modules.command_handler import CommandHandler
+from modules.intent_classifier import IntentClassifier
+from modules.speech_to_text import SpeechToText
+from modules.text_to_speech import TextToSpeech
+
+from corpus import CORPUS
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "replay")
+
+
+def load_corpus(path):
+    """JSONL korpus: her satır {"text", "intent", "wav"?}; wav verilirse sentezlenmez."""
+    if not path:
+        return [{'text': text, 'intent': intent} for text, intent in CORPUS]
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def render_fixtures(corpus, fixture_dir, rerender=False):
+    """
+    Kaydı olmayan cümleleri TextToSpeech.save_to_file ile WAV'a çevirir.
+
+    Dosya adı metnin özetinden türetilir; aynı korpusla tekrar çalıştırmada
+    sentez atlanır (CI önbelleğine uygun).
+    """
+    os.makedirs(fixture_dir, exist_ok=True)
+    tts = None
+
+    for item in corpus:
+        if item.get('wav'):
+            continue
+        digest = hashlib.sha1(item['text'].encode('utf-8')).hexdigest()[:12]
+        item['wav'] = os.path.join(fixture_dir, f"{digest}.wav")
+        if os.path.exists(item['wav']) and not rerender:
+            continue
+
+        if tts is None:
+            tts = TextToSpeech()
+            if tts.engine is None:
+                raise RuntimeError("TTS motoru yok; Linux'ta espeak-ng kurulu olmalı veya --corpus ile WAV verin")
+        tts.save_to_file(item['text'], item['wav'])
+
+
+def percentile(values, q):
+    """Sıralı olmayan listeden yüzdelik (en yakın sıra)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ses → STT → sınıflandırıcı → handler uçtan uca replay")
+    parser.add_argument('--model-size', default='tiny', help="Whisper modeli (CI için tiny)")
+    parser.add_argument('--corpus', help="JSONL korpus (varsayılan: yerleşik cümleler)")
+    parser.add_argument('--fixture-dir', default=FIXTURE_DIR)
+    parser.add_argument('--rerender', action='store_true', help="Var olan WAV'ları yeniden sentezle")
+    parser.add_argument('--min-accuracy', type=float, default=0.0,
+                        help="Intent doğruluğu bunun altındaysa çıkış kodu 1 (CI kapısı)")
+    args = parser.parse_args()
+
+    import whisper  # load_audio: ffmpeg ile 16 kHz mono float32'ye çevirir
+
+    corpus = load_corpus(args.corpus)
+    render_fixtures(corpus, args.fixture_dir, rerender=args.rerender)
+
+    classifier = IntentClassifier()
+    if not classifier.load_model():
+        classifier.train()
+
+    # Replay notları/hatırlatıcıları gerçek veriye karışmasın
+    data_dir = tempfile.mkdtemp(prefix="replay-")
+    handler = CommandHandler(notes_file=None, reminders_file=None,
+                             db_file=os.path.join(data_dir, "replay.db"),
+                             users_dir=os.path.join(data_dir, "users"))
+
+    assistant = Assistant(classifier, handler, stt=SpeechToText(model_size=args.model_size))
+    assistant.stt.warmup()
+
+    stage_times = {}
+    rtf_values = []
+    correct = text_correct = 0
+
+    print("=" * 78)
+    print(f"UÇTAN UCA REPLAY (model={args.model_size}, {len(corpus)} ifade)")
+    print("=" * 78)
+
+    total_start = time.perf_counter()
+    for item in corpus:
+        audio = whisper.load_audio(item['wav'])
+        duration = len(audio) / assistant.stt.sample_rate
+
+        result = assistant.process_audio(audio, user_id="replay", speak=False)
+
+        # Aynı cümle metin olarak verilseydi (STT hatasının payını ayırmak için)
+        text_intent, _ = classifier.predict(item['text'])
+
+        for stage, ms in result.timings.items():
+            stage_times.setdefault(stage, []).append(ms)
+        if 'transcribe' in result.timings and duration:
+            rtf_values.append(result.timings['transcribe'] / 1000 / duration)
+
+        ok = result.intent == item['intent']
+        correct += ok
+        text_correct += text_intent == item['intent']
+        mark = "✓" if ok else "✗"
+        print(f"{mark} {item['text']!r:<40} → {result.text!r:<40} [{result.intent}]")
+
+    elapsed = time.perf_counter() - total_start
+    assistant.close()
+
+    n = len(corpus)
+    print("\n" + "-" * 78)
+    print(f"Intent doğruluğu (ses):   {correct / n:.1%}  ({correct}/{n})")
+    print(f"Intent doğruluğu (metin): {text_correct / n:.1%}  (STT'siz üst sınır)")
+    if rtf_values:
+        print(f"Gerçek zaman faktörü:     ort {sum(rtf_values) / len(rtf_values):.3f}  "
+              f"p95 {percentile(rtf_values, 0.95):.3f}  (1'den küçük = gerçek zamandan hızlı)")
+    print(f"Toplam süre:              {elapsed:.1f} s")
+
+    print(f"\n{'aşama':<12} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}")
+    for stage, values in stage_times.items():
+        print(f"{stage:<12} {percentile(values, 0.50):>10.2f} {percentile(values, 0.95):>10.2f} {max(values):>10.2f}")
+
+    if correct / n < args.min_accuracy:
+        print(f"\n❌ Doğruluk {args.min_accuracy:.0%} eşiğinin altında")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
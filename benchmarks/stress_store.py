@@ -0,0 +1,120 @@
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.note_store import NoteStore
+
+
+def run_threads(db_file, threads, per_thread, flush_interval):
+    """Tek süreçte, aynı NoteStore'a çok sayıda thread ile yazar."""
+    store = NoteStore(db_file, notes_file=None, reminders_file=None, flush_interval=flush_interval)
+    ids = []
+    ids_lock = threading.Lock()
+    errors = []
+
+    def writer(index):
+        local = []
+        try:
+            for n in range(per_thread):
+                local.append(store.add_note(f"thread {index} not {n} market")['id'])
+        except Exception as e:
+            errors.append(e)
+        with ids_lock:
+            ids.extend(local)
+
+    workers = [threading.Thread(target=writer, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    store.flush()
+    elapsed = time.perf_counter() - start
+
+    count = store.count_notes()
+    flushes = store.flush_count
+    store.close()
+    return ids, count, errors, elapsed, flushes
+
+
+def _process_writer(db_file, per_process, flush_interval, queue):
+    store = NoteStore(db_file, notes_file=None, reminders_file=None, flush_interval=flush_interval)
+    ids = [store.add_note(f"süreç {os.getpid()} not {n}")['id'] for n in range(per_process)]
+    store.close()
+    queue.put(ids)
+
+
+def run_processes(db_file, processes, per_process, flush_interval):
+    """Aynı veritabanına birden fazla süreçten yazar."""
+    queue = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_process_writer, args=(db_file, per_process, flush_interval, queue))
+               for _ in range(processes)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    ids = []
+    for _ in workers:
+        ids.extend(queue.get())
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+
+    store = NoteStore(db_file, notes_file=None, reminders_file=None)
+    count = store.count_notes()
+    store.close()
+    return ids, count, elapsed
+
+
+def report(label, ids, count, expected, elapsed, extra=""):
+    ok = len(ids) == expected and len(set(ids)) == expected and count == expected
+    print(f"{'✓' if ok else '❌'} {label:<28} {expected} yazma, {count} kayıt, "
+          f"{len(set(ids))} benzersiz id, {expected / elapsed:,.0f} yazma/sn {extra}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NoteStore eşzamanlılık stres testi")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--per-thread", type=int, default=500)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--per-process", type=int, default=500)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("NOT DEPOSU STRES TESTİ")
+    print("=" * 60)
+
+    workdir = tempfile.mkdtemp(prefix="ashley-stress-")
+    all_ok = True
+    try:
+        expected = args.threads * args.per_thread
+        for flush_interval in (0, 0.05):
+            db_file = os.path.join(workdir, f"threads-{flush_interval}.db")
+            ids, count, errors, elapsed, flushes = run_threads(db_file, args.threads, args.per_thread, flush_interval)
+            all_ok &= report(f"thread'ler (flush={flush_interval}s)", ids, count, expected, elapsed,
+                             f"· {flushes} commit")
+            for e in errors[:3]:
+                print(f"   ❌ {e}")
+            all_ok &= not errors
+
+        expected = args.processes * args.per_process
+        for flush_interval in (0, 0.05):
+            db_file = os.path.join(workdir, f"processes-{flush_interval}.db")
+            ids, count, elapsed = run_processes(db_file, args.processes, args.per_process, flush_interval)
+            all_ok &= report(f"süreçler (flush={flush_interval}s)", ids, count, expected, elapsed)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n✅ Tüm kontroller geçti" if all_ok else "\n❌ Hata bulundu")
+    sys.exit(0 if all_ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+def _percentile(values, q):
+    """Küçük pencereler için sıralayarak yüzdelik (boşsa 0.0)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class TierController:
+    def __init__(self, tiers, start=None, slo_seconds=3.0, window=50, high=1.0, low=0.6, min_samples=5,
+                 down_after=2.0, up_after=30.0, max_log=100):
+        """
+        Ses tanıma katmanı seçicisi (hızlıdan doğruya sıralı katmanlar).
+
+        Her katman için ölçülen gerçek zaman oranı (RTF = çözüm süresi /
+        ses süresi) tutulur. Bir sonraki isteğin gecikmesi, kuyruktaki
+        istekler de beklenerek tahmin edilir:
+
+            tahmin = (sıra + 1) × p95(RTF) × ortalama ses süresi
+
+        Tahmin veya son isteklerin p95 gecikmesi SLO'yu (high) aşarsa
+        SLO'ya sığan daha hızlı bir katmana inilir. Sıra boşken hem üst
+        katmanın tahmini hem geçerli katmanın son p95 gecikmesi SLO'nun low
+        katının altındaysa bir üst katmana çıkılır. Eşiklerin farklı olması ve
+        geçişler arası bekleme süreleri (iniş hızlı, çıkış yavaş) katmanın
+        gidip gelmesini önler.
+
+        Args:
+            tiers: Katman adları (hızlıdan doğruya)
+            start: Başlangıç katmanı (None = en doğru)
+            slo_seconds: p95 transkripsiyon gecikmesi hedefi (saniye)
+            window: Katman başına tutulan son ölçüm sayısı
+            high: İniş eşiği (SLO katı)
+            low: Çıkış eşiği (SLO katı)
+            min_samples: Karar için gereken en az ölçüm
+            down_after: Son geçişten sonra inmek için beklenecek süre (saniye)
+            up_after: Son geçişten sonra çıkmak için beklenecek süre (saniye)
+            max_log: Karar günlüğünde tutulacak kayıt
+        """
+        self.tiers = list(tiers)
+        self.current = self.tiers.index(start) if start is not None else len(self.tiers) - 1
+        self.slo_seconds = slo_seconds
+        self.high = high
+        self.low = low
+        self.min_samples = min_samples
+        self.down_after = down_after
+        self.up_after = up_after
+
+        self._rtf = {tier: deque(maxlen=window) for tier in self.tiers}
+        self._latency = deque(maxlen=window)       # Geçerli katmanda sıra beklemesi dahil
+        self._audio_seconds = deque(maxlen=window)
+        self._log = deque(maxlen=max_log)
+        self._switched_at = time.monotonic()
+        self._lock = threading.Lock()
+        self.switches = 0
+
+    @property
+    def tier(self):
+        return self.tiers[self.current]
+
+    def observe(self, tier, audio_seconds, compute_seconds, latency_seconds=None):
+        """
+        Tamamlanan bir transkripsiyonu kaydeder.
+
+        Args:
+            tier: Çözümü yapan katman
+            audio_seconds: Ses süresi
+            compute_seconds: Yalnızca model süresi (RTF için)
+            latency_seconds: Sıra beklemesi dahil toplam süre
+        """
+        if audio_seconds <= 0:
+            return
+        with self._lock:
+            self._rtf[tier].append(compute_seconds / audio_seconds)
+            self._audio_seconds.append(audio_seconds)
+            if tier == self.tier and latency_seconds is not None:
+                self._latency.append(latency_seconds)
+
+    def estimate(self, index, depth):
+        """Katmanda, önünde depth istek varken yeni bir isteğin tahmini p95 gecikmesi (saniye)."""
+        rtf = _percentile(self._rtf[self.tiers[index]], 0.95)
+        audio = sum(self._audio_seconds) / len(self._audio_seconds) if self._audio_seconds else 0.0
+        return (depth + 1) * rtf * audio
+
+    def choose(self, depth=0):
+        """
+        Bir sonraki istek için katmanı seçer.
+
+        Args:
+            depth: İsteğin önünde bekleyen veya çözülen istek sayısı
+
+        Returns:
+            str: Katman adı
+        """
+        with self._lock:
+            now = time.monotonic()
+            since = now - self._switched_at
+            current = self.current
+
+            # İniş tahmine dayanır: sıra büyürken tamamlanan istek beklenmez
+            if current > 0 and since >= self.down_after and self._rtf[self.tier]:
+                predicted = self.estimate(current, depth)
+                observed = _percentile(self._latency, 0.95) if len(self._latency) >= self.min_samples else 0.0
+                limit = self.slo_seconds * self.high
+                if predicted > limit or observed > limit:
+                    # Tahmini SLO'ya sığan en doğru katmana; hiçbiri sığmıyorsa en hızlıya
+                    target = 0
+                    for index in range(current - 1, 0, -1):
+                        if self.estimate(index, depth) <= limit:
+                            target = index
+                            break
+                    self._switch(target, "slo", now, depth, max(predicted, observed))
+                    return self.tier
+
+            if (current < len(self.tiers) - 1 and depth == 0 and since >= self.up_after
+                    and len(self._rtf[self.tier]) >= self.min_samples):
+                # Üst katman hiç ölçülmediyse (ısınma dahil) tahmin yapılamaz, çıkılmaz
+                if self._rtf[self.tiers[current + 1]]:
+                    predicted = self.estimate(current + 1, 0)
+                    observed = _percentile(self._latency, 0.95)
+                    if max(predicted, observed) < self.slo_seconds * self.low:
+                        self._switch(current + 1, "headroom", now, depth, predicted)
+
+            return self.tier
+
+    def _switch(self, index, reason, now, depth, predicted):
+        self._log.append({
+            'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'from': self.tier,
+            'to': self.tiers[index],
+            'reason': reason,
+            'predicted_ms': round(predicted * 1000, 1),
+            'queue': depth,
+        })
+        print(f"🔀 Ses tanıma katmanı: {self.tier} → {self.tiers[index]} ({reason}, "
+              f"tahmin {predicted * 1000:.0f} ms, sıra {depth})")
+        self.current = index
+        self._switched_at = now
+        self._latency.clear()
+        self.switches += 1
+
+    def decisions(self, limit=None):
+        """Karar günlüğü (eskiden yeniye)."""
+        with self._lock:
+            entries = list(self._log)
+        return entries[-limit:] if limit else entries
+
+    def stats(self):
+        with self._lock:
+            return {
+                'tier': self.tier,
+                'slo_ms': self.slo_seconds * 1000,
+                'p95_ms': round(_percentile(self._latency, 0.95) * 1000, 1),
+                'switches': self.switches,
+                'rtf_p95': {tier: round(_percentile(values, 0.95), 3)
+                            for tier, values in self._rtf.items() if values},
+            }
+
+
+class AdaptiveSpeechToText:
+    def __init__(self, models, start=None, backlog=None, **options):
+        """
+        Önceden yüklenmiş birden çok SpeechToText arasında yüke göre seçim yapar.
+
+        SpeechToText ile aynı arayüzü sunar; Assistant ve BatchTranscriber
+        değişmeden kullanır. Modeller aynı CPU'yu paylaştığı için aynı anda
+        tek istek çözülür. Katman, istek sıradan çıktığı anda arkasında
+        bekleyenlere göre seçilir; böylece inişten sırada bekleyenler de
+        yararlanır ve yoğunlukta kuyruk sınırsız büyümek yerine daha hızlı
+        (daha az doğru) modelle eritilir.
+
+        Args:
+            models: {katman adı: SpeechToText}, hızlıdan doğruya sıralı
+            start: Başlangıç katmanı (None = en doğru)
+            backlog: Dış kuyrukta bekleyen istek sayısını döndüren fonksiyon
+                (ör. BatchTranscriber kuyruğu)
+            **options: TierController ayarları (slo_seconds, high, low, ...)
+        """
+        self.models = dict(models)
+        self.controller = TierController(list(self.models), start=start, **options)
+        self.backlog = backlog
+
+        first = next(iter(self.models.values()))
+        self.sample_rate = first.sample_rate
+        # Mikrofon akışı açık olan modelden kayıt yapılır
+        self._recorder = next((stt for stt in self.models.values() if getattr(stt, 'input', None)), first)
+        self.input = getattr(self._recorder, 'input', None)
+
+        self._lock = threading.Lock()
+        self._depth = 0
+        self._depth_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, sizes=("tiny", "base", "small"), start="base", persistent_input=False, **options):
+        """
+        Whisper modellerini yükler.
+
+        Tüm katmanlar bellekte tutulur; tek kullanıcılı kurulumlarda yük
+        dalgalanmadığından tek bir SpeechToText yeterlidir, bu sınıf
+        eşzamanlı istek alan sunucu içindir.
+
+        Args:
+            sizes: Model boyutları (hızlıdan doğruya)
+            start: Başlangıç modeli
+            persistent_input: İlk model mikrofon akışı açsın mı (sunucuda gerekmez)
+        """
+        from modules.speech_to_text import SpeechToText
+
+        models = {size: SpeechToText(model_size=size, persistent_input=persistent_input and index == 0)
+                  for index, size in enumerate(sizes)}
+        return cls(models, start=start, **options)
+
+    @property
+    def tier(self):
+        return self.controller.tier
+
+    def set_backlog(self, backlog):
+        """
+        Dış kuyruğu bağlar; kuyruk bu nesneyle kurulduğunda (ör. BatchTranscriber)
+        kurucuya verilemez.
+
+        Args:
+            backlog: Dış kuyrukta bekleyen istek sayısını döndüren fonksiyon
+        """
+        self.backlog = backlog
+
+    def _run(self, audio_seconds, call):
+        with self._depth_lock:
+            self._depth += 1
+        try:
+            start = time.perf_counter()
+            with self._lock:
+                with self._depth_lock:
+                    waiting = self._depth - 1
+                queued = self.backlog() if self.backlog is not None else 0
+                tier = self.controller.choose(waiting + queued)
+                compute_start = time.perf_counter()
+                result = call(self.models[tier])
+            end = time.perf_counter()
+            self.controller.observe(tier, audio_seconds, end - compute_start, end - start)
+            return result
+        finally:
+            with self._depth_lock:
+                self._depth -= 1
+
+    def transcribe_audio(self, audio_data=None, audio_file=None, language="tr"):
+        """SpeechToText.transcribe_audio; katman yüke göre seçilir."""
+        if audio_data is None:
+            # Dosya süresi bilinmez; ölçüme girmeden geçerli katmanda çözülür
+            return self.models[self.tier].transcribe_audio(audio_file=audio_file, language=language)
+
+        audio = np.asarray(audio_data, dtype=np.float32).flatten()
+        return self._run(len(audio) / self.sample_rate,
+                         lambda stt: stt.transcribe_audio(audio_data=audio, language=language))
+
+    def transcribe_batch(self, audios, language="tr"):
+        """SpeechToText.transcribe_batch; tüm batch aynı katmanda çözülür."""
+        if not audios:
+            return []
+        seconds = sum(len(audio) for audio in audios) / self.sample_rate
+        return self._run(seconds, lambda stt: stt.transcribe_batch(audios, language=language))
+
+    def record_audio(self, duration=5, sample_rate=None):
+        return self._recorder.record_audio(duration, sample_rate)
+
+    def warmup(self, batched=False):
+        """
+        Tüm modelleri ısıtır ve ilk RTF ölçümlerini alır.
+
+        Böylece denetleyici hiç kullanılmamış bir katmana geçmeden önce de
+        tahmin yapabilir. Ölçüm, isteklerin çözüleceği yolla yapılmalıdır:
+        transcribe_batch her sesi 30 saniyelik pencereye doldurduğundan
+        RTF'si transcribe_audio'dan çok farklıdır.
+
+        Args:
+            batched: İstekler transcribe_batch ile çözülecekse True
+                (ör. BatchTranscriber arkasında)
+        """
+        silence = np.zeros(self.sample_rate * 2, dtype=np.float32)
+        for tier, stt in self.models.items():
+            stt.warmup()
+            start = time.perf_counter()
+            if batched:
+                stt.transcribe_batch([silence])
+            else:
+                stt.transcribe_audio(audio_data=silence)
+            self.controller.observe(tier, len(silence) / self.sample_rate, time.perf_counter() - start)
+
+    def close(self):
+        for stt in self.models.values():
+            stt.close()
+
+    def stats(self):
+        """Denetleyici durumu, sıra derinliği ve son kararlar."""
+        return {**self.controller.stats(), 'queue': self._depth, 'decisions': self.controller.decisions(10)}
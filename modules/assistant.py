@@ -0,0 +1,496 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+
+from modules.metrics import METRICS
+from modules.segmenter import UtteranceSegmenter, merge_responses
+from modules.speculation import SpeculationStats, SpeculativeSession
+from modules.store_pool import DEFAULT_USER
+
+
+class AssistantResult:
+    def __init__(self, user_id, text="", request_id=None):
+        """
+        Tek bir ifadenin pipeline çıktısı.
+
+        Args:
+            user_id: İsteği yapan kullanıcı
+            text: Kullanıcı metni (sesli girişte transkripsiyon sonucu)
+            request_id: İstemcinin verdiği istek kimliği (tekrar gönderimleri ayırt eder)
+        """
+        self.user_id = user_id
+        self.text = text
+        self.request_id = request_id
+        self.intent = None
+        self.confidence = 0.0
+        self.response = ""
+        self.error = None
+
+        # Aşama → süre (milisaniye): transcribe, classify, handle, history, speak
+        self.timings = {}
+
+        # Sesli yanıt arka planda sürüyorsa tamamlanmasını bekleten Future
+        self.speech = None
+
+        # Yanıt kısmi transkripsiyondan önceden hazırlandıysa True;
+        # audio_path önceden seslendirilmiş WAV dosyasıdır
+        self.speculative = False
+        self.audio_path = None
+
+        # Birleşik ifadede alt komutlar: [{'text', 'intent', 'confidence', 'response'}]
+        self.segments = None
+
+    @property
+    def ok(self):
+        """Yanıt üretildi mi."""
+        return self.error is None
+
+    def total_ms(self):
+        """Tüm aşamaların toplam süresi (paralel aşamalar ayrı ayrı sayılır)."""
+        return sum(self.timings.values())
+
+    def to_dict(self):
+        """JSON'a çevrilebilir özet."""
+        return {
+            'request_id': self.request_id,
+            'user_id': self.user_id,
+            'text': self.text,
+            'intent': self.intent,
+            'confidence': self.confidence,
+            'response': self.response,
+            'error': self.error,
+            'speculative': self.speculative,
+            'segments': self.segments,
+            'timings_ms': dict(self.timings),
+        }
+
+
+class Assistant:
+    def __init__(self, classifier, handler, stt=None, tts=None, max_history=100, workers=2,
+                 max_request_ids=1024, max_history_users=256, split_compound=True, subcommand_workers=4,
+                 speculation_workers=2):
+        """
+        Ses/metin → intent → komut → sesli yanıt pipeline'ı.
+
+        Arayüzden bağımsızdır; Streamlit, betikler ve sunucular aynı nesneyi
+        kullanır. Komut işlendikten sonra sesli yanıt bir worker thread'inde
+        başlar, geçmiş kaydı bu sırada çağıran thread'de yapılır.
+
+        Args:
+            classifier: Eğitilmiş IntentClassifier
+            handler: CommandHandler
+            stt: SpeechToText (None = yalnızca metin girişi)
+            tts: TextToSpeech (None = sessiz yanıt)
+            max_history: Kullanıcı başına bellekte tutulacak son konuşma sayısı
+                (tüm geçmiş kullanıcının veritabanı shard'ında saklanır)
+            workers: Paralel aşamalar için thread sayısı
+            max_request_ids: Tekrar gönderime karşı hatırlanacak son istek kimliği sayısı
+            max_history_users: Bellekte son konuşmaları tutulan en fazla kullanıcı
+            split_compound: "saat kaç ve ... hatırlat" gibi ifadeler alt komutlara bölünsün mü
+            subcommand_workers: Birleşik ifadelerde alt komutları paralel işleyen thread sayısı
+            speculation_workers: Spekülatif yanıt hazırlayan thread sayısı
+        """
+        self.classifier = classifier
+        self.handler = handler
+        self.stt = stt
+        self.tts = tts
+
+        # Sabit boyutlu halka tamponlar: shard anahtarı → deque (LRU sırası).
+        # Bellek kullanımı oturum uzunluğundan bağımsızdır; eski turlar diskten sayfalanır.
+        self.max_history = max_history
+        self.max_history_users = max_history_users
+        self._history = OrderedDict()
+        self._history_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assistant")
+
+        # Alt komutlar ayrı havuzda çalışır; uzun seslendirmelerin arkasında beklemez
+        self.segmenter = UtteranceSegmenter(classifier) if split_compound else None
+        self._subcommands = ThreadPoolExecutor(max_workers=subcommand_workers, thread_name_prefix="subcommand")
+
+        # Spekülasyon da ayrı havuzda; seslendirmeler hazırlığı aç bırakmaz
+        self._speculation = ThreadPoolExecutor(max_workers=speculation_workers, thread_name_prefix="speculation")
+
+        # request_id → Future[AssistantResult]; aynı kimlikle gelen istek yeniden işlenmez
+        self._requests = OrderedDict()
+        self._requests_lock = threading.Lock()
+        self.max_request_ids = max_request_ids
+        self.duplicate_requests = 0
+
+        # Kısmi transkripsiyonlardan yapılan spekülatif işin isabet/israf sayaçları
+        self.speculation_stats = SpeculationStats()
+
+        # Arka planda STT yüklenirken metin komutları işlenebilir
+        self.stt_error = None
+        self._stt_ready = threading.Event()
+        if stt is not None:
+            self._stt_ready.set()
+
+    @property
+    def stt_ready(self):
+        """Ses tanıma kullanılabilir mi (False iken yalnızca metin komutları)."""
+        return self._stt_ready.is_set() and self.stt is not None
+
+    @property
+    def stt_loading(self):
+        """Ses tanıma arka planda yükleniyor mu."""
+        return not self._stt_ready.is_set()
+
+    def load_stt_async(self, factory, warmup=True):
+        """
+        Ses tanıma modelini arka plan thread'inde yükler ve ısıtır.
+
+        Yükleme sürerken process_text çalışır; listen/process_audio
+        hazır olunca kullanılabilir (stt_ready).
+
+        Args:
+            factory: SpeechToText döndüren fonksiyon
+            warmup: Yüklemeden sonra kısa bir sessizlik çözülsün mü
+        """
+        self._stt_ready.clear()
+
+        def load():
+            try:
+                with METRICS.timed('stt_load'):
+                    stt = factory()
+                    if warmup:
+                        stt.warmup()
+                self.stt = stt
+            except Exception as e:
+                self.stt_error = e
+                print(f"❌ Ses tanıma yüklenemedi: {e}")
+            finally:
+                self._stt_ready.set()
+
+        threading.Thread(target=load, name="stt-warmup", daemon=True).start()
+
+    def wait_stt(self, timeout=None):
+        """STT yüklemesi bitene kadar bekler; hazırsa True döner."""
+        self._stt_ready.wait(timeout)
+        return self.stt_ready
+
+    def speculate(self, user_id=None, **options):
+        """
+        Akışlı bir ifade için spekülasyon oturumu açar.
+
+        Kısmi metinler session.partial() ile verilir; son metin
+        process_text/process_audio'ya speculation=session ile geçirilir.
+
+        Args:
+            user_id: İsteği yapan kullanıcı
+            **options: SpeculativeSession ayarları (min_confidence, stable_count, max_age)
+
+        Returns:
+            SpeculativeSession
+        """
+        return SpeculativeSession(self, user_id or DEFAULT_USER, **options)
+
+    def process_text(self, text, user_id=None, speak=True, wait=True, request_id=None, speculation=None):
+        """
+        Metin komutunu işler.
+
+        Args:
+            text: Kullanıcı metni
+            user_id: İsteği yapan kullanıcı (None = varsayılan kullanıcı)
+            speak: Yanıt seslendirilsin mi (tts varsa)
+            wait: Seslendirme bitene kadar beklensin mi; False ise result.speech beklenebilir
+            request_id: Verilirse aynı kimlikli tekrar gönderimler yeniden işlenmez,
+                ilk çalıştırmanın sonucu döndürülür
+            speculation: Kısmi metinlerle beslenen SpeculativeSession; intent
+                eşleşirse önceden hazırlanan yanıt kullanılır
+
+        Returns:
+            AssistantResult: Yanıt ve aşama süreleri
+        """
+        result = AssistantResult(user_id or DEFAULT_USER, text.strip(), request_id)
+        return self._once(request_id, lambda: self._run(result, speak, wait, speculation))
+
+    def process_audio(self, audio, user_id=None, speak=True, wait=True, request_id=None, speculation=None):
+        """
+        Ses verisini (16 kHz mono float32) metne çevirip işler.
+
+        Args:
+            audio: NumPy ses dizisi
+            user_id: İsteği yapan kullanıcı (None = varsayılan kullanıcı)
+            speak: Yanıt seslendirilsin mi
+            wait: Seslendirme bitene kadar beklensin mi
+            request_id: Tekrar gönderim koruması için istek kimliği
+            speculation: Kısmi metinlerle beslenen SpeculativeSession
+
+        Returns:
+            AssistantResult: Transkripsiyon, yanıt ve aşama süreleri
+        """
+        result = AssistantResult(user_id or DEFAULT_USER, request_id=request_id)
+        return self._once(request_id, lambda: self._run_audio(result, audio, speak, wait, speculation))
+
+    def listen(self, duration=5, user_id=None, speak=True, wait=True):
+        """
+        Mikrofondan kayıt alıp işler.
+
+        Args:
+            duration: Kayıt süresi (saniye)
+            user_id: İsteği yapan kullanıcı
+            speak: Yanıt seslendirilsin mi
+            wait: Seslendirme bitene kadar beklensin mi
+
+        Returns:
+            AssistantResult: Kayıt, transkripsiyon ve yanıt süreleri dahil
+        """
+        self._require_stt()
+        result = AssistantResult(user_id or DEFAULT_USER)
+
+        with _stage(result, 'record'):
+            audio = self.stt.record_audio(duration)
+
+        return self._run_audio(result, audio, speak, wait)
+
+    def history(self, user_id=None, limit=None):
+        """
+        Kullanıcının son konuşmaları (eskiden yeniye).
+
+        Bellekteki halka tampondan okunur; kullanıcı tamponda yoksa (ör.
+        yeniden başlatmadan sonra) son max_history tur diskten yüklenir.
+
+        Args:
+            user_id: Kullanıcı kimliği (None = varsayılan kullanıcı)
+            limit: En fazla kaç konuşma (None = tamponun tamamı)
+
+        Returns:
+            list: {'user', 'assistant', 'intent', 'confidence', 'timestamp'} sözlükleri
+        """
+        with self._history_lock:
+            entries = list(self._ring(user_id))
+        return entries[-limit:] if limit else entries
+
+    def history_page(self, user_id=None, limit=20, before_id=None):
+        """
+        Diskteki geçmişi yeniden eskiye sayfalar (NoteStore.history_page).
+
+        Args:
+            user_id: Kullanıcı kimliği
+            limit: Sayfadaki tur sayısı
+            before_id: Bu id'den eski turlar (None = en yeni sayfa)
+
+        Returns:
+            list: Tur sözlükleri (yeniden eskiye)
+        """
+        with self.handler.stores.acquire(user_id) as store:
+            return store.history_page(limit, before_id=before_id)
+
+    def search_history(self, query, user_id=None, limit=20):
+        """
+        Kullanıcının tüm geçmişinde arar.
+
+        Returns:
+            tuple: (terimler, toplam eşleşme, en yeni eşleşen turlar)
+        """
+        with self.handler.stores.acquire(user_id) as store:
+            return store.search_history(query, limit=limit)
+
+    def clear_history(self, user_id=None):
+        """Kullanıcının konuşma geçmişini bellekten ve diskten siler."""
+        with self._history_lock:
+            self._history.pop(self.handler.stores.shard_key(user_id), None)
+        with self.handler.stores.acquire(user_id) as store:
+            store.clear_history()
+
+    def close(self):
+        """Bekleyen seslendirmeleri bitirir ve worker'ları kapatır."""
+        self._executor.shutdown(wait=True)
+        self._subcommands.shutdown(wait=True)
+        self._speculation.shutdown(wait=True)
+
+    def _once(self, request_id, run):
+        """
+        İsteği kimliği başına bir kez çalıştırır.
+
+        Aynı kimlik işlenirken tekrar gelirse ilk çalıştırmanın bitmesi
+        beklenir; bittikten sonra gelirse saklanan sonuç hemen döner.
+        Hata alan istek unutulur, böylece yeniden denenebilir.
+        """
+        if request_id is None:
+            return run()
+
+        with self._requests_lock:
+            future = self._requests.get(request_id)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._requests[request_id] = future
+                while len(self._requests) > self.max_request_ids:
+                    self._requests.popitem(last=False)
+            else:
+                self.duplicate_requests += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = run()
+        except BaseException as e:
+            with self._requests_lock:
+                self._requests.pop(request_id, None)
+            future.set_exception(e)
+            raise
+
+        future.set_result(result)
+        return result
+
+    def _require_stt(self):
+        if self.stt_loading:
+            raise RuntimeError("Ses tanıma modülü henüz yükleniyor")
+        if self.stt is None:
+            raise RuntimeError("Ses tanıma modülü yüklenmedi")
+
+    def _run_audio(self, result, audio, speak, wait, speculation=None):
+        self._require_stt()
+
+        with _stage(result, 'transcribe'):
+            result.text = self.stt.transcribe_audio(audio_data=audio) if audio is not None else ""
+
+        if not result.text:
+            result.error = "Ses tanınamadı"
+            if speculation is not None:
+                speculation.reset()
+            return result
+
+        return self._run(result, speak, wait, speculation)
+
+    def _run(self, result, speak, wait, speculation=None):
+        if not result.text:
+            result.error = "Boş komut"
+            if speculation is not None:
+                speculation.reset()
+            return result
+
+        with _stage(result, 'classify'):
+            if self.segmenter is not None:
+                segments = self.segmenter.segment(result.text, user_id=result.user_id)
+            else:
+                segments = [(result.text, *self.classifier.predict(result.text, user_id=result.user_id))]
+
+        if len(segments) > 1:
+            if speculation is not None:
+                speculation.reset()
+            with _stage(result, 'handle'):
+                self._handle_compound(result, segments)
+        else:
+            result.intent, result.confidence = segments[0][1:]
+            prepared = speculation.take(result.intent) if speculation is not None else None
+            if prepared is not None:
+                # Yan etkisiz intent; kısmi metinden hazırlanan yanıt son metinle aynı komuttur
+                result.speculative = True
+                result.response = prepared.response
+                result.audio_path = prepared.audio_path
+            else:
+                with _stage(result, 'handle'):
+                    result.response = self.handler.handle_command(result.intent, result.text, result.confidence,
+                                                                  user_id=result.user_id)
+
+        # Seslendirme arka planda başlar, geçmiş bu sırada kaydedilir
+        if speak and self.tts is not None:
+            result.speech = self._executor.submit(self._speak, result, wait)
+        elif result.audio_path:
+            self.tts.discard_file(result.audio_path)
+            result.audio_path = None
+
+        with _stage(result, 'history'):
+            self._remember(result)
+
+        if result.speech is not None and wait:
+            result.speech.result()
+
+        return result
+
+    def _handle_compound(self, result, segments):
+        """
+        Birleşik ifadenin alt komutlarını işler ve yanıtları birleştirir.
+
+        Segmenter yalnızca farklı intent'lere bölünen ifadeleri kabul eder;
+        alt komutlar birbirinden bağımsızdır ve paralel çalışır (ilki
+        çağıran thread'de).
+        """
+        def handle(segment):
+            text, intent, confidence = segment
+            return self.handler.handle_command(intent, text, confidence, user_id=result.user_id)
+
+        futures = [self._subcommands.submit(handle, segment) for segment in segments[1:]]
+        responses = [handle(segments[0])] + [future.result() for future in futures]
+
+        result.segments = [
+            {'text': text, 'intent': intent, 'confidence': float(confidence), 'response': response}
+            for (text, intent, confidence), response in zip(segments, responses)
+        ]
+        result.intent = 'compound'
+        result.confidence = min(float(confidence) for _, _, confidence in segments)
+        result.response = merge_responses(responses)
+
+    def _ring(self, user_id):
+        """Kullanıcının halka tamponu; yoksa diskten doldurulur (kilit altında çağrılır)."""
+        key = self.handler.stores.shard_key(user_id)
+        ring = self._history.get(key)
+        if ring is None:
+            with self.handler.stores.acquire(key) as store:
+                ring = deque(store.recent_turns(self.max_history), maxlen=self.max_history)
+            self._history[key] = ring
+            while len(self._history) > self.max_history_users:
+                self._history.popitem(last=False)
+        self._history.move_to_end(key)
+        return ring
+
+    def _remember(self, result):
+        with self.handler.stores.acquire(result.user_id) as store:
+            turn = store.add_turn(result.text, result.response, result.intent, result.confidence)
+        key = self.handler.stores.shard_key(result.user_id)
+        with self._history_lock:
+            if key in self._history:
+                self._history[key].append(turn)
+                self._history.move_to_end(key)
+            else:
+                self._ring(key)  # Diskten yüklenen son turlar yeni turu zaten içerir
+
+    def _speak(self, result, timed):
+        # Beklenmeyen seslendirme sonuç çağırana döndükten sonra biter; o sırada
+        # okunan (ör. JSON'a çevrilen) timings'e yazılmaz, yalnızca histograma girer
+        with _stage(result if timed else None, 'speak'):
+            if result.audio_path:
+                self.tts.play_file(result.audio_path)
+            else:
+                self.tts.speak(result.response)
+
+
+@contextmanager
+def _stage(result, name):
+    """Bloğun süresini result.timings[name] olarak kaydeder (result None değilse) ve aşama histogramına ekler."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if result is not None:
+            result.timings[name] = elapsed * 1000
+        METRICS.observe(name, elapsed)
+
+
+# Test fonksiyonu
+if __name__ == "__main__":
+    from modules.command_handler import CommandHandler
+    from modules.intent_classifier import IntentClassifier
+
+    print("=== ASİSTAN PIPELINE TESTİ ===\n")
+
+    classifier = IntentClassifier()
+    if not classifier.load_model():
+        classifier.train()
+
+    assistant = Assistant(classifier, CommandHandler())
+
+    for text in ["saat kaç", "5 artı 3 kaç eder", "yarın market alışverişini not al", "notlarım neler"]:
+        result = assistant.process_text(text, speak=False)
+        stages = ", ".join(f"{stage} {ms:.2f} ms" for stage, ms in result.timings.items())
+        print(f"💬 {text} → [{result.intent} {result.confidence:.0%}] {result.response}")
+        print(f"   ⏱️ {stages}")
+
+    assistant.close()
+    print("\nTest tamamlandı!")
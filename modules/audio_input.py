@@ -0,0 +1,190 @@
+import threading
+import time
+
+import numpy as np
+
+# sounddevice yalnızca akış açılırken içe aktarılır (speech_to_text ile aynı)
+
+# Akışta bu süre boyunca yeni ses gelmezse kayıt beklemekten vazgeçilir (saniye)
+STALL_TIMEOUT = 1.0
+
+
+class AudioRingBuffer:
+    def __init__(self, capacity):
+        """
+        Önceden ayrılmış float32 halka tampon.
+
+        Tek yazıcı (ses callback'i) ve birden çok okuyucu için tasarlanmıştır.
+        Yazıcı yalnızca mevcut diziye kopyalar ve toplam örnek sayacını
+        ilerletir; yeni dizi ayırmaz. Okuyucular mutlak örnek indeksleriyle
+        (written sayacına göre) okur.
+
+        Args:
+            capacity: Tampon kapasitesi (örnek)
+        """
+        self.capacity = int(capacity)
+        self._data = np.zeros(self.capacity, dtype=np.float32)
+        self.written = 0  # Akış başından beri yazılan toplam örnek
+
+    def write(self, block):
+        """
+        Bir ses bloğunu tampona kopyalar (callback içinden çağrılır).
+
+        Args:
+            block: 1 boyutlu float32 dizi veya görünüm
+        """
+        n = len(block)
+        if n > self.capacity:
+            block = block[n - self.capacity:]
+            self.written += n - self.capacity
+            n = self.capacity
+
+        pos = self.written % self.capacity
+        first = min(n, self.capacity - pos)
+        self._data[pos:pos + first] = block[:first]
+        if first < n:
+            self._data[:n - first] = block[first:]
+        # Sayaç veri kopyalandıktan sonra ilerler; okuyucu yarım blok görmez
+        self.written += n
+
+    def read(self, start, end):
+        """
+        [start, end) mutlak aralığının kopyasını döndürür.
+
+        Raises:
+            ValueError: Aralığın bir kısmı henüz yazılmadıysa veya üzerine yazıldıysa
+        """
+        written = self.written
+        if end > written or start < written - self.capacity or start < 0:
+            raise ValueError(f"Aralık tamponda değil: [{start}, {end}), yazılan {written}")
+
+        out = np.empty(end - start, dtype=np.float32)
+        pos = start % self.capacity
+        first = min(len(out), self.capacity - pos)
+        out[:first] = self._data[pos:pos + first]
+        if first < len(out):
+            out[first:] = self._data[:len(out) - first]
+
+        # Kopyalama sırasında callback aralığın başına yazmış olabilir
+        if start < self.written - self.capacity:
+            raise ValueError("Okuma sırasında tamponun üzerine yazıldı")
+        return out
+
+
+class InputSession:
+    def __init__(self, sample_rate=16000, max_seconds=30, pre_roll=0.3, blocksize=512, device=None):
+        """
+        Sürekli açık mikrofon akışı.
+
+        sd.rec her komutta cihazı açıp kapatır; açılış gecikmesi yüzünden
+        kullanıcının ilk hecesi kaybolur. Burada InputStream bir kez açılır
+        ve callback sesi halka tampona yazar. Kayıt tetiklendiğinde tampon
+        zaten doludur: kayda tetikten önceki pre_roll saniyesi de eklenir.
+
+        Args:
+            sample_rate: Örnekleme hızı (Hz)
+            max_seconds: En uzun kayıt (tampon bu süre + pre_roll + pay kadar)
+            pre_roll: Tetikten önce kayda eklenecek ses (saniye)
+            blocksize: Callback başına örnek sayısı
+            device: sounddevice giriş cihazı (None = varsayılan)
+        """
+        self.sample_rate = sample_rate
+        self.max_seconds = max_seconds
+        self.pre_roll = pre_roll
+        self.blocksize = blocksize
+        self.device = device
+
+        # Okuyucunun gecikmesine karşı bir saniyelik pay
+        self.buffer = AudioRingBuffer(int((max_seconds + pre_roll + 1) * sample_rate))
+
+        self.startup_ms = None  # Cihaz açılışından ilk bloğa kadar geçen süre
+        self.overflows = 0
+        self.recordings = 0
+        self._stream = None
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self._stream is not None
+
+    def start(self):
+        """Akışı açar (zaten açıksa bir şey yapmaz)."""
+        import sounddevice as sd
+
+        with self._lock:
+            if self._stream is not None:
+                return
+            self._opened_at = time.perf_counter()
+            stream = sd.InputStream(
+                samplerate=self.sample_rate,
+                blocksize=self.blocksize,
+                channels=1,
+                dtype='float32',
+                device=self.device,
+                callback=self._callback
+            )
+            stream.start()
+            self._stream = stream
+
+    def stop(self):
+        """Akışı kapatır."""
+        with self._lock:
+            if self._stream is None:
+                return
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    def _callback(self, indata, frames, time_info, status):
+        # Ses thread'inde çalışır: bellek ayırma, kilit ve G/Ç yok
+        if status:
+            self.overflows += 1
+        if self.startup_ms is None:
+            self.startup_ms = (time.perf_counter() - self._opened_at) * 1000
+        self.buffer.write(indata[:, 0])
+
+    def record(self, duration, pre_roll=None):
+        """
+        Tetik anından itibaren duration saniye kaydeder.
+
+        Args:
+            duration: Kayıt süresi (saniye)
+            pre_roll: Tetikten önce eklenecek ses (None = oturum varsayılanı)
+
+        Returns:
+            numpy array: pre_roll + duration saniyelik ses (akış yeni açıldıysa
+                daha kısa pre_roll)
+        """
+        if duration > self.max_seconds:
+            raise ValueError(f"Kayıt en fazla {self.max_seconds} saniye olabilir")
+        self.start()
+
+        sr = self.sample_rate
+        trigger = self.buffer.written
+        pre = int((self.pre_roll if pre_roll is None else pre_roll) * sr)
+        start = max(trigger - pre, trigger - self.buffer.capacity + sr, 0)
+        end = trigger + int(duration * sr)
+
+        last, last_progress = trigger, time.monotonic()
+        while True:
+            written = self.buffer.written
+            if written >= end:
+                break
+            if written != last:
+                last, last_progress = written, time.monotonic()
+            elif time.monotonic() - last_progress > STALL_TIMEOUT:
+                raise RuntimeError("Mikrofon akışı durdu")
+            time.sleep(min((end - written) / sr, 0.05))
+
+        self.recordings += 1
+        return self.buffer.read(start, end)
+
+    def stats(self):
+        return {
+            'active': self.active,
+            'startup_ms': self.startup_ms,
+            'pre_roll': self.pre_roll,
+            'overflows': self.overflows,
+            'recordings': self.recordings,
+        }
@@ -0,0 +1,132 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from modules.metrics import Histogram
+from modules.speech_to_text import BATCH_WINDOW_SECONDS
+
+
+class BatchTranscriber:
+    def __init__(self, stt, max_batch=8, max_wait=0.02, language="tr"):
+        """
+        Eşzamanlı transkripsiyon isteklerini dinamik olarak toplar.
+
+        İlk istek geldikten sonra en fazla max_wait saniye boyunca gelen
+        diğer istekler beklenir ve max_batch'e kadar biri tek batch olarak
+        SpeechToText.transcribe_batch ile çözülür. Tek başına gelen istek
+        yalnızca max_wait kadar gecikir; yük altında batch büyür.
+
+        Args:
+            stt: Model yüklü SpeechToText
+            max_batch: Bir batch'teki en fazla istek
+            max_wait: İlk istekten sonra batch'i doldurmak için bekleme (saniye)
+            language: Dil kodu
+        """
+        self.stt = stt
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.language = language
+        self.sample_rate = stt.sample_rate
+
+        self.batch_sizes = Histogram(buckets=tuple(range(1, max_batch + 1)))
+        self.batch_latency = Histogram()
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="batch-transcriber", daemon=True)
+        self._thread.start()
+
+    def submit(self, audio):
+        """
+        Sesi kuyruğa ekler.
+
+        Args:
+            audio: 16 kHz mono float32 NumPy dizisi
+
+        Returns:
+            Future: Tanınan metin
+        """
+        future = Future()
+        audio = np.asarray(audio, dtype=np.float32).flatten()
+        # 30 saniyeden uzun ses de kuyruğa girer (çağıran, ör. event loop, bloklanmaz);
+        # worker onu batch'e katmadan tek başına tam çözümle işler
+        self._queue.put((audio, future))
+        return future
+
+    def transcribe(self, audio, timeout=None):
+        """submit() + sonucu bekle."""
+        return self.submit(audio).result(timeout)
+
+    def stop(self):
+        """Kuyruktaki istekleri bitirip thread'i durdurur."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def backlog(self):
+        """Kuyrukta bekleyen (henüz batch'e alınmamış) istek sayısı."""
+        return self._queue.qsize()
+
+    def mean_batch_size(self):
+        """Şimdiye kadarki ortalama batch boyutu."""
+        return self.batch_sizes.mean()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            window = BATCH_WINDOW_SECONDS * self.sample_rate
+            self._run_batch([entry for entry in batch if len(entry[0]) <= window])
+            for audio, future in batch:
+                if len(audio) > window:
+                    self._run_long(audio, future)
+            if stopping:
+                return
+
+    def _run_long(self, audio, future):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(self.stt.transcribe_audio(audio_data=audio, language=self.language))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _run_batch(self, batch):
+        # İptal edilmiş istekleri modele sokma
+        batch = [(audio, future) for audio, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        start = time.perf_counter()
+        try:
+            texts = self.stt.transcribe_batch([audio for audio, _ in batch], language=self.language)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        finally:
+            self.batch_sizes.observe(len(batch))
+            self.batch_latency.observe(time.perf_counter() - start)
+
+        for (_, future), text in zip(batch, texts):
+            future.set_result(text)
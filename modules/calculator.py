@@ -0,0 +1,426 @@
+import operator
+import re
+from functools import lru_cache
+
+from modules.turkish_text import (NUMBER_WORDS, fold_ascii, number_word_stem, parse_number_words,
+                                  turkish_lower)
+
+
+class CalculatorError(ValueError):
+    """İfade çözümlenemediğinde veya hesaplanamadığında fırlatılır."""
+
+
+# Kelime kelime eşleşir; "sonra" içindeki "on" veya "biraz" içindeki "bir" bozulmaz.
+# Rakamlardan sonraki ekler atılır: "10'dan", "3'ü".
+_TOKEN_RE = re.compile(r"(\d+(?:[.,]\d+)?)(?:'\w*)?|(\*\*|[-+*/x×÷^%()])|([^\W\d_]+)")
+
+# İki sayı arasında kullanılan operatörler ("5 artı 3")
+INFIX_WORDS = {
+    'arti': '+', 'eksi': '-', 'carpi': '*', 'kere': '*', 'kez': '*',
+    'bolu': '/', 'uzeri': '^', 'ussu': '^',
+}
+
+# Fiil biçimleri; cümle sonunda gelirlerse sayıların hepsine uygulanır ("5 ile 3'ü topla")
+VERB_WORDS = {
+    'topla': '+', 'ekle': '+', 'cikar': '-', 'cikart': '-', 'carp': '*', 'bol': '/',
+}
+
+SYMBOLS = {'+': '+', '-': '-', '*': '*', '/': '/', '**': '^', '^': '^',
+           'x': '*', '×': '*', '÷': '/', '%': '%', '(': '(', ')': ')'}
+
+# Sonek operatörler: "beşin karesi", "ikinin küpü"
+POSTFIX_POWERS = {'kare': 2, 'karesi': 2, 'kup': 3, 'kupu': 3}
+
+_BINARY_OPS = {'+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv}
+
+MAX_EXPONENT = 64
+
+# Ara ve son sonuçların mutlak değer sınırı; zincirleme üslerde float taşması
+# ve str()'nin 4300 basamak sınırı bu sınırın çok ötesindedir
+MAX_RESULT = 10 ** 100
+MAX_DIGITS = 100
+
+
+def tokenize(text):
+    """
+    Türkçe hesap ifadesini tek geçişte token listesine çevirir.
+
+    Args:
+        text: Kullanıcı metni ("yüz yirmi beş artı üç virgül beş")
+
+    Returns:
+        list: ('num', değer) ve ('op', sembol) çiftleri
+    """
+    raw = []
+    for number, symbol, word in _TOKEN_RE.findall(fold_ascii(turkish_lower(text))):
+        if number:
+            if len(number) > MAX_DIGITS:
+                raise CalculatorError("Sayı çok uzun")
+            value = float(number.replace(',', '.')) if (',' in number or '.' in number) else int(number)
+            raw.append(('num', value))
+        elif symbol:
+            raw.append(('op', SYMBOLS[symbol]))
+        else:
+            # "beşin", "ikiye" gibi ek almış sayıları köke indir ("yüzde" bir operatördür)
+            if word != 'yuzde':
+                word = number_word_stem(word) or word
+            raw.append(('word', word))
+
+    values = [value for _, value in raw]
+    tokens = []
+    verb = None
+    i = 0
+    while i < len(raw):
+        kind, value = raw[i]
+
+        if kind != 'word':
+            tokens.append((kind, value))
+            i += 1
+            continue
+
+        if value in NUMBER_WORDS:
+            number, i = parse_number_words(values, i)
+            tokens.append(('num', number))
+            continue
+
+        if value in ('virgul', 'nokta') and tokens and tokens[-1][0] == 'num':
+            i = _read_decimal(raw, values, i + 1, tokens)
+            continue
+
+        if value == 'parantez' and i + 1 < len(raw) and raw[i + 1][1] in ('ac', 'kapat'):
+            tokens.append(('op', '(' if raw[i + 1][1] == 'ac' else ')'))
+            i += 2
+            continue
+
+        if value in INFIX_WORDS:
+            tokens.append(('op', INFIX_WORDS[value]))
+        elif value in VERB_WORDS:
+            tokens.append(('verb', VERB_WORDS[value]))
+            verb = VERB_WORDS[value]
+        elif value == 'yuzde':
+            tokens.append(('op', 'pct'))
+        elif value in POSTFIX_POWERS:
+            tokens.append(('op', '^'))
+            tokens.append(('num', POSTFIX_POWERS[value]))
+        # Diğer kelimeler ("kaç", "eder", "sonra") yok sayılır
+        i += 1
+
+    return _resolve_verbs(tokens, verb)
+
+
+def _read_decimal(raw, values, i, tokens):
+    """'virgül'den sonraki rakamları ondalık kısım olarak okur ("üç virgül sıfır beş")."""
+    digits = ''
+    while i < len(raw):
+        kind, value = raw[i]
+        if kind == 'num' and isinstance(value, int):
+            digits += str(value)
+            i += 1
+        elif kind == 'word' and value in NUMBER_WORDS:
+            number, i = parse_number_words(values, i)
+            digits += str(number)
+        else:
+            break
+
+    if digits:
+        tokens[-1] = ('num', float(f"{tokens[-1][1]}.{digits}"))
+    return i
+
+
+def _resolve_verbs(tokens, verb):
+    """Fiil operatörlerini ara ek veya cümle sonu kullanımına göre yerleştirir."""
+    if verb is None:
+        return tokens
+
+    resolved = []
+    for idx, (kind, value) in enumerate(tokens):
+        if kind != 'verb':
+            resolved.append((kind, value))
+            continue
+        # "5 topla 3" gibi iki değer arasında kullanıldıysa normal operatördür
+        after_value = resolved and (resolved[-1][0] == 'num' or resolved[-1] == ('op', ')'))
+        before_value = idx + 1 < len(tokens) and tokens[idx + 1][0] == 'num'
+        if after_value and before_value:
+            resolved.append(('op', value))
+
+    # Cümle sonu fiil: yan yana kalan sayıları bu operatörle birleştir
+    if not any(kind == 'op' and value in _BINARY_OPS for kind, value in resolved):
+        joined = []
+        for token in resolved:
+            if joined and token[0] == 'num' and joined[-1][0] == 'num':
+                joined.append(('op', verb))
+            joined.append(token)
+        resolved = joined
+
+    return resolved
+
+
+class _Parser:
+    """
+    Öncelik sırası:
+        ifade  := terim (('+' | '-') terim)*
+        terim  := tekli (('*' | '/') tekli | '(' ... | 'yüzde' ...)*   # yan yana gelenler çarpılır
+        tekli  := ('-' | '+') tekli | üs
+        üs     := sonek ('^' tekli)?
+        sonek  := birincil '%'*
+        birincil := sayı | '(' ifade ')' | 'yüzde' birincil
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def parse(self):
+        if not self.tokens:
+            raise CalculatorError("Boş ifade")
+        node = self._expr()
+        if self.pos != len(self.tokens):
+            raise CalculatorError(f"Beklenmeyen token: {self.tokens[self.pos]}")
+        return node
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _accept(self, *ops):
+        kind, value = self._peek()
+        if kind == 'op' and value in ops:
+            self.pos += 1
+            return value
+        return None
+
+    def _expr(self):
+        node = self._term()
+        while True:
+            op = self._accept('+', '-')
+            if op is None:
+                return node
+            node = (op, node, self._term())
+
+    def _term(self):
+        node = self._unary()
+        while True:
+            op = self._accept('*', '/')
+            if op is not None:
+                node = (op, node, self._unary())
+                continue
+            kind, value = self._peek()
+            # "200'ün yüzde 10'u", "2 (3 + 4)"
+            if kind == 'op' and value in ('(', 'pct'):
+                node = ('*', node, self._unary())
+                continue
+            return node
+
+    def _unary(self):
+        op = self._accept('-', '+')
+        if op == '-':
+            return ('neg', self._unary())
+        if op == '+':
+            return self._unary()
+        return self._power()
+
+    def _power(self):
+        node = self._postfix()
+        if self._accept('^'):
+            node = ('^', node, self._unary())
+        return node
+
+    def _postfix(self):
+        node = self._primary()
+        while self._accept('%'):
+            node = ('pct', node)
+        return node
+
+    def _primary(self):
+        kind, value = self._peek()
+        if kind == 'num':
+            self.pos += 1
+            return ('num', value)
+        if self._accept('('):
+            node = self._expr()
+            # Kapatılmayan parantez cümle sonunda kapanmış sayılır
+            self._accept(')')
+            return node
+        if self._accept('pct'):
+            return ('pct', self._primary())
+        raise CalculatorError(f"Sayı bekleniyordu: {value}")
+
+
+@lru_cache(maxsize=512)
+def compile_expression(text):
+    """
+    Metni AST'ye çevirir. Sonuç önbelleğe alınır; tekrar eden ifadeler
+    yeniden ayrıştırılmaz.
+
+    Args:
+        text: Kullanıcı metni
+
+    Returns:
+        tuple: İç içe tuple'lardan oluşan AST
+    """
+    return _Parser(tokenize(text)).parse()
+
+
+def evaluate(node):
+    """
+    AST'yi hesaplar. Yalnızca bilinen düğüm türleri çalıştırılır; eval kullanılmaz.
+
+    Args:
+        node: compile_expression çıktısı
+
+    Returns:
+        int veya float: Sonuç
+
+    Raises:
+        CalculatorError: Sonuç (veya bir ara sonuç) MAX_RESULT'u aşarsa
+    """
+    try:
+        return _checked(_evaluate(node))
+    except OverflowError:
+        raise CalculatorError("Sonuç çok büyük") from None
+
+
+def _checked(value):
+    # abs() karmaşık sayılarda da çalışır; NaN ve sonsuz da reddedilir
+    if not abs(value) <= MAX_RESULT:
+        raise CalculatorError("Sonuç çok büyük")
+    return value
+
+
+def _evaluate(node):
+    kind = node[0]
+
+    if kind == 'num':
+        return node[1]
+    if kind == 'neg':
+        return -_evaluate(node[1])
+    if kind == 'pct':
+        return _evaluate(node[1]) / 100
+    if kind == '^':
+        base, exponent = _checked(_evaluate(node[1])), _evaluate(node[2])
+        if abs(exponent) > MAX_EXPONENT:
+            raise CalculatorError("Üs çok büyük")
+        return _checked(base ** exponent)
+
+    left = _checked(_evaluate(node[1]))
+    right_node = node[2]
+
+    # "200 artı yüzde 10" → 220 (hesap makinesi davranışı)
+    if kind in ('+', '-') and right_node[0] == 'pct':
+        return _checked(_BINARY_OPS[kind](left, left * _evaluate(right_node)))
+
+    right = _checked(_evaluate(right_node))
+    if kind == '/' and right == 0:
+        raise ZeroDivisionError("Sıfıra bölme")
+    return _checked(_BINARY_OPS[kind](left, right))
+
+
+def calculate(text):
+    """
+    Türkçe hesap ifadesini hesaplar.
+
+    Args:
+        text: "yüz yirmi beş artı üç", "(2 + 3) çarpı 4", "200'ün yüzde 15'i"
+
+    Returns:
+        int veya float: Sonuç
+
+    Raises:
+        CalculatorError: İfade anlaşılamazsa
+        ZeroDivisionError: Sıfıra bölme
+    """
+    result = evaluate(compile_expression(text))
+    if isinstance(result, complex):
+        raise CalculatorError("Karmaşık sayı sonucu")
+    return result
+
+
+def format_number(value):
+    """
+    Sonucu Türkçe biçimde yazar (tam sayılar ondalıksız, ondalık ayırıcı virgül).
+
+    Raises:
+        CalculatorError: Tam sayı yazılamayacak kadar uzunsa
+    """
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        value = int(value)
+    if isinstance(value, int):
+        try:
+            return str(value)
+        except ValueError:  # 4300 basamak sınırı
+            raise CalculatorError("Sonuç çok büyük") from None
+    return f"{value:.6g}".replace('.', ',')
+
+
+# Test fonksiyonu
+if __name__ == "__main__":
+    print("=== HESAP MAKİNESİ TESTİ ===\n")
+
+    cases = [
+        ("5 artı 3 kaç eder", 8),
+        ("10 çarpı 7", 70),
+        ("100 bölü 4", 25),
+        ("yüz yirmi beş artı beş", 130),
+        ("iki bin üç yüz eksi üç yüz", 2000),
+        ("bir milyon bölü bin", 1000),
+        ("on beş kere iki", 30),
+        ("üç virgül beş artı bir virgül yirmi beş", 4.75),
+        ("iki virgül sıfır beş çarpı iki", 4.1),
+        ("3,5 çarpı 2", 7),
+        ("(2 + 3) * 4", 20),
+        ("parantez aç iki artı üç parantez kapat çarpı dört", 20),
+        ("2 üzeri 10", 1024),
+        ("beşin karesi", 25),
+        ("ikinin küpü artı bir", 9),
+        ("2 ^ 3 ^ 2", 512),
+        ("200'ün yüzde 15'i", 30),
+        ("200 artı yüzde 10", 220),
+        ("200 eksi yüzde 25", 150),
+        ("50% çarpı 8", 4),
+        ("eksi beş artı üç", -2),
+        ("5 ile 3'ü topla", 8),
+        ("10'dan 4'ü çıkar", 6),
+        ("6 ile 7'yi çarp", 42),
+        ("sonra biraz 5 artı 3 hesapla", 8),
+        ("üç artı dört çarpı iki", 11),
+        ("ÜÇ ARTI İKİ", 5),
+        ("uc arti iki", 5),
+        ("bin dokuz yüz seksen dört", 1984),
+    ]
+
+    errors = [
+        "merhaba",
+        "5 artı",
+        "2 üzeri 1000",
+        "(1,5 üzeri 64) üzeri 64",
+        "((2 üzeri 64) üzeri 64) üzeri 64",
+        "5 3",
+    ]
+
+    failed = 0
+    for text, expected in cases:
+        try:
+            result = calculate(text)
+            ok = abs(result - expected) < 1e-9
+        except Exception as e:
+            result, ok = e, False
+        failed += not ok
+        print(f"{'✓' if ok else '❌'} '{text}' = {result} (beklenen {expected})")
+
+    for text in errors:
+        try:
+            result = calculate(text)
+            ok = False
+        except CalculatorError as e:
+            result, ok = e, True
+        failed += not ok
+        print(f"{'✓' if ok else '❌'} '{text}' → hata: {result}")
+
+    try:
+        calculate("5 bölü sıfır")
+        failed += 1
+        print("❌ '5 bölü sıfır' hata vermedi")
+    except ZeroDivisionError:
+        print("✓ '5 bölü sıfır' → ZeroDivisionError")
+
+    print(f"\n{len(cases) + len(errors) + 1 - failed} / {len(cases) + len(errors) + 1} başarılı")
+    print("Test tamamlandı!")
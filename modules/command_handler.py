@@ -1,47 +1,68 @@
-import json
-import re
-from datetime import datetime, timedelta
-import os
+import random
+from datetime import datetime
+from functools import cached_property
 
+from modules.calculator import CalculatorError, calculate, format_number
+from modules.command_registry import CommandRegistry, command
+from modules.entity_extractor import extract_entities
+from modules.store_pool import DEFAULT_USER, StorePool
 
-class CommandHandler:
-    def __init__(self, notes_file="data/notes.json", reminders_file="data/reminders.json"):
+
+class CommandRequest:
+    def __init__(self, intent, text, confidence, user_id=DEFAULT_USER, store=None):
         """
+        İşlenen tek bir kullanıcı ifadesi.
+
         Args:
-            notes_file: Notların saklandığı dosya
-            reminders_file: Hatırlatıcıların saklandığı dosya
+            intent: Tespit edilen intent
+            text: Orijinal kullanıcı metni
+            confidence: Tahmin güveni
+            user_id: İsteği yapan kullanıcı
+            store: Kullanıcının NoteStore shard'ı (istek süresince açık tutulur)
         """
-        self.notes_file = notes_file
-        self.reminders_file = reminders_file
+        self.intent = intent
+        self.text = text
+        self.confidence = confidence
+        self.user_id = user_id
+        self.store = store
 
-        # Veri yapılarını başlat
-        self.notes = self._load_json(notes_file, default=[])
-        self.reminders = self._load_json(reminders_file, default=[])
+        # Handler'ın @command ile tanımladığı, kayıtta derlenmiş regex'ler
+        self.patterns = {}
 
-        print("✓ Komut işleyici hazır!")
+    @cached_property
+    def entities(self):
+        """İfadedeki varlıklar; ilk erişimde bir kez çıkarılır, sonra tüm handler'lar paylaşır."""
+        return extract_entities(self.text)
 
-    def _load_json(self, filepath, default=None):
-        """JSON dosyasını yüklüyor."""
-        try:
-            if os.path.exists(filepath):
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except Exception as e:
-            print(f"⚠ {filepath} yüklenemedi: {e}")
-        return default if default is not None else {}
 
-    def _save_json(self, data, filepath):
-        """JSON dosyasına kaydeder."""
-        try:
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            return True
-        except Exception as e:
-            print(f"❌ {filepath} kaydedilemedi: {e}")
-            return False
+class CommandHandler:
+    def __init__(self, notes_file="data/notes.json", reminders_file="data/reminders.json",
+                 db_file="data/assistant.db", users_dir="data/users", plugin_package="modules.plugins"):
+        """
+        Args:
+            notes_file: Eski not JSON dosyası (ilk açılışta veritabanına taşınır)
+            reminders_file: Eski hatırlatıcı JSON dosyası (ilk açılışta taşınır)
+            db_file: Varsayılan kullanıcının notları ve hatırlatıcıları için SQLite dosyası
+            users_dir: Diğer kullanıcıların shard dosyalarının klasörü
+            plugin_package: Ek intent handler'larının aranacağı paket (None = eklenti yok)
+        """
+        # Kullanıcı başına bir shard; ilk istekte açılır, boşta kalınca kapanır
+        self.stores = StorePool(db_file, users_dir=users_dir, notes_file=notes_file, reminders_file=reminders_file)
+
+        # Hatırlatıcıları tetikleyen ReminderScheduler (app tarafından bağlanır)
+        self.scheduler = None
+
+        # Dağıtım tablosu bir kez kurulur: önce yerleşik handler'lar, sonra eklentiler
+        self.registry = CommandRegistry()
+        self.registry.register_object(self)
+        if plugin_package:
+            plugins = self.registry.discover(plugin_package, owner=self)
+            if plugins:
+                print(f"✓ {len(plugins)} eklenti yüklendi")
+
+        print("✓ Komut işleyici hazır!")
 
-    def handle_command(self, intent, original_text, confidence):
+    def handle_command(self, intent, original_text, confidence, user_id=None):
         """
         Intent'e göre komutu işler ve yanıt üretir.
 
@@ -49,27 +70,19 @@ class CommandHandler:
             intent: Tespit edilen intent
             original_text: Orijinal kullanıcı metni
             confidence: Tahmin güveni
+            user_id: İsteği yapan kullanıcı (None = varsayılan kullanıcı)
 
         Returns:
             str: İşlenmiş yanıt
         """
-        handlers = {
-            'time': self._handle_time,
-            'date': self._handle_date,
-            'calculator': self._handle_calculator,
-            'note_add': self._handle_note_add,
-            'note_list': self._handle_note_list,
-            'note_delete': self._handle_note_delete,
-            'reminder_add': self._handle_reminder_add,
-            'reminder_list': self._handle_reminder_list,
-            'study_advice': self._handle_study_advice,
-            'study_timer': self._handle_study_timer,
-            'motivate': self._handle_motivate,
-        }
+        spec = self.registry.get(intent)
 
-        # Özel handler varsa çağır
-        if intent in handlers:
-            return handlers[intent](original_text)
+        # Özel handler varsa kullanıcının shard'ı açıkken çağır
+        if spec is not None:
+            user_id = user_id or DEFAULT_USER
+            with self.stores.acquire(user_id) as store:
+                request = CommandRequest(intent, original_text, confidence, user_id=user_id, store=store)
+                return self.registry.dispatch(spec, request)
 
         # Yoksa basit yanıt döndür
         return self._get_default_response(intent)
@@ -88,13 +101,15 @@ class CommandHandler:
 
     # ============= ZAMAN İŞLEMLERİ =============
 
-    def _handle_time(self, text):
+    @command('time')
+    def _handle_time(self, request):
         """Şu anki saati söyler."""
         now = datetime.now()
         time_str = now.strftime("%H:%M")
         return f"Şu an saat {time_str}"
 
-    def _handle_date(self, text):
+    @command('date')
+    def _handle_date(self, request):
         """Bugünün tarihini söyler."""
         now = datetime.now()
 
@@ -112,187 +127,131 @@ class CommandHandler:
 
     # ============= HESAP MAKİNESİ =============
 
-    def _handle_calculator(self, text):
+    @command('calculator')
+    def _handle_calculator(self, request):
         """Matematiksel hesaplama yapar."""
-        # Sayıları ve operatörleri bul
-        # Türkçe sayı kelimeleri
-        numbers_tr = {
-            'bir': 1, 'iki': 2, 'üç': 3, 'dört': 4, 'beş': 5,
-            'altı': 6, 'yedi': 7, 'sekiz': 8, 'dokuz': 9, 'on': 10,
-            'sıfır': 0, 'yüz': 100, 'bin': 1000
-        }
-
-        # Operatör kelimeleri
-        ops = {
-            'artı': '+', 'ekle': '+', 'topla': '+',
-            'eksi': '-', 'çıkar': '-', 'çıkart': '-',
-            'çarpı': '*', 'çarp': '*', 'kere': '*',
-            'bölü': '/', 'böl': '/'
-        }
-
-        # Sayıları ve operatörleri çıkar
-        expression = text.lower()
-
-        # Kelimeleri rakama çevir
-        for word, num in numbers_tr.items():
-            expression = expression.replace(word, str(num))
-
-        # Operatörleri çevir
-        for word, op in ops.items():
-            expression = expression.replace(word, op)
-
-        # Sadece sayı ve operatörleri tut
-        expression = re.sub(r'[^0-9+\-*/\.]', '', expression)
-
-        # Hesapla
         try:
-            result = eval(expression)  # Güvenlik: Sadece basit ifadelerde kullan
-            return f"Sonuç: {result}"
-        except:
-            # İfade çıkarılamadıysa, rakamları topla
-            numbers = re.findall(r'\d+\.?\d*', text)
-            if len(numbers) >= 2:
-                nums = [float(n) for n in numbers]
-
-                # Operatör tahmin et
-                if 'artı' in text or 'topla' in text:
-                    result = sum(nums)
-                    return f"Sonuç: {result}"
-                elif 'çarp' in text:
-                    result = nums[0]
-                    for n in nums[1:]:
-                        result *= n
-                    return f"Sonuç: {result}"
-
-            return "Hesaplama yapamadım. Örnek: '5 artı 3' veya '10 çarpı 2'"
+            # Sayı kelimeleri varlık çıkarımında zaten rakama çevrildi
+            result = calculate(request.entities.normalized)
+            return f"Sonuç: {format_number(result)}"
+        except ZeroDivisionError:
+            return "Sıfıra bölme yapılamaz."
+        except CalculatorError:
+            return "Hesaplama yapamadım. Örnek: '5 artı 3' veya 'yüz yirmi beş çarpı iki'"
+        except Exception as e:
+            print(f"❌ Hesaplama hatası: {e}")
+            return "Hesaplama yapamadım. Örnek: '5 artı 3' veya 'yüz yirmi beş çarpı iki'"
 
     # ============= NOT SİSTEMİ =============
 
-    def _handle_note_add(self, text):
+    @command('note_add', patterns={'command': r'(not\s+al|not\s+tut|kaydet|yaz|hatırla)'})
+    def _handle_note_add(self, request):
         """Not ekler."""
         # "not al" gibi komut kelimelerini çıkar
-        note_text = re.sub(r'(not\s+al|not\s+tut|kaydet|yaz|hatırla)', '', text, flags=re.IGNORECASE).strip()
+        note_text = request.patterns['command'].sub('', request.text).strip()
 
         if not note_text or len(note_text) < 3:
             return "Ne not almamı istiyorsunuz?"
 
-        # Not ekle
-        note = {
-            'id': len(self.notes) + 1,
-            'text': note_text,
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-
-        self.notes.append(note)
-        self._save_json(self.notes, self.notes_file)
+        request.store.add_note(note_text)
 
         return f"Not alındı: '{note_text}'"
 
-    def _handle_note_list(self, text):
+    @command('note_list')
+    def _handle_note_list(self, request):
         """Notları listeler."""
-        if not self.notes:
+        total = request.store.count_notes()
+        if not total:
             return "Henüz kaydedilmiş notunuz yok."
 
-        response = f"Toplam {len(self.notes)} notunuz var:\n\n"
+        response = f"Toplam {total} notunuz var:\n\n"
 
-        for note in self.notes[-5:]:  # Son 5 notu göster
+        for note in request.store.recent_notes(5):  # Son 5 notu göster
             response += f"• {note['text']}\n"
 
-        if len(self.notes) > 5:
-            response += f"\n(Ve {len(self.notes) - 5} not daha...)"
+        if total > 5:
+            response += f"\n(Ve {total - 5} not daha...)"
 
         return response
 
-    def _handle_note_delete(self, text):
+    @command('note_delete')
+    def _handle_note_delete(self, request):
         """Notları siler."""
-        if not self.notes:
+        if not request.store.clear_notes():
             return "Silinecek not bulunamadı."
 
-        self.notes.clear()
-        self._save_json(self.notes, self.notes_file)
-
         return "Tüm notlar silindi."
 
+    @command('note_search')
+    def _handle_note_search(self, request):
+        """Notlarda arama yapar."""
+        terms, total, notes = request.store.search_notes(request.text, limit=5)
+
+        if not terms:
+            return "Ne aramamı istiyorsunuz? Örnek: 'marketle ilgili notlarım'"
+
+        if not total:
+            return f"'{' '.join(terms)}' ile ilgili not bulunamadı."
+
+        response = f"'{' '.join(terms)}' ile ilgili {total} not buldum:\n\n"
+
+        for note in notes:
+            response += f"• {note['text']}\n"
+
+        if total > len(notes):
+            response += f"\n(Ve {total - len(notes)} not daha...)"
+
+        return response
+
     # ============= HATIRLATICI SİSTEMİ =============
 
-    def _handle_reminder_add(self, text):
+    @command('reminder_add', patterns={'command': r'\b(hatırlat\w*|alarm\w*|uyar\w*|bana)\b'})
+    def _handle_reminder_add(self, request):
         """Hatırlatıcı ekler."""
-        # Zaman ifadelerini ara
-        time_patterns = {
-            r'(\d+)\s*(dakika|dk)': 'minutes',
-            r'(\d+)\s*(saat|sa)': 'hours',
-            r'yarın': 'tomorrow',
-            r'(\d+)\.(\d+)': 'time'  # 14.30 gibi
-        }
-
-        reminder_time = None
-        time_str = ""
-
-        for pattern, time_type in time_patterns.items():
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                if time_type == 'minutes':
-                    minutes = int(match.group(1))
-                    reminder_time = datetime.now() + timedelta(minutes=minutes)
-                    time_str = f"{minutes} dakika sonra"
-                elif time_type == 'hours':
-                    hours = int(match.group(1))
-                    reminder_time = datetime.now() + timedelta(hours=hours)
-                    time_str = f"{hours} saat sonra"
-                elif time_type == 'tomorrow':
-                    reminder_time = datetime.now() + timedelta(days=1)
-                    reminder_time = reminder_time.replace(hour=9, minute=0)
-                    time_str = "yarın saat 09:00'da"
-                elif time_type == 'time':
-                    hour = int(match.group(1))
-                    minute = int(match.group(2))
-                    reminder_time = datetime.now().replace(hour=hour, minute=minute)
-                    if reminder_time < datetime.now():
-                        reminder_time += timedelta(days=1)
-                    time_str = f"saat {hour:02d}:{minute:02d}'te"
-                break
+        # "yarın 14.30", "cuma akşam 7'de", "2 saat 30 dakika sonra" tek seferde çözülür
+        reminder_time, time_str = request.entities.resolve_datetime()
 
         if not reminder_time:
             return "Zaman belirtmediniz. Örnek: '30 dakika sonra hatırlat' veya 'yarın 14.30'da hatırlat'"
 
-        # Hatırlatıcı metni çıkar
-        reminder_text = re.sub(r'(hatırlat|hatırlatıcı|alarm|uyar)', '', text, flags=re.IGNORECASE)
-        reminder_text = re.sub(r'\d+\s*(dakika|saat|dk|sa)', '', reminder_text)
-        reminder_text = re.sub(r'\d+\.\d+', '', reminder_text).strip()
+        # Hatırlatıcı metni: zaman ifadeleri ve komut kelimeleri çıkarılır
+        reminder_text = request.entities.strip(('duration', 'clock', 'relative_day', 'weekday'))
+        reminder_text = request.patterns['command'].sub('', reminder_text)
+        reminder_text = ' '.join(reminder_text.split())
 
         if not reminder_text:
             reminder_text = "Hatırlatıcı"
 
         # Hatırlatıcı ekle
-        reminder = {
-            'id': len(self.reminders) + 1,
-            'text': reminder_text,
-            'time': reminder_time.strftime("%Y-%m-%d %H:%M:%S"),
-            'created': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-
-        self.reminders.append(reminder)
-        self._save_json(self.reminders, self.reminders_file)
+        reminder = request.store.add_reminder(reminder_text, reminder_time)
+        reminder['user'] = request.user_id
+        if self.scheduler:
+            self.scheduler.schedule(reminder)
 
         return f"Hatırlatıcı eklendi: '{reminder_text}' - {time_str}"
 
-    def _handle_reminder_list(self, text):
+    @command('reminder_list')
+    def _handle_reminder_list(self, request):
         """Hatırlatıcıları listeler."""
-        if not self.reminders:
+        total = request.store.count_reminders()
+        if not total:
             return "Aktif hatırlatıcınız bulunmuyor."
 
-        response = f"Toplam {len(self.reminders)} hatırlatıcınız var:\n\n"
+        response = f"Toplam {total} hatırlatıcınız var:\n\n"
 
-        for reminder in self.reminders:
-            time_obj = datetime.strptime(reminder['time'], "%Y-%m-%d %H:%M:%S")
-            time_str = time_obj.strftime("%d.%m.%Y %H:%M")
+        for reminder in request.store.list_reminders(limit=10):  # En yakın 10 hatırlatıcı
+            time_str = datetime.fromtimestamp(reminder['due']).strftime("%d.%m.%Y %H:%M")
             response += f"• {reminder['text']} - {time_str}\n"
 
+        if total > 10:
+            response += f"\n(Ve {total - 10} hatırlatıcı daha...)"
+
         return response
 
     # ============= ÖĞRENCİ ÖZELLİKLERİ =============
 
-    def _handle_study_advice(self, text):
+    @command('study_advice')
+    def _handle_study_advice(self, request):
         """Çalışma önerisi verir."""
         tips = [
             "🎯 Pomodoro tekniği: 25 dakika çalış, 5 dakika mola. Odaklanmanızı artırır!",
@@ -305,21 +264,21 @@ class CommandHandler:
             "🔄 Tekrar sistemi: 1 gün, 3 gün, 1 hafta, 1 ay sonra tekrar edin. Kalıcı öğrenme böyle olur!"
         ]
 
-        import random
         return random.choice(tips)
 
-    def _handle_study_timer(self, text):
+    @command('study_timer')
+    def _handle_study_timer(self, request):
         """Çalışma zamanlayıcısı başlatır."""
-        # Süre çıkar
         duration = 25  # Varsayılan Pomodoro
 
-        match = re.search(r'(\d+)\s*(dakika|dk)', text, re.IGNORECASE)
-        if match:
-            duration = int(match.group(1))
+        total = request.entities.total_duration()
+        if total is not None and total.total_seconds() >= 60:
+            duration = int(total.total_seconds() // 60)
 
         return f"⏱️ {duration} dakikalık çalışma süreniz başladı! Konsantre olun, başarılar! 🚀"
 
-    def _handle_motivate(self, text):
+    @command('motivate')
+    def _handle_motivate(self, request):
         """Motivasyon mesajı verir."""
         quotes = [
             "💪 'Başarısızlık sadece tekrar denemek için bir fırsattır.' - Henry Ford",
@@ -332,7 +291,6 @@ class CommandHandler:
             "💎 Bugün kendiniz için yaptığınız çalışma, yarının başarısıdır!"
         ]
 
-        import random
         return random.choice(quotes)
 
 
@@ -348,10 +306,14 @@ if __name__ == "__main__":
         ('calculator', '5 artı 3 kaç eder'),
         ('note_add', 'bunu not al: yarın market'),
         ('note_list', 'notlarım neler'),
+        ('note_search', 'marketle ilgili notlarım'),
         ('reminder_add', '30 dakika sonra çay içmeyi hatırlat'),
+        ('reminder_add', 'yarın 14.30 toplantıyı hatırlat'),
+        ('study_timer', '45 dakikalık pomodoro başlat'),
         ('reminder_list', 'hatırlatıcılar neler'),
         ('study_advice', 'çalışma önerisi ver'),
         ('motivate', 'motive et beni'),
+        ('joke', 'fıkra anlat'),
     ]
 
     for intent, text in test_commands:
@@ -361,4 +323,13 @@ if __name__ == "__main__":
         print(f"✅ Yanıt: {response}")
         print("-" * 60)
 
+    # Kullanıcılar birbirinin notlarını görmez
+    handler.handle_command('note_add', 'not al: ayşenin notu', 0.9, user_id='ayse')
+    print(f"👤 ayse: {handler.handle_command('note_list', '', 0.9, user_id='ayse')}")
+    print(f"📂 Açık shard: {handler.stores.open_count()}")
+
+    print("\n⏱️ Handler istatistikleri:")
+    for intent, stats in handler.registry.stats().items():
+        print(f"  {intent:<14} {stats['calls']:>3} çağrı  p50 {stats['p50_ms']:.3f} ms  p95 {stats['p95_ms']:.3f} ms")
+
     print("\nTest tamamlandı!")
\ No newline at end of file
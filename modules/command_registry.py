@@ -0,0 +1,171 @@
+import functools
+import importlib
+import pkgutil
+import re
+import time
+
+from modules.metrics import Histogram
+
+
+def command(intent, patterns=None):
+    """
+    Bir fonksiyonu intent handler'ı olarak işaretler.
+
+    CommandHandler metotlarında ve eklenti modüllerinde kullanılır:
+
+        @command('note_add', patterns={'command': r'not\\s+al'})
+        def _handle_note_add(self, request):
+            request.patterns['command'].sub('', request.text)
+
+    Args:
+        intent: İşlenecek intent etiketi
+        patterns: İsim → regex sözlüğü; kayıt sırasında bir kez derlenir
+    """
+    def decorator(func):
+        func.command_intent = intent
+        func.command_patterns = patterns or {}
+        return func
+    return decorator
+
+
+class CommandSpec:
+    def __init__(self, intent, func, patterns):
+        """
+        Kayıtlı bir handler ve istatistikleri.
+
+        Args:
+            intent: Intent etiketi
+            func: request alan çağrılabilir
+            patterns: Derlenmiş regex sözlüğü
+        """
+        self.intent = intent
+        self.func = func
+        self.patterns = patterns
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram()
+
+
+class CommandRegistry:
+    def __init__(self):
+        """Intent → handler dağıtım tablosu; bir kez kurulur, her komutta yeniden oluşturulmaz."""
+        self._specs = {}
+
+    def register(self, intent, func, patterns=None):
+        """
+        Handler kaydeder ve regex'lerini derler.
+
+        Args:
+            intent: Intent etiketi
+            func: request alan çağrılabilir
+            patterns: İsim → regex sözlüğü (büyük/küçük harf duyarsız derlenir)
+        """
+        if intent in self._specs:
+            print(f"⚠ '{intent}' handler'ı yeniden tanımlandı: {getattr(func, '__qualname__', func)}")
+
+        compiled = {name: re.compile(pattern, re.IGNORECASE) for name, pattern in (patterns or {}).items()}
+        self._specs[intent] = CommandSpec(intent, func, compiled)
+
+    def register_object(self, obj, owner=None):
+        """
+        Bir nesne veya modüldeki @command ile işaretli tüm handler'ları kaydeder.
+
+        Args:
+            obj: CommandHandler örneği veya eklenti modülü
+            owner: Modül fonksiyonlarına ilk argüman olarak verilecek CommandHandler
+        """
+        for name in dir(obj):
+            func = getattr(obj, name)
+            intent = getattr(func, 'command_intent', None)
+            if intent is None or not callable(func):
+                continue
+            if owner is not None:
+                func = functools.partial(func, owner)
+            self.register(intent, func, func_patterns(func))
+
+    def discover(self, package, owner):
+        """
+        Paket altındaki tüm eklenti modüllerini yükler ve handler'larını kaydeder.
+
+        Yeni bir intent eklemek için CommandHandler'ı düzenlemek gerekmez;
+        pakete @command ile işaretli bir fonksiyon içeren modül koymak yeterlidir.
+
+        Args:
+            package: Eklenti paketinin import yolu ("modules.plugins")
+            owner: Eklenti fonksiyonlarına verilecek CommandHandler
+
+        Returns:
+            list: Yüklenen modül isimleri
+        """
+        try:
+            pkg = importlib.import_module(package)
+        except ImportError as e:
+            print(f"⚠ Eklenti paketi yüklenemedi ({package}): {e}")
+            return []
+
+        loaded = []
+        for module_info in pkgutil.iter_modules(pkg.__path__):
+            name = f"{package}.{module_info.name}"
+            try:
+                module = importlib.import_module(name)
+            except Exception as e:
+                print(f"❌ Eklenti yüklenemedi ({name}): {e}")
+                continue
+            self.register_object(module, owner=owner)
+            loaded.append(name)
+        return loaded
+
+    def get(self, intent):
+        """Intent'in kaydını döndürür (yoksa None)."""
+        return self._specs.get(intent)
+
+    def intents(self):
+        """Kayıtlı intent listesi."""
+        return sorted(self._specs)
+
+    def dispatch(self, spec, request):
+        """
+        Handler'ı çağırır; çağrı sayısını ve gecikmeyi kaydeder.
+
+        Args:
+            spec: get() ile alınan CommandSpec
+            request: CommandRequest
+
+        Returns:
+            str: Handler yanıtı
+        """
+        request.patterns = spec.patterns
+        start = time.perf_counter()
+        try:
+            return spec.func(request)
+        except Exception:
+            spec.errors += 1
+            raise
+        finally:
+            spec.calls += 1
+            spec.latency.observe(time.perf_counter() - start)
+
+    def stats(self):
+        """
+        Handler başına çağrı sayısı ve gecikme özetleri (milisaniye).
+
+        Returns:
+            dict: intent → {'calls', 'errors', 'mean_ms', 'p50_ms', 'p95_ms'}
+        """
+        return {
+            intent: {
+                'calls': spec.calls,
+                'errors': spec.errors,
+                'mean_ms': spec.latency.mean() * 1000,
+                'p50_ms': spec.latency.percentile(0.50) * 1000,
+                'p95_ms': spec.latency.percentile(0.95) * 1000,
+            }
+            for intent, spec in sorted(self._specs.items())
+            if spec.calls
+        }
+
+
+def func_patterns(func):
+    """@command ile verilen regex sözlüğü (partial nesneleri için de)."""
+    target = func.func if isinstance(func, functools.partial) else func
+    return getattr(target, 'command_patterns', {})
@@ -0,0 +1,229 @@
+import argparse
+import gzip
+import json
+import os
+import sys
+from contextlib import ExitStack, nullcontext
+from datetime import datetime
+
+from modules.file_utils import atomic_write_bytes
+from modules.note_store import TIMESTAMP_FORMAT
+from modules.store_pool import StorePool
+
+
+RECORD_TYPES = ('note', 'reminder')
+
+# Geçersiz kayıtlardan raporda gösterilecek en fazla örnek
+MAX_REPORTED_ERRORS = 20
+
+
+class InvalidRecord(ValueError):
+    pass
+
+
+def _open_text(path, mode):
+    """'-' standart giriş/çıkış, .gz uzantılı dosyalar gzip olarak açılır."""
+    if path == '-':
+        return nullcontext(sys.stdin if 'r' in mode else sys.stdout)
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def _check_time(record, field, required=True):
+    value = record.get(field)
+    if value is None and not required:
+        return None
+    if not isinstance(value, str):
+        raise InvalidRecord(f"'{field}' eksik")
+    try:
+        datetime.strptime(value, TIMESTAMP_FORMAT)
+    except ValueError:
+        raise InvalidRecord(f"'{field}' {TIMESTAMP_FORMAT} biçiminde olmalı: {value!r}")
+    return value
+
+
+def validate_record(record):
+    """
+    JSON Lines kaydını doğrular ve depoya yazılacak biçime getirir.
+
+    Args:
+        record: json.loads çıktısı
+
+    Returns:
+        dict: Temizlenmiş kayıt
+
+    Raises:
+        InvalidRecord: Kayıt eksik veya hatalıysa
+    """
+    if not isinstance(record, dict):
+        raise InvalidRecord("Kayıt JSON nesnesi olmalı")
+
+    kind = record.get('type')
+    if kind not in RECORD_TYPES:
+        raise InvalidRecord(f"Bilinmeyen kayıt tipi: {kind!r}")
+
+    text = record.get('text')
+    if not isinstance(text, str) or not text.strip():
+        raise InvalidRecord("'text' boş olamaz")
+
+    record_id = record.get('id')
+    if record_id is not None and (not isinstance(record_id, int) or isinstance(record_id, bool) or record_id < 1):
+        raise InvalidRecord(f"'id' pozitif tam sayı olmalı: {record_id!r}")
+
+    user = record.get('user')
+    if user is not None and not isinstance(user, str):
+        raise InvalidRecord("'user' metin olmalı")
+
+    clean = {'type': kind, 'user': user, 'id': record_id, 'text': text}
+    if kind == 'note':
+        clean['timestamp'] = _check_time(record, 'timestamp')
+    else:
+        clean['time'] = _check_time(record, 'time')
+        clean['created'] = _check_time(record, 'created')
+        clean['fired'] = _check_time(record, 'fired', required=False)
+    return clean
+
+
+def load_checkpoint(path):
+    """Artımlı yedek noktası: {"users": {kullanıcı: {"note": son id, "reminder": son id}}}."""
+    if not path or not os.path.exists(path):
+        return {'users': {}}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def export_jsonl(stores, out, users=None, checkpoint=None, batch_size=500):
+    """
+    Notları ve hatırlatıcıları JSON Lines olarak akıtır.
+
+    Kayıtlar shard başına id sırasıyla parça parça okunur; bellek kullanımı
+    veri boyutundan bağımsızdır. checkpoint verilirse yalnızca oradaki son
+    id'lerden sonra eklenen kayıtlar yazılır ve checkpoint yerinde güncellenir.
+    (Hatırlatıcının arşive taşınması yeni kayıt sayılmaz.)
+
+    Args:
+        stores: StorePool
+        out: Yazılabilir metin akışı
+        users: Dışa aktarılacak kullanıcılar (None = diskteki tümü)
+        checkpoint: load_checkpoint çıktısı (None = tam yedek)
+        batch_size: Tek sorguda okunacak kayıt sayısı
+
+    Returns:
+        dict: Tipe göre yazılan kayıt sayısı
+    """
+    counts = {kind: 0 for kind in RECORD_TYPES}
+    marks = checkpoint['users'] if checkpoint is not None else {}
+
+    for user in users or stores.user_ids():
+        key = stores.shard_key(user)
+        mark = marks.setdefault(key, {kind: 0 for kind in RECORD_TYPES})
+
+        with stores.acquire(key) as store:
+            for note in store.iter_notes(after_id=mark['note'], batch_size=batch_size):
+                out.write(json.dumps({'type': 'note', 'user': key, **note}, ensure_ascii=False) + '\n')
+                mark['note'] = note['id']
+                counts['note'] += 1
+
+            for reminder in store.iter_reminders(after_id=mark['reminder'], batch_size=batch_size):
+                reminder.pop('due')  # 'time' alanından yeniden hesaplanır
+                if reminder['fired'] is None:
+                    del reminder['fired']
+                out.write(json.dumps({'type': 'reminder', 'user': key, **reminder}, ensure_ascii=False) + '\n')
+                mark['reminder'] = reminder['id']
+                counts['reminder'] += 1
+
+    if checkpoint is not None:
+        checkpoint['updated'] = datetime.now().strftime(TIMESTAMP_FORMAT)
+    return counts
+
+
+def import_jsonl(stores, lines, user=None, scheduler=None, report=None, first_line=1):
+    """
+    JSON Lines kayıtlarını satır satır içeri aktarır.
+
+    Aynı metin ve zaman damgasına sahip kayıtlar atlanır; böylece aynı yedek
+    tekrar yüklenebilir ve artımlı yedekler üst üste uygulanabilir. Hatalı
+    satırlar aktarımı durdurmaz, satır numarasıyla raporlanır.
+
+    Args:
+        stores: StorePool
+        lines: Metin satırları (açık dosya da olabilir)
+        user: Verilirse tüm kayıtlar bu kullanıcıya yazılır (kayıttaki 'user' yok sayılır)
+        scheduler: Çalışan ReminderScheduler; eklenen bekleyen hatırlatıcılar
+            yeniden başlatmayı beklemeden kuyruğa alınır
+        report: Verilirse sayılar bu rapora eklenir (akış parça parça aktarılırken)
+        first_line: lines'ın ilk satırının akıştaki numarası (hata raporu için)
+
+    Returns:
+        dict: added, duplicates, invalid sayıları ve errors [(satır, hata)]
+    """
+    if report is None:
+        report = {'added': 0, 'duplicates': 0, 'invalid': 0, 'errors': []}
+
+    # Aynı kullanıcının ardışık kayıtları için shard açık tutulur
+    current_key, store = None, None
+    with ExitStack() as stack:
+        for number, line in enumerate(lines, first_line):
+            if not line.strip():
+                continue
+            try:
+                record = validate_record(json.loads(line))
+            except (ValueError, InvalidRecord) as e:
+                report['invalid'] += 1
+                if len(report['errors']) < MAX_REPORTED_ERRORS:
+                    report['errors'].append((number, str(e)))
+                continue
+
+            key = stores.shard_key(user or record['user'])
+            if key != current_key:
+                stack.close()
+                store = stack.enter_context(stores.acquire(key))
+                stack.callback(store.flush)
+                current_key = key
+
+            if record['type'] == 'note':
+                added = store.import_note(record)
+            else:
+                added = store.import_reminder(record)
+                if added and scheduler is not None and 'fired' not in added:
+                    added['user'] = key
+                    scheduler.schedule(added)
+            report['added' if added else 'duplicates'] += 1
+
+    return report
+
+
+# Kullanım:
+#   python -m modules.data_transfer export yedek.jsonl.gz [--user ayse] [--since yedek.checkpoint.json]
+#   python -m modules.data_transfer import yedek.jsonl.gz [--user ayse]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Notları ve hatırlatıcıları JSON Lines olarak aktarır")
+    parser.add_argument('command', choices=['export', 'import'])
+    parser.add_argument('path', help="JSONL dosyası (.gz sıkıştırılır, '-' = stdout/stdin)")
+    parser.add_argument('--user', help="Yalnızca bu kullanıcı (import'ta hedef kullanıcı)")
+    parser.add_argument('--since', help="Artımlı yedek için checkpoint dosyası (yoksa oluşturulur)")
+    parser.add_argument('--db', default="data/assistant.db")
+    parser.add_argument('--users-dir', default="data/users")
+    args = parser.parse_args()
+
+    pool = StorePool(args.db, args.users_dir)
+    try:
+        if args.command == 'export':
+            checkpoint = load_checkpoint(args.since) if args.since else None
+            with _open_text(args.path, 'w') as f:
+                counts = export_jsonl(pool, f, users=[args.user] if args.user else None, checkpoint=checkpoint)
+            # Checkpoint yalnızca dışa aktarma eksiksiz bittiyse ilerler
+            if checkpoint is not None:
+                atomic_write_bytes(args.since, json.dumps(checkpoint, indent=2).encode('utf-8'))
+            print(f"✓ {counts['note']} not ve {counts['reminder']} hatırlatıcı dışa aktarıldı", file=sys.stderr)
+        else:
+            with _open_text(args.path, 'r') as f:
+                report = import_jsonl(pool, f, user=args.user)
+            print(f"✓ {report['added']} kayıt eklendi, {report['duplicates']} kayıt zaten vardı", file=sys.stderr)
+            if report['invalid']:
+                print(f"⚠ {report['invalid']} geçersiz satır atlandı", file=sys.stderr)
+                for number, error in report['errors']:
+                    print(f"   satır {number}: {error}", file=sys.stderr)
+    finally:
+        pool.close()
@@ -0,0 +1,391 @@
+import re
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from modules.turkish_text import (fold_ascii, number_word_stem, ordinal_word_stem, parse_number_words,
+                                  turkish_lower)
+
+
+# kind: duration | clock | relative_day | weekday | number | ordinal
+# start/end: orijinal metindeki karakter aralığı
+Entity = namedtuple('Entity', ['kind', 'value', 'start', 'end'])
+
+WEEKDAYS = ['pazartesi', 'sali', 'carsamba', 'persembe', 'cuma', 'cumartesi', 'pazar']
+WEEKDAY_NAMES = ['Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma', 'Cumartesi', 'Pazar']
+
+RELATIVE_DAYS = {'bugun': 0, 'yarin': 1, 'obur': 2, 'ertesi': 2, 'haftaya': 7}
+RELATIVE_DAY_NAMES = {0: 'bugün', 1: 'yarın', 2: 'öbür gün', 7: 'haftaya'}
+
+DURATION_UNITS = {
+    'sn': 1, 'saniye': 1, 'dk': 60, 'dakika': 60, 'sa': 3600, 'saat': 3600,
+    'gun': 86400, 'hafta': 7 * 86400,
+}
+
+# Bundan uzun süreler süre sayılmaz ("999999999 gün sonra"); timedelta ve
+# datetime aritmetiği taşmaz, hatırlatıcı "zaman belirtmediniz" yanıtı verir
+MAX_DURATION_SECONDS = 10 * 365 * 86400
+
+# Varsayılan hatırlatma saati (yalnızca gün belirtildiğinde)
+DEFAULT_HOUR = 9
+
+# Metin önce kelimelere ayrılır; sayı kelimeleri rakama çevrilerek
+# normalize edilmiş bir metin kurulur ("saat on dörtte" → "saat 14'te").
+_WORD_RE = re.compile(r"\d+(?:[.:,]\d+)?(?:'\w+)?|[^\W\d_]+|[^\w\s]")
+
+_PERIOD = r"(?:sabah|ogleden\s+sonra|oglen?|aksam|gece)\w*"
+
+# Tüm varlık türleri tek bir birleşik desende; normalize metin üzerinde
+# tek finditer geçişi yeterli. Alternatiflerin sırası önceliği belirler.
+_ENTITY_RE = re.compile(rf"""
+    (?P<duration>
+        (?P<dur_n>\d+(?:[.,]\d+)?|yarim)(?:\s+(?P<dur_half>bucuk))?\s*
+        (?P<dur_u>(?:saniye|dakika|saat|gun|hafta)\w*|(?:sn|dk|sa)\b)
+        (?:\s+(?:sonra|icinde|boyunca))?
+    )
+  | (?P<clock>
+        (?:(?P<period>{_PERIOD})\s+)?
+        (?:
+            (?:saat\s+)?(?P<hm_h>\d{{1,2}})[.:](?P<hm_m>\d{{2}})(?:'\w+)?
+          | saat\s+(?P<s_h>\d{{1,2}})(?:'\w+|\s+(?P<s_half>bucuk)\w*)?
+          | (?P<l_h>\d{{1,2}})(?:'(?:de|da|te|ta)\b|\s+(?P<l_half>bucukta)\b)
+          | (?<=\s)(?P<p_h>\d{{1,2}})(?:\s+(?P<p_half>bucuk)\w*)?\b(?!\s+virgul)
+        )
+    )
+  | \b(?P<relative_day>bugun|yarin|obur\s*gun|ertesi\s+gun|haftaya)\w*
+  | \b(?P<weekday>pazartesi|sali|carsamba|persembe|cumartesi|cuma|pazar)\w*(?:\s+gunu\w*)?
+  | (?P<ordinal>\d+)(?:'(?:inci|nci|uncu|ncu)\b|\.(?=\s+[^\W\d_]))
+  | (?P<number>\d+(?:[.,]\d+)?)(?:'\w+|\s+virgul\s+(?P<fraction>\d+))?
+""", re.VERBOSE)
+_KINDS = ('duration', 'clock', 'relative_day', 'weekday', 'ordinal', 'number')
+
+
+class Entities:
+    def __init__(self, text, normalized, items):
+        """
+        Bir ifadeden çıkarılan tipli varlıklar.
+
+        Args:
+            text: Orijinal metin
+            normalized: Sayı kelimeleri rakama çevrilmiş, katlanmış metin
+            items: Entity listesi (metindeki sıraya göre)
+        """
+        self.text = text
+        self.normalized = normalized
+        self.items = items
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __repr__(self):
+        return f"Entities({self.items!r})"
+
+    def all(self, kind):
+        """Verilen türdeki tüm varlıklar."""
+        return [e for e in self.items if e.kind == kind]
+
+    def first(self, kind):
+        """Verilen türdeki ilk varlık (yoksa None)."""
+        for e in self.items:
+            if e.kind == kind:
+                return e
+        return None
+
+    def total_duration(self):
+        """Tüm süre varlıklarının toplamı ("2 saat 30 dakika"); süre yoksa None."""
+        durations = self.all('duration')
+        if not durations:
+            return None
+        return sum((e.value for e in durations), timedelta())
+
+    def strip(self, kinds):
+        """
+        Verilen türdeki varlıkları orijinal metinden çıkarır.
+
+        Args:
+            kinds: Çıkarılacak tür isimleri
+
+        Returns:
+            str: Kalan metin
+        """
+        parts = []
+        last = 0
+        for e in self.items:
+            if e.kind in kinds:
+                parts.append(self.text[last:e.start])
+                last = e.end
+        parts.append(self.text[last:])
+        return ' '.join(''.join(parts).split())
+
+    def resolve_datetime(self, now=None):
+        """
+        Zaman varlıklarını tek bir tarih-saate çevirir.
+
+        "yarın 14.30", "cuma akşam 7'de", "2 saat 30 dakika sonra" gibi
+        birleşik ifadeleri destekler.
+
+        Args:
+            now: Referans zaman (varsayılan: şimdi)
+
+        Returns:
+            tuple: (datetime, Türkçe açıklama) veya zaman yoksa (None, "")
+        """
+        now = now or datetime.now()
+        duration = self.total_duration()
+        clock = self.first('clock')
+        relative = self.first('relative_day')
+        weekday = self.first('weekday')
+
+        if clock is None and relative is None and weekday is None:
+            if duration is None:
+                return None, ""
+            return now + duration, f"{format_duration(duration)} sonra"
+
+        day_offset = 0
+        day_phrase = ""
+        if relative is not None:
+            day_offset = relative.value
+            day_phrase = RELATIVE_DAY_NAMES.get(relative.value, "")
+        elif weekday is not None:
+            day_offset = (weekday.value - now.weekday()) % 7
+            day_phrase = f"{WEEKDAY_NAMES[weekday.value]} günü"
+        if duration is not None:
+            day_offset += duration.days
+
+        hour, minute = clock.value if clock is not None else (DEFAULT_HOUR, 0)
+        target = (now + timedelta(days=day_offset)).replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+        if target <= now:
+            if clock is not None and relative is None and hour < 12 and not clock_has_period(clock, self):
+                # "saat 3'te" öğleden sonra söylendiyse 15:00 kastediliyordur
+                afternoon = target + timedelta(hours=12)
+                if afternoon > now and day_offset == 0:
+                    target = afternoon
+            if target <= now:
+                target += timedelta(days=7 if weekday is not None and relative is None else 1)
+                if not day_phrase and target.date() == (now + timedelta(days=1)).date():
+                    day_phrase = "yarın"
+
+        hour_str = f"{target.hour:02d}:{target.minute:02d}"
+        time_phrase = f"saat {hour_str}'{locative_suffix(target.hour, target.minute)}"
+        return target, f"{day_phrase} {time_phrase}".strip()
+
+
+def clock_has_period(clock, entities):
+    """Saat ifadesinde sabah/akşam gibi bir gün dilimi belirtilmiş mi?"""
+    return re.search(_PERIOD, fold_ascii(turkish_lower(entities.text[clock.start:clock.end]))) is not None
+
+
+def locative_suffix(hour, minute):
+    """
+    Saatin okunuşuna göre bulunma eki ("09:00'da", "14:30'da", "15:00'te").
+
+    Args:
+        hour: Saat
+        minute: Dakika
+
+    Returns:
+        str: "da", "de", "ta" veya "te"
+    """
+    value = minute or hour
+    if value == 0:
+        return "da"  # sıfır
+    if value % 10:
+        return {1: "de", 2: "de", 3: "te", 4: "te", 5: "te", 6: "da", 7: "de", 8: "de", 9: "da"}[value % 10]
+    return {10: "da", 20: "de", 30: "da", 40: "ta", 50: "de"}[value]
+
+
+def format_duration(duration):
+    """timedelta'yı Türkçe yazar ("1 saat 30 dakika")."""
+    seconds = int(duration.total_seconds())
+    parts = []
+    for unit_seconds, name in ((86400, "gün"), (3600, "saat"), (60, "dakika"), (1, "saniye")):
+        amount, seconds = divmod(seconds, unit_seconds)
+        if amount:
+            parts.append(f"{amount} {name}")
+    return ' '.join(parts) or "0 saniye"
+
+
+def _normalize(text):
+    """
+    Metni katlar ve sayı kelimelerini rakama çevirir.
+
+    Returns:
+        tuple: (normalize metin, parça başlangıçları, parça aralıkları)
+            Aralıklar (norm_start, norm_end, orig_start, orig_end) biçimindedir.
+    """
+    folded = fold_ascii(turkish_lower(text))
+    tokens = [(m.group(), m.start(), m.end()) for m in _WORD_RE.finditer(folded)]
+
+    stems = []
+    ordinals = []
+    for word, _, _ in tokens:
+        stem = None
+        ordinal = False
+        if word[0].isalpha() and word != 'yuzde':
+            stem = number_word_stem(word)
+            if stem is None:
+                stem = ordinal_word_stem(word)
+                ordinal = stem is not None
+        stems.append(stem)
+        ordinals.append(ordinal)
+
+    pieces = []
+    spans = []
+    pos = 0
+    i = 0
+    while i < len(tokens):
+        word, start, end = tokens[i]
+
+        if stems[i] is not None:
+            value, j = parse_number_words(stems, i)
+            # Sıra sayı eki yalnızca son kelimede olabilir ("on beşinci")
+            for k in range(i, j - 1):
+                if ordinals[k]:
+                    value, j = parse_number_words(stems[:k + 1], i)
+                    break
+            last_word = tokens[j - 1][0]
+            if ordinals[j - 1]:
+                piece = f"{value}'inci"
+            else:
+                suffix = last_word[len(stems[j - 1]):]
+                piece = f"{value}'{suffix}" if suffix else str(value)
+            end = tokens[j - 1][2]
+            i = j
+        else:
+            piece = word
+            i += 1
+
+        spans.append((pos, pos + len(piece), start, end))
+        pieces.append(piece)
+        pos += len(piece) + 1
+
+    return ' '.join(pieces), [s[0] for s in spans], spans
+
+
+def _to_original(spans, starts, norm_start, norm_end):
+    """Normalize metindeki aralığı orijinal metindeki aralığa çevirir."""
+    first = bisect_right(starts, norm_start) - 1
+    last = bisect_right(starts, norm_end - 1) - 1
+    return spans[max(first, 0)][2], spans[last][3]
+
+
+def _to_number(raw):
+    raw = raw.replace(',', '.')
+    return float(raw) if '.' in raw else int(raw)
+
+
+def _clock_value(m):
+    """Saat eşleşmesinden (saat, dakika) çıkarır."""
+    for prefix in ('hm', 's', 'l', 'p'):
+        hour = m.group(f'{prefix}_h')
+        if hour is not None:
+            break
+    hour = int(hour)
+
+    if prefix == 'hm':
+        minute = int(m.group('hm_m'))
+    else:
+        minute = 30 if m.group(f'{prefix}_half') else 0
+
+    period = m.group('period')
+    if period:
+        if period.startswith(('aksam', 'ogle')) and hour < 12:
+            hour += 12
+        elif period.startswith('gece') and 6 <= hour < 12:
+            hour += 12
+
+    if hour > 23 or minute > 59:
+        return None
+    return hour, minute
+
+
+def extract_entities(text):
+    """
+    Bir ifadedeki süre, saat, göreli gün, haftanın günü, sayı ve sıra sayı
+    varlıklarını tek geçişte çıkarır.
+
+    Args:
+        text: Kullanıcı metni
+
+    Returns:
+        Entities: Çıkarılan varlıklar
+    """
+    normalized, starts, spans = _normalize(text)
+    items = []
+
+    for m in _ENTITY_RE.finditer(normalized):
+        kind = next(k for k in _KINDS if m.group(k) is not None)
+
+        if kind == 'duration':
+            amount = 0.5 if m.group('dur_n') == 'yarim' else _to_number(m.group('dur_n'))
+            if m.group('dur_half'):
+                amount += 0.5
+            unit = m.group('dur_u')
+            unit_seconds = next(s for u, s in DURATION_UNITS.items() if unit == u or
+                                (len(u) > 2 and unit.startswith(u)))
+            if amount * unit_seconds > MAX_DURATION_SECONDS:
+                continue
+            value = timedelta(seconds=amount * unit_seconds)
+        elif kind == 'clock':
+            value = _clock_value(m)
+            if value is None:
+                continue
+            # Gün dilimi olmadan tek başına sayı ("sabah" yoksa) saat değildir
+            if m.group('p_h') is not None and not m.group('period'):
+                kind = 'number'
+                value = int(m.group('p_h'))
+        elif kind == 'relative_day':
+            value = RELATIVE_DAYS[m.group('relative_day').split()[0].replace('gun', '')]
+        elif kind == 'weekday':
+            value = WEEKDAYS.index(m.group('weekday'))
+        elif kind == 'ordinal':
+            value = int(m.group('ordinal'))
+        elif m.group('fraction'):
+            value = float(f"{m.group('number')}.{m.group('fraction')}")
+        else:
+            value = _to_number(m.group('number'))
+
+        start, end = _to_original(spans, starts, m.start(), m.end())
+        items.append(Entity(kind, value, start, end))
+
+    return Entities(text, normalized, items)
+
+
+# Test fonksiyonu
+if __name__ == "__main__":
+    print("=== VARLIK ÇIKARMA TESTİ ===\n")
+
+    now = datetime(2026, 2, 3, 14, 0)  # Salı
+    test_sentences = [
+        "yarın 14.30'da toplantıyı hatırlat",
+        "30 dakika sonra çay içmeyi hatırlat",
+        "iki saat otuz dakika sonra uyar",
+        "yarım saat sonra",
+        "bir buçuk saat sonra ara",
+        "cuma akşam yedide spora git",
+        "saat on dörtte ilacı hatırlat",
+        "saat 3'te",
+        "sabah 8 buçukta kalk",
+        "öbür gün saat 9'da",
+        "3 gün sonra faturayı öde",
+        "45 dakikalık pomodoro başlat",
+        "üçüncü sıradaki notu sil",
+        "yüz yirmi beş artı 3",
+    ]
+
+    for sentence in test_sentences:
+        entities = extract_entities(sentence)
+        when, description = entities.resolve_datetime(now)
+        print(f"📝 '{sentence}'")
+        for e in entities:
+            print(f"   {e.kind:<13} {e.value!s:<22} '{sentence[e.start:e.end]}'")
+        if when:
+            print(f"   → {when:%d.%m.%Y %H:%M} ({description})")
+        print(f"   kalan: '{entities.strip(('duration', 'clock', 'relative_day', 'weekday'))}'")
+        print("-" * 60)
+
+    print("\nTest tamamlandı!")
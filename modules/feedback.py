@@ -0,0 +1,229 @@
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+
+from modules.note_store import TIMESTAMP_FORMAT
+from modules.store_pool import DEFAULT_USER
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL DEFAULT 'default',
+    text TEXT NOT NULL,
+    processed TEXT NOT NULL,
+    predicted TEXT,
+    confidence REAL,
+    label TEXT,
+    created TEXT NOT NULL,
+    labeled TEXT,
+    learned INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_feedback_open ON feedback(label, learned);
+"""
+
+_USER_INDEX = "CREATE INDEX IF NOT EXISTS idx_feedback_user ON feedback(user_id, label)"
+
+_COLUMNS = "id, user_id, text, processed, predicted, confidence, label, created, labeled"
+
+
+class FeedbackQueue:
+    def __init__(self, db_file="data/feedback.db", max_open=1000, busy_timeout=10.0):
+        """
+        Düşük güvenli ve 'unknown' sonuçlanan ifadelerin kuyruğu.
+
+        IntentClassifier bu ifadeleri log() ile ekler; arayüz veya API
+        doğru intent'i label() ile işaretler. OnlineLearner etiketli ve
+        henüz öğrenilmemiş kayıtları take_labeled() ile alır.
+
+        log() istek yolunda çağrıldığı için veritabanına yazmaz; kayıtlar
+        bellekteki kuyruğa eklenir ve arka plan thread'i tarafından toplu
+        olarak yazılır. Kayıtlar kullanıcıya aittir: pending(), label() ve
+        arayüz yalnızca ilgili kullanıcının ifadelerini görür.
+
+        Args:
+            db_file: SQLite dosyası
+            max_open: Kullanıcı başına etiket bekleyen en fazla kayıt (eskiler silinir)
+            busy_timeout: Başka süreç yazarken beklenecek en uzun süre (saniye)
+        """
+        self.db_file = db_file
+        self.max_open = max_open
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_file)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self.conn = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None,
+                                    timeout=busy_timeout)
+        self.conn.row_factory = sqlite3.Row
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(_SCHEMA)
+            # user_id sütunu sonradan eklendi; eski veritabanlarını yükselt
+            columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(feedback)")}
+            if 'user_id' not in columns:
+                self.conn.execute(f"ALTER TABLE feedback ADD COLUMN user_id TEXT NOT NULL DEFAULT '{DEFAULT_USER}'")
+            self.conn.execute(_USER_INDEX)
+
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._run, name="feedback-writer", daemon=True)
+        self._writer.start()
+
+    def log(self, text, processed, predicted, confidence, user_id=None):
+        """
+        Emin olunamayan bir ifadeyi yazılmak üzere kuyruğa ekler (bloklamaz).
+
+        Aynı kullanıcının aynı ön işlenmiş metni zaten etiket bekliyorsa
+        yeni kayıt açılmaz.
+
+        Args:
+            text: Kullanıcı metni
+            processed: preprocess_text çıktısı (öğrenme bu metinle yapılır)
+            predicted: Verilen intent
+            confidence: Güven
+            user_id: İfadeyi söyleyen kullanıcı (None = varsayılan kullanıcı)
+        """
+        self._queue.put((user_id or DEFAULT_USER, text, processed, predicted, float(confidence)))
+
+    def flush(self):
+        """Kuyruktaki kayıtlar veritabanına yazılana kadar bekler."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            # Biriken kayıtlar tek işlemde yazılır
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [item for item in items if item is not None]
+            try:
+                if records:
+                    self._write(records)
+            except Exception as e:
+                print(f"⚠ Geri bildirim kaydedilemedi: {e}")
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+            if len(records) != len(items):
+                return
+
+    def _write(self, records):
+        now = _now_str()
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                for user_id, text, processed, predicted, confidence in records:
+                    row = self.conn.execute(
+                        "SELECT id FROM feedback WHERE user_id = ? AND processed = ? AND label IS NULL",
+                        (user_id, processed)
+                    ).fetchone()
+                    if row is not None:
+                        continue
+                    self.conn.execute(
+                        "INSERT INTO feedback (user_id, text, processed, predicted, confidence, created) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (user_id, text, processed, predicted, confidence, now)
+                    )
+
+                # Etiketlenmeyen kayıtlar sınırsız birikmesin
+                for user_id in {record[0] for record in records}:
+                    self.conn.execute(
+                        "DELETE FROM feedback WHERE user_id = ? AND label IS NULL AND id <= ("
+                        "SELECT id FROM feedback WHERE user_id = ? AND label IS NULL ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                        (user_id, user_id, self.max_open)
+                    )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def pending(self, user_id=None, limit=20):
+        """Kullanıcının etiket bekleyen en yeni kayıtları."""
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {_COLUMNS} FROM feedback WHERE user_id = ? AND label IS NULL ORDER BY id DESC LIMIT ?",
+                (user_id or DEFAULT_USER, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def label(self, feedback_id, intent, user_id=None):
+        """
+        Kullanıcının kaydına doğru intent'i atar.
+
+        Args:
+            feedback_id: Kayıt id'si
+            intent: Doğru intent etiketi
+            user_id: Kaydın sahibi (başka kullanıcının kaydı etiketlenemez)
+
+        Returns:
+            bool: Kayıt bulunduysa True
+        """
+        with self._lock:
+            cursor = self.conn.execute(
+                "UPDATE feedback SET label = ?, labeled = ?, learned = 0 WHERE id = ? AND user_id = ?",
+                (intent, _now_str(), feedback_id, user_id or DEFAULT_USER)
+            )
+        return cursor.rowcount > 0
+
+    def add_example(self, text, processed, intent, user_id=None):
+        """Kuyruğa uğramamış bir düzeltmeyi (ör. yanlış ama emin tahmin) doğrudan etiketli ekler."""
+        now = _now_str()
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT INTO feedback (user_id, text, processed, label, created, labeled) VALUES (?, ?, ?, ?, ?, ?)",
+                (user_id or DEFAULT_USER, text, processed, intent, now, now)
+            )
+        return cursor.lastrowid
+
+    def take_labeled(self, limit=256):
+        """Etiketli ve henüz öğrenilmemiş kayıtlar (eskiden yeniye, tüm kullanıcılar)."""
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {_COLUMNS} FROM feedback WHERE label IS NOT NULL AND learned = 0 ORDER BY id LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def mark_learned(self, ids):
+        """Kayıtları öğrenildi olarak işaretler."""
+        with self._lock:
+            self.conn.executemany("UPDATE feedback SET learned = 1 WHERE id = ?", [(i,) for i in ids])
+
+    def all_labeled(self):
+        """Tüm etiketli kayıtlar (model sıfırdan kurulurken yeniden oynatılır)."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT processed, label FROM feedback WHERE label IS NOT NULL ORDER BY id"
+            ).fetchall()
+        return [(row['processed'], row['label']) for row in rows]
+
+    def stats(self, user_id=None):
+        """Kuyruk durumu: bekleyen, etiketli ve öğrenilmiş kayıt sayıları (None = tüm kullanıcılar)."""
+        query = "SELECT SUM(label IS NULL), SUM(label IS NOT NULL AND learned = 0), SUM(learned = 1) FROM feedback"
+        params = ()
+        if user_id is not None:
+            query += " WHERE user_id = ?"
+            params = (user_id,)
+        with self._lock:
+            row = self.conn.execute(query, params).fetchone()
+        return {'pending': row[0] or 0, 'labeled': row[1] or 0, 'learned': row[2] or 0}
+
+    def close(self):
+        """Kuyruktaki kayıtları yazar ve bağlantıyı kapatır."""
+        self._queue.put(None)
+        self._writer.join()
+        with self._lock:
+            self.conn.close()
+
+
+def _now_str():
+    return datetime.now().strftime(TIMESTAMP_FORMAT)
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    def __init__(self, path, timeout=10.0, poll_interval=0.01):
+        """
+        Süreçler arası dosya kilidi (POSIX'te flock, Windows'ta msvcrt.locking).
+
+        Aynı veri dosyasına birden fazla Streamlit/servis süreci yazarken
+        kritik bölgeleri sıralamak için kullanılır:
+
+            with FileLock("data/assistant.db.lock"):
+                ...
+
+        Args:
+            path: Kilit dosyası yolu
+            timeout: Kilit için en fazla bekleme süresi (saniye)
+            poll_interval: Kilit denemeleri arasındaki bekleme (saniye)
+        """
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd = None
+
+    def acquire(self):
+        """Kilidi alır; süre aşılırsa TimeoutError fırlatır."""
+        lock_dir = os.path.dirname(self.path)
+        if lock_dir:
+            os.makedirs(lock_dir, exist_ok=True)
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            try:
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                self._fd = fd
+                return
+            except OSError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise TimeoutError(f"Dosya kilidi alınamadı: {self.path}")
+                time.sleep(self.poll_interval)
+
+    def release(self):
+        """Kilidi bırakır."""
+        if self._fd is None:
+            return
+        try:
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def atomic_write_bytes(path, data):
+    """
+    Dosyayı yarım yazılmış hâliyle asla görünmeyecek şekilde yazar.
+
+    Veri aynı klasördeki geçici bir dosyaya yazılıp diske senkronlanır,
+    ardından os.replace ile hedefin üzerine taşınır (rename atomiktir).
+
+    Args:
+        path: Hedef dosya
+        data: Yazılacak bayt dizisi
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
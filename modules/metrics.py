@@ -0,0 +1,200 @@
+import bisect
+import os
+import threading
+import time
+
+
+# Saniye cinsinden üst sınırlar (100 µs ... 30 s, yaklaşık logaritmik)
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Sabit kovalı gecikme histogramı.
+
+        Gözlem başına bir ikili arama ve bir sayaç artışı yapılır; bellek
+        kullanımı gözlem sayısından bağımsızdır.
+
+        Args:
+            buckets: Artan sırada kova üst sınırları (saniye)
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Son kova: +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        """Bir gözlem ekler."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def percentile(self, q):
+        """
+        Kovalardan yüzdelik tahmini yapar (kova içinde doğrusal ara değer).
+
+        Args:
+            q: 0-1 arası yüzdelik (0.95 = p95)
+
+        Returns:
+            float: Tahmini değer (gözlem yoksa 0.0)
+        """
+        with self._lock:
+            counts = list(self.counts)
+            total = self.count
+
+        if not total:
+            return 0.0
+
+        rank = q * total
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+    def mean(self):
+        """Ortalama değer."""
+        with self._lock:
+            return self.sum / self.count if self.count else 0.0
+
+
+class _Timer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    def __init__(self, enabled=True, prefix="assistant"):
+        """
+        Pipeline aşamalarının süre histogramları.
+
+        Kapalıyken timed() paylaşılan boş bir context manager döndürür; saat
+        okunmaz, kilit alınmaz, histogram oluşturulmaz.
+
+        Aşamalar iç içe olabilir (classify içinde preprocess/model/fallback),
+        bu yüzden aşama süreleri toplanarak toplam süre bulunmaz.
+
+        Args:
+            enabled: Başlangıçta ölçüm açık mı
+            prefix: Prometheus metrik adı öneki
+        """
+        self.enabled = enabled
+        self.prefix = prefix
+        self._histograms = {}  # aşama → Histogram
+        self._lock = threading.Lock()
+
+    def histogram(self, stage):
+        """Aşamanın histogramı (yoksa oluşturulur)."""
+        hist = self._histograms.get(stage)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(stage, Histogram())
+        return hist
+
+    def timed(self, stage):
+        """
+        Bloğun süresini aşama histogramına ekler.
+
+            with METRICS.timed('transcribe'):
+                ...
+
+        Args:
+            stage: Aşama adı
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self.histogram(stage))
+
+    def observe(self, stage, seconds):
+        """Dışarıda ölçülmüş bir süreyi ekler."""
+        if self.enabled:
+            self.histogram(stage).observe(seconds)
+
+    def reset(self):
+        """Tüm ölçümleri siler."""
+        with self._lock:
+            self._histograms = {}
+
+    def summary(self):
+        """
+        Aşama başına özet (milisaniye).
+
+        Returns:
+            dict: aşama → {'count', 'mean_ms', 'p50_ms', 'p95_ms'}
+        """
+        return {
+            stage: {
+                'count': hist.count,
+                'mean_ms': hist.mean() * 1000,
+                'p50_ms': hist.percentile(0.50) * 1000,
+                'p95_ms': hist.percentile(0.95) * 1000,
+            }
+            for stage, hist in sorted(self._histograms.items())
+            if hist.count
+        }
+
+    def to_prometheus(self):
+        """
+        Prometheus metin biçiminde (0.0.4) dışa aktarım.
+
+        Returns:
+            str: Kümülatif kovalı histogram satırları
+        """
+        name = f"{self.prefix}_stage_duration_seconds"
+        lines = [
+            f"# HELP {name} Pipeline aşaması süresi",
+            f"# TYPE {name} histogram",
+        ]
+
+        for stage, hist in sorted(self._histograms.items()):
+            with hist._lock:
+                counts = list(hist.counts)
+                total = hist.count
+                value_sum = hist.sum
+
+            cumulative = 0
+            for bound, bucket_count in zip(hist.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {total}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {value_sum:.9f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {total}')
+
+        return "\n".join(lines) + "\n"
+
+
+# Uygulama genelinde paylaşılan kayıt; ASSISTANT_METRICS=0 ile kapatılır
+METRICS = MetricsRegistry(enabled=os.environ.get("ASSISTANT_METRICS", "1") != "0")
@@ -0,0 +1,662 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from modules.file_utils import FileLock
+from modules.metrics import METRICS
+from modules.turkish_text import normalize_for_search, strip_case_suffix
+
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Arama sorgusundan atılan komut kelimeleri (katlanmış biçimde)
+SEARCH_STOPWORDS = {
+    'ile', 'ilgili', 'hakkinda', 'hakkindaki', 'icin', 'icinde', 'iceren', 'gecen', 'olan',
+    'not', 'notu', 'notum', 'notumu', 'notlar', 'notlari', 'notlarim', 'notlarimi',
+    'notlarimda', 'notlarda', 'notlarin', 'notlarimin',
+    'ara', 'arar', 'misin', 'bul', 'goster', 'listele', 'getir', 'hangi', 'var', 'mi',
+    'bana', 'benim', 'tum', 'butun', 'nerede', 'da', 'de', 'ki', 've',
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    text TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+    body,
+    content='',
+    tokenize='unicode61',
+    prefix='2 3 4'
+);
+CREATE TABLE IF NOT EXISTS reminders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    text TEXT NOT NULL,
+    time TEXT NOT NULL,
+    created TEXT NOT NULL,
+    due REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reminders_due ON reminders(due);
+CREATE TABLE IF NOT EXISTS reminder_archive (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL,
+    time TEXT NOT NULL,
+    created TEXT NOT NULL,
+    due REAL NOT NULL,
+    fired TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_text TEXT NOT NULL,
+    response TEXT NOT NULL,
+    intent TEXT,
+    confidence REAL,
+    timestamp TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+    body,
+    content='',
+    tokenize='unicode61',
+    prefix='2 3 4'
+);
+"""
+
+_TURN_COLUMNS = 'id, user_text AS "user", response AS assistant, intent, confidence, timestamp'
+
+
+class NoteStore:
+    def __init__(self, db_file="data/assistant.db", notes_file="data/notes.json",
+                 reminders_file="data/reminders.json", flush_interval=0.05, max_batch=256,
+                 busy_timeout=10.0):
+        """
+        Notlar, hatırlatıcılar ve konuşma geçmişi için SQLite deposu.
+
+        Notlar ve geçmiş, Türkçe normalize edilmiş metin üzerinde kurulan
+        FTS5 indeksleriyle aranabilir. Eski JSON dosyaları ilk açılışta
+        otomatik olarak içeri aktarılır.
+
+        Yazmalar tek bir açık işlemde biriktirilir ve flush_interval içinde
+        tek commit ile diske yazılır; yoğun yükte yüzlerce ekleme tek bir
+        fsync'e iner. Aynı süreçteki okumalar bekleyen yazmaları görür.
+        Süreçler arası eşzamanlılığı SQLite'ın WAL kipi ve kilitleri sağlar.
+
+        Args:
+            db_file: SQLite veritabanı dosyası
+            notes_file: Taşınacak eski not JSON dosyası
+            reminders_file: Taşınacak eski hatırlatıcı JSON dosyası
+            flush_interval: Yazmaların birleştirileceği süre (saniye, 0 = her yazmada commit)
+            max_batch: Bu kadar yazma birikince süre dolmadan commit edilir
+            busy_timeout: Başka süreç yazarken beklenecek en uzun süre (saniye)
+        """
+        self.db_file = db_file
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._flush_timer = None
+        self.flush_count = 0
+
+        db_dir = os.path.dirname(db_file)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        # Streamlit oturumları farklı thread'lerden erişir; erişimi kilitle sıralıyoruz.
+        # isolation_level=None: işlemleri (BEGIN/COMMIT) kendimiz yönetiyoruz.
+        self.conn = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None,
+                                    timeout=busy_timeout)
+        self.conn.row_factory = sqlite3.Row
+
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(_SCHEMA)
+
+        self._migrate_json(notes_file, reminders_file)
+
+        # Süreç kapanırken bekleyen yazmalar kaybolmasın
+        atexit.register(self.flush)
+
+    # ============= YAZMA / FLUSH =============
+
+    @contextmanager
+    def _write(self):
+        """
+        Bir veya birkaç SQL ifadesini bekleyen işleme atomik olarak ekler.
+
+        İfadelerden biri hata verirse yalnızca bu yazma geri alınır;
+        aynı işlemdeki diğer yazmalar korunur.
+        """
+        with self._lock:
+            if not self.conn.in_transaction:
+                # IMMEDIATE: yazma kilidi en başta alınır, başka süreçle yarış olmaz
+                self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.execute("SAVEPOINT write")
+            try:
+                yield
+            except BaseException:
+                self.conn.execute("ROLLBACK TO write")
+                self.conn.execute("RELEASE write")
+                raise
+            self.conn.execute("RELEASE write")
+            self._pending += 1
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self.flush_interval <= 0 or self._pending >= self.max_batch:
+            self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self):
+        """Bekleyen yazmaları tek commit ile diske yazar."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self.conn.in_transaction:
+                with METRICS.timed('persist'):
+                    self.conn.commit()
+                self.flush_count += 1
+            self._pending = 0
+
+    # ============= TAŞIMA =============
+
+    def _migrate_json(self, notes_file, reminders_file):
+        """Eski JSON dosyalarını bir kereliğine veritabanına aktarır."""
+        # Aynı anda açılan iki süreç taşımayı iki kez yapmasın
+        with self._lock, FileLock(self.db_file + ".lock"):
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+            if row is not None:
+                return
+
+            notes = self._load_json(notes_file)
+            reminders = self._load_json(reminders_file)
+
+            with self._write():
+                for note in notes:
+                    self._insert_note(note['text'], note.get('timestamp') or _now_str(), note.get('id'))
+
+                for reminder in reminders:
+                    due = datetime.strptime(reminder['time'], TIMESTAMP_FORMAT).timestamp()
+                    self.conn.execute(
+                        "INSERT INTO reminders (id, text, time, created, due) VALUES (?, ?, ?, ?, ?)",
+                        (reminder.get('id'), reminder['text'], reminder['time'],
+                         reminder.get('created') or _now_str(), due)
+                    )
+
+                self.conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)", (_now_str(),))
+            self.flush()
+
+            if notes or reminders:
+                print(f"✓ {len(notes)} not ve {len(reminders)} hatırlatıcı veritabanına taşındı")
+
+    def _load_json(self, filepath):
+        """JSON dosyasını yükler, yoksa boş liste döndürür."""
+        try:
+            if filepath and os.path.exists(filepath):
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"⚠ {filepath} yüklenemedi: {e}")
+        return []
+
+    # ============= NOTLAR =============
+
+    def _insert_note(self, text, timestamp, note_id=None):
+        cursor = self.conn.execute(
+            "INSERT INTO notes (id, text, timestamp) VALUES (?, ?, ?)",
+            (note_id, text, timestamp)
+        )
+        self.conn.execute(
+            "INSERT INTO notes_fts (rowid, body) VALUES (?, ?)",
+            (cursor.lastrowid, normalize_for_search(text))
+        )
+        return cursor.lastrowid
+
+    def add_note(self, text):
+        """
+        Yeni not ekler.
+
+        Args:
+            text: Not metni
+
+        Returns:
+            dict: Eklenen not (id, text, timestamp)
+        """
+        timestamp = _now_str()
+        with self._write():
+            note_id = self._insert_note(text, timestamp)
+        return {'id': note_id, 'text': text, 'timestamp': timestamp}
+
+    def count_notes(self):
+        """Toplam not sayısı."""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+
+    def recent_notes(self, limit=5):
+        """
+        En son eklenen notları eskiden yeniye sıralı döndürür.
+
+        Args:
+            limit: Döndürülecek not sayısı
+
+        Returns:
+            list: Not sözlükleri
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id, text, timestamp FROM notes ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def clear_notes(self):
+        """Tüm notları siler ve silinen not sayısını döndürür."""
+        with self._write():
+            count = self.conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+            self.conn.execute("DELETE FROM notes")
+            self.conn.execute("INSERT INTO notes_fts (notes_fts) VALUES ('delete-all')")
+        return count
+
+    def search_notes(self, query, limit=5):
+        """
+        Notlarda tam metin araması yapar.
+
+        Sorgu Türkçe normalize edilir, komut kelimeleri atılır ve her kelimenin
+        kökü önek sorgusu olarak aranır ("marketle" → market*). Sonuçlar en
+        yeniden eskiye sıralanır; bm25 sıralaması yüz binlerce eşleşmede
+        onlarca milisaniye sürdüğü için rowid sırası tercih edildi.
+
+        Args:
+            query: Kullanıcının arama ifadesi
+            limit: En fazla kaç sonuç döndürüleceği
+
+        Returns:
+            tuple: (terimler, toplam eşleşme sayısı, en yeni eşleşen notlar)
+        """
+        terms = search_terms(query)
+        if not terms:
+            return [], 0, []
+
+        match = ' '.join(f'"{term}"*' for term in terms)
+
+        with self._lock:
+            total = self.conn.execute(
+                "SELECT COUNT(*) FROM notes_fts WHERE notes_fts MATCH ?", (match,)
+            ).fetchone()[0]
+            rows = self.conn.execute(
+                "SELECT notes.id, notes.text, notes.timestamp "
+                "FROM notes_fts JOIN notes ON notes.id = notes_fts.rowid "
+                "WHERE notes_fts MATCH ? ORDER BY notes_fts.rowid DESC LIMIT ?",
+                (match, limit)
+            ).fetchall()
+
+        return terms, total, [dict(row) for row in rows]
+
+    # ============= HATIRLATICILAR =============
+
+    def add_reminder(self, text, reminder_time):
+        """
+        Yeni hatırlatıcı ekler.
+
+        Args:
+            text: Hatırlatıcı metni
+            reminder_time: datetime olarak hatırlatma zamanı
+
+        Returns:
+            dict: Eklenen hatırlatıcı
+        """
+        reminder = {
+            'text': text,
+            'time': reminder_time.strftime(TIMESTAMP_FORMAT),
+            'created': _now_str(),
+            'due': reminder_time.timestamp(),
+        }
+        with self._write():
+            cursor = self.conn.execute(
+                "INSERT INTO reminders (text, time, created, due) VALUES (:text, :time, :created, :due)",
+                reminder
+            )
+        reminder['id'] = cursor.lastrowid
+        return reminder
+
+    def count_reminders(self):
+        """Toplam hatırlatıcı sayısı."""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM reminders").fetchone()[0]
+
+    def list_reminders(self, limit=None):
+        """
+        Bekleyen hatırlatıcıları zamana göre sıralı döndürür.
+
+        Args:
+            limit: En fazla kaç hatırlatıcı döndürüleceği (None = hepsi)
+
+        Returns:
+            list: Hatırlatıcı sözlükleri
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id, text, time, created, due FROM reminders ORDER BY due LIMIT ?",
+                (-1 if limit is None else limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def archive_reminder(self, reminder_id):
+        """
+        Zamanı gelmiş hatırlatıcıyı arşiv tablosuna taşır.
+
+        Args:
+            reminder_id: Hatırlatıcı id'si
+
+        Returns:
+            bool: Hatırlatıcı bulunup taşındıysa True
+        """
+        with self._write():
+            cursor = self.conn.execute(
+                "INSERT INTO reminder_archive (id, text, time, created, due, fired) "
+                "SELECT id, text, time, created, due, ? FROM reminders WHERE id = ?",
+                (_now_str(), reminder_id)
+            )
+            self.conn.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
+        return cursor.rowcount > 0
+
+    # ============= DIŞA / İÇE AKTARMA =============
+
+    def iter_notes(self, after_id=0, batch_size=500):
+        """
+        Notları id sırasıyla parça parça döndürür (sabit bellek).
+
+        Kilit yalnızca her parça okunurken tutulur; uzun bir dışa aktarma
+        sırasında yazmalar beklemez.
+
+        Args:
+            after_id: Yalnızca bu id'den sonraki notlar (artımlı yedek)
+            batch_size: Tek sorguda okunacak not sayısı
+
+        Yields:
+            dict: Not (id, text, timestamp)
+        """
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    "SELECT id, text, timestamp FROM notes WHERE id > ? ORDER BY id LIMIT ?",
+                    (after_id, batch_size)
+                ).fetchall()
+            for row in rows:
+                yield dict(row)
+            if len(rows) < batch_size:
+                return
+            after_id = rows[-1]['id']
+
+    def iter_reminders(self, after_id=0, batch_size=500):
+        """
+        Bekleyen ve arşivlenmiş hatırlatıcıları id sırasıyla parça parça döndürür.
+
+        Arşivdekilerde 'fired' alanı doludur, bekleyenlerde None'dır.
+
+        Args:
+            after_id: Yalnızca bu id'den sonraki hatırlatıcılar
+            batch_size: Tek sorguda okunacak hatırlatıcı sayısı
+
+        Yields:
+            dict: Hatırlatıcı (id, text, time, created, due, fired)
+        """
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    "SELECT id, text, time, created, due, NULL AS fired FROM reminders WHERE id > ? "
+                    "UNION ALL "
+                    "SELECT id, text, time, created, due, fired FROM reminder_archive WHERE id > ? "
+                    "ORDER BY id LIMIT ?",
+                    (after_id, after_id, batch_size)
+                ).fetchall()
+            for row in rows:
+                yield dict(row)
+            if len(rows) < batch_size:
+                return
+            after_id = rows[-1]['id']
+
+    def import_note(self, note):
+        """
+        Dışa aktarılmış bir notu ekler; aynı id, metin ve zaman damgalı not varsa atlar.
+
+        Id başka bir notta kullanılıyorsa (başka bir kurulumdan gelen veri)
+        not yeni bir id ile eklenir; bundan önce aynı metin ve zaman damgalı
+        not aranır, böylece aynı yedek tekrar yüklendiğinde kopya oluşmaz.
+
+        Args:
+            note: Doğrulanmış not (text, timestamp, isteğe bağlı id)
+
+        Returns:
+            bool: Not eklendiyse True, zaten varsa False
+        """
+        note_id = note.get('id')
+        with self._write():
+            if note_id is not None:
+                row = self.conn.execute("SELECT text, timestamp FROM notes WHERE id = ?", (note_id,)).fetchone()
+                if row is not None:
+                    if (row['text'], row['timestamp']) == (note['text'], note['timestamp']):
+                        return False
+                    note_id = None
+
+            if note_id is None:
+                row = self.conn.execute(
+                    "SELECT 1 FROM notes WHERE timestamp = ? AND text = ?", (note['timestamp'], note['text'])
+                ).fetchone()
+                if row is not None:
+                    return False
+            self._insert_note(note['text'], note['timestamp'], note_id)
+        return True
+
+    def import_reminder(self, reminder):
+        """
+        Dışa aktarılmış bir hatırlatıcıyı ekler; aynı id, metin ve oluşturulma zamanlı kayıt varsa atlar.
+
+        Id başka bir kayıtta kullanılıyorsa hatırlatıcı yeni bir id ile
+        eklenir; bundan önce aynı metin ve oluşturulma zamanlı kayıt aranır.
+        'fired' alanı doluysa hatırlatıcı doğrudan arşive yazılır.
+
+        Args:
+            reminder: Doğrulanmış hatırlatıcı (text, time, created, isteğe bağlı id ve fired)
+
+        Returns:
+            dict: Eklenen hatırlatıcı (add_reminder biçiminde, arşivlendiyse
+                'fired' ile); zaten varsa None
+        """
+        reminder_id = reminder.get('id')
+        due = datetime.strptime(reminder['time'], TIMESTAMP_FORMAT).timestamp()
+        with self._write():
+            if reminder_id is not None:
+                row = self.conn.execute(
+                    "SELECT text, created FROM reminders WHERE id = ? "
+                    "UNION ALL SELECT text, created FROM reminder_archive WHERE id = ?",
+                    (reminder_id, reminder_id)
+                ).fetchone()
+                if row is not None:
+                    if (row['text'], row['created']) == (reminder['text'], reminder['created']):
+                        return None
+                    reminder_id = None
+
+            if reminder_id is None:
+                row = self.conn.execute(
+                    "SELECT 1 FROM reminders WHERE created = ? AND text = ? "
+                    "UNION ALL SELECT 1 FROM reminder_archive WHERE created = ? AND text = ?",
+                    (reminder['created'], reminder['text'], reminder['created'], reminder['text'])
+                ).fetchone()
+                if row is not None:
+                    return None
+
+            if reminder.get('fired'):
+                if reminder_id is None:
+                    reminder_id = self.conn.execute(
+                        "SELECT MAX(COALESCE((SELECT MAX(id) FROM reminders), 0), "
+                        "COALESCE((SELECT MAX(id) FROM reminder_archive), 0), "
+                        "COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'reminders'), 0)) + 1"
+                    ).fetchone()[0]
+                self.conn.execute(
+                    "INSERT INTO reminder_archive (id, text, time, created, due, fired) VALUES (?, ?, ?, ?, ?, ?)",
+                    (reminder_id, reminder['text'], reminder['time'], reminder['created'], due, reminder['fired'])
+                )
+                # Arşiv id'leri hatırlatıcı tablosundan gelir; yeni hatırlatıcılar bu id'yi almamalı
+                updated = self.conn.execute(
+                    "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'reminders'", (reminder_id,)
+                ).rowcount
+                if not updated:
+                    self.conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('reminders', ?)",
+                                      (reminder_id,))
+            else:
+                reminder_id = self.conn.execute(
+                    "INSERT INTO reminders (id, text, time, created, due) VALUES (?, ?, ?, ?, ?)",
+                    (reminder_id, reminder['text'], reminder['time'], reminder['created'], due)
+                ).lastrowid
+
+        imported = {'id': reminder_id, 'text': reminder['text'], 'time': reminder['time'],
+                    'created': reminder['created'], 'due': due}
+        if reminder.get('fired'):
+            imported['fired'] = reminder['fired']
+        return imported
+
+    # ============= KONUŞMA GEÇMİŞİ =============
+
+    def add_turn(self, user_text, response, intent=None, confidence=None):
+        """
+        Geçmişe bir konuşma turu ekler (kayıtlar yalnızca eklenir, güncellenmez).
+
+        Args:
+            user_text: Kullanıcının söylediği/yazdığı metin
+            response: Asistanın yanıtı
+            intent: Tahmin edilen intent
+            confidence: Tahmin güveni
+
+        Returns:
+            dict: Eklenen tur (id, user, assistant, intent, confidence, timestamp)
+        """
+        timestamp = _now_str()
+        confidence = None if confidence is None else float(confidence)
+        with self._write():
+            cursor = self.conn.execute(
+                "INSERT INTO history (user_text, response, intent, confidence, timestamp) VALUES (?, ?, ?, ?, ?)",
+                (user_text, response, intent, confidence, timestamp)
+            )
+            self.conn.execute(
+                "INSERT INTO history_fts (rowid, body) VALUES (?, ?)",
+                (cursor.lastrowid, normalize_for_search(f"{user_text} {response}"))
+            )
+        return {'id': cursor.lastrowid, 'user': user_text, 'assistant': response,
+                'intent': intent, 'confidence': confidence, 'timestamp': timestamp}
+
+    def count_turns(self):
+        """Geçmişteki toplam tur sayısı."""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def recent_turns(self, limit=10):
+        """Son turları eskiden yeniye sıralı döndürür."""
+        return list(reversed(self.history_page(limit)))
+
+    def history_page(self, limit=20, before_id=None):
+        """
+        Geçmişi yeniden eskiye sayfa sayfa döndürür.
+
+        Sayfalama id üzerindendir (OFFSET yok); her sayfa geçmişin
+        uzunluğundan bağımsız olarak indeksle bulunur:
+
+            page = store.history_page(20)
+            older = store.history_page(20, before_id=page[-1]['id'])
+
+        Args:
+            limit: Sayfadaki tur sayısı
+            before_id: Bu id'den eski turlar (None = en yeniden başla)
+
+        Returns:
+            list: Tur sözlükleri (yeniden eskiye)
+        """
+        with self._lock:
+            if before_id is None:
+                rows = self.conn.execute(
+                    f"SELECT {_TURN_COLUMNS} FROM history ORDER BY id DESC LIMIT ?", (limit,)
+                ).fetchall()
+            else:
+                rows = self.conn.execute(
+                    f"SELECT {_TURN_COLUMNS} FROM history WHERE id < ? ORDER BY id DESC LIMIT ?",
+                    (before_id, limit)
+                ).fetchall()
+        return [dict(row) for row in rows]
+
+    def search_history(self, query, limit=20):
+        """
+        Geçmiş turlarda (kullanıcı metni ve yanıt) tam metin araması yapar.
+
+        Args:
+            query: Arama ifadesi
+            limit: En fazla kaç sonuç
+
+        Returns:
+            tuple: (terimler, toplam eşleşme sayısı, en yeni eşleşen turlar)
+        """
+        terms = search_terms(query)
+        if not terms:
+            return [], 0, []
+
+        match = ' '.join(f'"{term}"*' for term in terms)
+
+        with self._lock:
+            total = self.conn.execute(
+                "SELECT COUNT(*) FROM history_fts WHERE history_fts MATCH ?", (match,)
+            ).fetchone()[0]
+            rows = self.conn.execute(
+                f"SELECT {_TURN_COLUMNS} FROM history WHERE id IN ("
+                "SELECT rowid FROM history_fts WHERE history_fts MATCH ? ORDER BY rowid DESC LIMIT ?"
+                ") ORDER BY id DESC",
+                (match, limit)
+            ).fetchall()
+
+        return terms, total, [dict(row) for row in rows]
+
+    def clear_history(self):
+        """Konuşma geçmişini siler ve silinen tur sayısını döndürür."""
+        with self._write():
+            count = self.conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+            self.conn.execute("DELETE FROM history")
+            self.conn.execute("INSERT INTO history_fts (history_fts) VALUES ('delete-all')")
+        return count
+
+    def close(self):
+        """Bekleyen yazmaları diske yazar ve bağlantıyı kapatır."""
+        with self._lock:
+            self.flush()
+            atexit.unregister(self.flush)
+            self.conn.close()
+
+
+def search_terms(query):
+    """
+    Arama ifadesinden FTS5 terimlerini çıkarır.
+
+    Args:
+        query: Ham arama ifadesi
+
+    Returns:
+        list: Normalize edilmiş kök terimler
+    """
+    terms = []
+    for word in normalize_for_search(query).split():
+        if word in SEARCH_STOPWORDS or len(word) < 2:
+            continue
+        terms.append(strip_case_suffix(word))
+    return terms
+
+
+def _now_str():
+    return datetime.now().strftime(TIMESTAMP_FORMAT)
@@ -0,0 +1,203 @@
+import copy
+import pickle
+import random
+import threading
+import time
+
+from modules.file_utils import FileLock, atomic_write_bytes
+from modules.metrics import METRICS
+
+
+class OnlineLearner:
+    def __init__(self, classifier, feedback, model_file="models/online_intent.pkl", n_features=2 ** 14,
+                 interval=2.0, replay=16, epochs=5):
+        """
+        Etiketlenen geri bildirimlerden artımlı öğrenen intent modeli.
+
+        Özellik uzayı sabittir (HashingVectorizer): yeni kelimeler için
+        sözlük yeniden kurulmaz, SGDClassifier.partial_fit her örnekte
+        milisaniyeler içinde güncellenir. Eğitim özel bir kopya üzerinde
+        yapılır; okuyucular her zaman yayımlanmış, tamamlanmış bir anlık
+        görüntüyü kullanır (referans değişimi atomiktir). Dosyaya da
+        atomik yazılır.
+
+        Model en az bir düzeltme öğrenene kadar sınıflandırıcının model
+        katmanı TF-IDF modelinde kalır (ready).
+
+        Args:
+            classifier: IntentClassifier (ön işleme ve intent listesi için)
+            feedback: FeedbackQueue
+            model_file: Yayımlanan modelin dosyası
+            n_features: Hash özellik uzayı boyutu
+            interval: Kuyruğun kontrol aralığı (saniye)
+            replay: Her düzeltmeyle birlikte tekrar gösterilecek kalıp örneği
+                (modelin eski kalıpları unutmasını engeller)
+            epochs: Sıfırdan kurulumda kalıpların üzerinden geçiş sayısı
+        """
+        self.classifier = classifier
+        self.feedback = feedback
+        self.model_file = model_file
+        self.n_features = n_features
+        self.interval = interval
+        self.replay = replay
+        self.epochs = epochs
+
+        self.model = None       # Yayımlanmış anlık görüntü (okuyucular)
+        self._working = None    # Eğitilen kopya (yalnızca öğrenme thread'i)
+        self._vectorizer = None
+        self._patterns = []
+        self._rng = random.Random(42)
+
+        self.updates = 0
+        self.last_update_ms = 0.0
+        self._learn_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+
+    @property
+    def ready(self):
+        """Yayımlanmış ve en az bir düzeltme öğrenmiş model var mı."""
+        return self.model is not None and self.updates > 0
+
+    def start(self):
+        """Modeli yükler veya kurar ve öğrenme thread'ini başlatır."""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="online-learner", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def wake(self):
+        """Yeni etiket geldi; bir sonraki aralığı beklemeden öğren."""
+        self._wake.set()
+
+    def predict_proba(self, processed):
+        """
+        Ön işlenmiş metinler için sınıf olasılıkları.
+
+        Returns:
+            tuple: (sınıflar, olasılık matrisi)
+        """
+        model = self.model
+        return model.classes_, model.predict_proba(self._vectorizer.transform(processed))
+
+    def learn_pending(self):
+        """
+        Etiketli ve öğrenilmemiş geri bildirimleri modele işler ve yayımlar.
+
+        Returns:
+            int: Öğrenilen örnek sayısı
+        """
+        with self._learn_lock:
+            rows = self.feedback.take_labeled()
+            if not rows or self._working is None:
+                return 0
+
+            known = set(self._working.classes_)
+            examples = [(row['processed'], row['label']) for row in rows if row['label'] in known]
+            for row in rows:
+                if row['label'] not in known:
+                    print(f"⚠ Bilinmeyen intent etiketi atlandı: {row['label']}")
+
+            start = time.perf_counter()
+            with METRICS.timed('learn'):
+                for processed, label in examples:
+                    # Düzeltme, kalıplardan rastgele birkaç örnekle birlikte gösterilir
+                    batch = [(processed, label)] + self._rng.sample(self._patterns, min(self.replay, len(self._patterns)))
+                    texts, labels = zip(*batch)
+                    self._working.partial_fit(self._vectorizer.transform(texts), labels)
+
+            if examples:
+                self.last_update_ms = (time.perf_counter() - start) * 1000 / len(examples)
+                self.updates += len(examples)
+                self._publish()
+
+            self.feedback.mark_learned([row['id'] for row in rows])
+            return len(examples)
+
+    def _run(self):
+        try:
+            self._load_or_bootstrap()
+        except ImportError as e:
+            print(f"⚠ Artımlı öğrenme kapalı: {e}")
+            self._running = False
+            return
+
+        while self._running:
+            try:
+                self.learn_pending()
+            except Exception as e:
+                print(f"❌ Artımlı öğrenme hatası: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def _load_or_bootstrap(self):
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.linear_model import SGDClassifier
+
+        self._vectorizer = HashingVectorizer(n_features=self.n_features, ngram_range=(1, 2),
+                                             alternate_sign=False, norm='l2')
+        self._patterns = [(self.classifier.preprocess_text(pattern), intent['tag'])
+                          for intent in self.classifier.intents for pattern in intent['patterns']]
+        classes = sorted({tag for _, tag in self._patterns})
+
+        try:
+            with open(self.model_file, 'rb') as f:
+                data = pickle.load(f)
+            if data['n_features'] == self.n_features and list(data['model'].classes_) == classes:
+                self._working = data['model']
+                self.updates = data['updates']
+                self.model = copy.deepcopy(self._working)
+                print(f"✓ Artımlı model yüklendi ({self.updates} düzeltme)")
+                return
+            print("⚠ Artımlı model güncel değil, yeniden kuruluyor")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠ Artımlı model yüklenemedi: {e}")
+
+        # Kalıplar ve daha önce etiketlenmiş tüm geri bildirimlerle sıfırdan kurulum
+        model = SGDClassifier(loss='log_loss', alpha=1e-4, random_state=42)
+        corrections = [(processed, label) for processed, label in self.feedback.all_labeled() if label in classes]
+        examples = self._patterns + corrections
+        for epoch in range(self.epochs):
+            self._rng.shuffle(examples)
+            texts, labels = zip(*examples)
+            model.partial_fit(self._vectorizer.transform(texts), labels, classes=classes)
+
+        self._working = model
+        self.updates = len(corrections)
+        self._publish()
+
+    def _publish(self):
+        snapshot = copy.deepcopy(self._working)
+        self.model = snapshot
+
+        try:
+            data = pickle.dumps({'model': snapshot, 'n_features': self.n_features, 'updates': self.updates})
+            with FileLock(self.model_file + ".lock"):
+                atomic_write_bytes(self.model_file, data)
+        except Exception as e:
+            print(f"❌ Artımlı model kaydetme hatası: {e}")
+
+
+def enable_online_learning(classifier, feedback_db="data/feedback.db", model_file="models/online_intent.pkl"):
+    """
+    Sınıflandırıcıya geri bildirim kuyruğunu ve artımlı öğreniciyi bağlar.
+
+    Returns:
+        OnlineLearner: Başlatılmış öğrenici
+    """
+    from modules.feedback import FeedbackQueue
+
+    classifier.feedback = FeedbackQueue(feedback_db)
+    classifier.learner = OnlineLearner(classifier, classifier.feedback, model_file=model_file)
+    classifier.learner.start()
+    return classifier.learner
@@ -0,0 +1,17 @@
+"""
+Komut eklentileri.
+
+Bu paketteki her modül CommandHandler açılışında otomatik yüklenir.
+Yeni bir intent eklemek için commands.json'a intent'i, buraya da
+@command ile işaretli bir fonksiyon içeren bir modül eklemek yeterlidir:
+
+    from modules.command_registry import command
+
+    @command('weather')
+    def handle_weather(handler, request):
+        return "..."
+
+Fonksiyon ilk argüman olarak CommandHandler'ı (scheduler erişimi için),
+ikinci olarak CommandRequest'i alır. Kullanıcının verisine request.store
+üzerinden erişilir; istek süresince açık tutulan kullanıcı shard'ıdır.
+"""
@@ -0,0 +1,18 @@
+import random
+
+from modules.command_registry import command
+
+
+JOKES = [
+    "Neden bilgisayarlar soğuk algınlığına yakalanmaz? Çünkü hep Windows açık tutarlar! 😄",
+    "İki yapay zeka karşılaşmış. Biri diğerine: 'Senin algoritmanda bir bug var.' Diğeri: 'Yok, o feature!' 🤖",
+    "Programcı kahveciye girmiş: 'Bir kahve, şekersiz.' Garson: 'Şekerimiz zaten bitti.' "
+    "Programcı: 'O zaman Boolean bir kahve ver!' ☕",
+    "Öğretmen sormuş: 'Ödevini neden yapmadın?' Öğrenci: 'Pomodoro molasındaydım, hâlâ bitmedi.' 📚",
+]
+
+
+@command('joke')
+def handle_joke(handler, request):
+    """Fıkra anlatır."""
+    return random.choice(JOKES)
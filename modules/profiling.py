@@ -0,0 +1,139 @@
+import cProfile
+import glob
+import io
+import os
+import pstats
+import sys
+from datetime import datetime
+
+
+class ProfileRun:
+    def __init__(self, profiler):
+        """
+        Profillenen tek bir pipeline çalıştırması.
+
+        intent sınıflandırmadan sonra bilindiği için blok içinde atanır:
+
+            with PROFILER.profile() as run:
+                result = assistant.process_text(text)
+                run.tag = result.intent
+        """
+        self._profiler = profiler
+        self._profile = cProfile.Profile()
+        self._active = False
+        self.tag = None
+        self.path = None
+
+    def __enter__(self):
+        try:
+            self._profile.enable()
+            self._active = True
+        except ValueError:
+            # Aynı anda başka bir oturum profilleniyor; bu çalıştırma atlanır
+            print("⚠ Profiler meşgul, bu çalıştırma profillenmedi")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._active:
+            self._profile.disable()
+            self.path = self._profiler._save(self._profile, self.tag)
+
+
+class _NullRun:
+    __slots__ = ()
+    path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+    def __setattr__(self, name, value):
+        # Kapalıyken run.tag = ... sessizce yok sayılır
+        pass
+
+
+_NULL_RUN = _NullRun()
+
+
+class Profiler:
+    def __init__(self, output_dir="profiles", enabled=False):
+        """
+        İsteğe bağlı, çalıştırma başına cProfile kaydı.
+
+        Kapalıyken profile() paylaşılan boş bir context manager döndürür;
+        hiçbir profiler kurulmaz. Açıkken her çalıştırma
+        <output_dir>/<zaman>_<intent>.pstats dosyasına yazılır.
+
+        Args:
+            output_dir: pstats dosyalarının klasörü
+            enabled: Tüm çalıştırmalar profillensin mi
+        """
+        self.output_dir = output_dir
+        self.enabled = enabled
+        self.last_path = None
+
+    def profile(self, enabled=None):
+        """
+        Bir pipeline çalıştırmasını profiller.
+
+        Args:
+            enabled: Bu çalıştırma için açık/kapalı (None = self.enabled)
+
+        Returns:
+            ProfileRun veya boş context manager
+        """
+        if not (self.enabled if enabled is None else enabled):
+            return _NULL_RUN
+        return ProfileRun(self)
+
+    def _save(self, profile, tag):
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        path = os.path.join(self.output_dir, f"{stamp}_{tag or 'unknown'}.pstats")
+        profile.dump_stats(path)
+        self.last_path = path
+        return path
+
+
+def summarize(path, limit=15, sort='cumulative'):
+    """
+    pstats dosyasındaki en pahalı fonksiyonları metin olarak özetler.
+
+    Args:
+        path: .pstats dosyası
+        limit: Gösterilecek fonksiyon sayısı
+        sort: Sıralama ölçütü ('cumulative', 'tottime', 'ncalls')
+
+    Returns:
+        str: pstats tablosu
+    """
+    output = io.StringIO()
+    stats = pstats.Stats(path, stream=output)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return output.getvalue()
+
+
+def latest_profile(output_dir="profiles"):
+    """Klasördeki en yeni pstats dosyası (yoksa None)."""
+    paths = sorted(glob.glob(os.path.join(output_dir, "*.pstats")))
+    return paths[-1] if paths else None
+
+
+# Uygulama genelinde paylaşılan profiler; ASSISTANT_PROFILE=1 ile her çalıştırma profillenir
+PROFILER = Profiler(
+    output_dir=os.environ.get("ASSISTANT_PROFILE_DIR", "profiles"),
+    enabled=os.environ.get("ASSISTANT_PROFILE", "0") == "1",
+)
+
+
+# Kullanım: python -m modules.profiling [dosya.pstats] [sıralama]
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else latest_profile(PROFILER.output_dir)
+    if not target:
+        print(f"❌ {PROFILER.output_dir} klasöründe profil bulunamadı")
+        sys.exit(1)
+
+    print(f"📄 {target}\n")
+    print(summarize(target, sort=sys.argv[2] if len(sys.argv) > 2 else 'cumulative'))
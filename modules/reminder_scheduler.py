@@ -0,0 +1,145 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import defaultdict, deque
+
+
+class ReminderScheduler:
+    def __init__(self, stores, max_recent=50):
+        """
+        Hatırlatıcıları zamanı geldiğinde tetikleyen arka plan servisi.
+
+        Bekleyen hatırlatıcılar due zamanına göre bir min-heap'te tutulur ve
+        tek bir thread en yakın hatırlatıcıya kadar uyur. Ekleme O(log n),
+        tetikleme O(log n) maliyetlidir. Tüm kullanıcıların hatırlatıcıları
+        aynı kuyruktadır; shard yalnızca tetikleme anında açılır.
+
+        Args:
+            stores: Kullanıcı shard'larını yöneten StorePool
+            max_recent: Kullanıcı başına arayüz için tutulacak son tetiklenen hatırlatıcı sayısı
+        """
+        self.stores = stores
+        self._heap = []
+        self._counter = itertools.count()  # Aynı due zamanında sıralama için
+        self._cond = threading.Condition()
+        self._listeners = []
+        self._fired = defaultdict(lambda: deque(maxlen=max_recent))  # user → deque
+        self._thread = None
+        self._running = False
+
+    def add_listener(self, callback):
+        """
+        Tetiklenen her hatırlatıcı için çağrılacak fonksiyon ekler.
+
+        Args:
+            callback: Hatırlatıcı sözlüğünü alan fonksiyon
+        """
+        self._listeners.append(callback)
+
+    def start(self):
+        """Bekleyen hatırlatıcıları yükler ve tetikleme thread'ini başlatır."""
+        if self._running:
+            return
+
+        pending = []
+        for user_id in self.stores.user_ids():
+            with self.stores.acquire(user_id) as store:
+                for reminder in store.list_reminders():
+                    reminder['user'] = user_id
+                    pending.append(reminder)
+
+        # Yalnızca yükleme için açılan shard'lar bellekte kalmasın
+        self.stores.evict_idle(force=True)
+
+        with self._cond:
+            self._heap = [(r['due'], next(self._counter), r) for r in pending]
+            heapq.heapify(self._heap)  # O(n)
+            self._running = True
+
+        self._thread = threading.Thread(target=self._run, name="reminder-scheduler", daemon=True)
+        self._thread.start()
+        print(f"✓ Hatırlatıcı zamanlayıcısı başladı ({len(pending)} bekleyen)")
+
+    def stop(self, timeout=None):
+        """Tetikleme thread'ini durdurur."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def schedule(self, reminder):
+        """
+        Yeni bir hatırlatıcıyı kuyruğa ekler.
+
+        Args:
+            reminder: NoteStore.add_reminder çıktısı (due alanı epoch saniye,
+                user alanı yoksa varsayılan kullanıcı)
+        """
+        with self._cond:
+            heapq.heappush(self._heap, (reminder['due'], next(self._counter), reminder))
+            # Yalnızca yeni en erken hatırlatıcı uyuyan thread'i ilgilendirir
+            if self._heap[0][2] is reminder:
+                self._cond.notify()
+
+    def pending_count(self):
+        """Kuyruktaki hatırlatıcı sayısı."""
+        with self._cond:
+            return len(self._heap)
+
+    def pop_fired(self, user_id=None):
+        """
+        Arayüzün henüz göstermediği tetiklenmiş hatırlatıcıları döndürür.
+
+        Args:
+            user_id: Kullanıcı kimliği (None = varsayılan kullanıcı)
+        """
+        with self._cond:
+            fired = self._fired.pop(self.stores.shard_key(user_id), None)
+        return list(fired) if fired else []
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+
+                delay = self._heap[0][0] - time.time()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+
+                # Aynı anda zamanı gelen tüm hatırlatıcıları topla
+                now = time.time()
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    due.append(heapq.heappop(self._heap)[2])
+
+            for reminder in due:
+                self._fire(reminder)
+
+    def _fire(self, reminder):
+        """Hatırlatıcıyı arşivler ve dinleyicilere iletir."""
+        user_id = self.stores.shard_key(reminder.get('user'))
+        try:
+            with self.stores.acquire(user_id) as store:
+                store.archive_reminder(reminder['id'])
+        except Exception as e:
+            print(f"⚠ Hatırlatıcı arşivlenemedi: {e}")
+
+        with self._cond:
+            self._fired[user_id].append(reminder)
+
+        print(f"🔔 Hatırlatma: {reminder['text']}")
+
+        for callback in self._listeners:
+            try:
+                callback(reminder)
+            except Exception as e:
+                print(f"❌ Hatırlatıcı bildirimi hatası: {e}")
@@ -0,0 +1,106 @@
+import re
+
+
+# Cümle ve yan cümle sınırları: noktalama veya bağlaçlar. Sayı içindeki
+# nokta/virgül ("14.30", "3,5") ve tek başına "sonra" ("30 dakika sonra
+# hatırlat") sınır sayılmaz.
+_BOUNDARY_RE = re.compile(
+    r'\s*(?:[;!?]|[,.](?!\d))+\s*(?:(?:ve|ayrıca|ardından|bir de)\s+)?'
+    r'|\s+(?:ve sonra|sonra da|ve|ayrıca|ardından|bir de)\s+',
+    re.IGNORECASE
+)
+
+
+class UtteranceSegmenter:
+    def __init__(self, classifier, min_confidence=0.6, max_segments=4):
+        """
+        Birleşik ifadeleri ("saat kaç ve yarın 9'da spora gitmeyi hatırlat")
+        bağımsız komutlara ayırır.
+
+        İfade noktalama ve bağlaçlardan bölünür, parçalar tek bir toplu
+        çağrıyla sınıflandırılır. Bölme yalnızca her parça güvenle ve
+        bilinen, birbirinden farklı intent'lere sınıflandırılırsa kabul
+        edilir; aksi halde ("süt ve ekmek al diye not al", "merhaba,
+        nasılsın") ifade tek komut olarak işlenir.
+        Sınır içermeyen ifadelerde maliyet tek bir regex aramasıdır.
+
+        Args:
+            classifier: IntentClassifier (predict_batch varsa kullanılır)
+            min_confidence: Her parça için gereken en düşük intent güveni
+            max_segments: Bundan fazla parçaya bölünen ifadeler bölünmez
+        """
+        self.classifier = classifier
+        self.min_confidence = min_confidence
+        self.max_segments = max_segments
+
+    def split(self, text):
+        """Metni sınırlardan böler (boş parçalar atılır)."""
+        return [part.strip() for part in _BOUNDARY_RE.split(text) if part and part.strip()]
+
+    def segment(self, text, user_id=None):
+        """
+        İfadeyi komutlara ayırır ve sınıflandırır.
+
+        Parçalar ve ifadenin tamamı birlikte sınıflandırılır; katman
+        sayaçlarına ve geri bildirim kuyruğuna yalnızca kullanılan sonuçlar
+        (kabul edilen parçalar veya ifadenin tamamı) yazılır.
+
+        Args:
+            text: Kullanıcı metni
+            user_id: İsteği yapan kullanıcı (geri bildirim kaydı için)
+
+        Returns:
+            list: [(parça metni, intent, güven), ...]; tek komutsa tek eleman
+        """
+        parts = self.split(text) if _BOUNDARY_RE.search(text) else []
+
+        if 2 <= len(parts) <= self.max_segments:
+            texts = parts + [text]
+            predictions = self._classify_batch(texts)
+            intents = [intent for intent, _, _ in predictions[:-1]]
+            # Aynı intent'e düşen parçalar aynı komutun parçasıdır (yanıt iki kez verilmesin)
+            if len(set(intents)) == len(intents) and all(
+                    intent != 'unknown' and confidence >= self.min_confidence
+                    for intent, confidence, _ in predictions[:-1]):
+                used = list(zip(parts, predictions[:-1]))
+            else:
+                used = [(text, predictions[-1])]
+            self._record(used, user_id)
+            return [(part, intent, confidence) for part, (intent, confidence, _) in used]
+
+        return [(text, *self._predict(text, user_id))]
+
+    def _classify_batch(self, texts):
+        classify_batch = getattr(self.classifier, 'classify_batch', None)
+        if classify_batch is not None:
+            return classify_batch(texts)
+        predict_batch = getattr(self.classifier, 'predict_batch', None)
+        if predict_batch is not None:
+            return [(*prediction, None) for prediction in predict_batch(texts)]
+        return [(*self.classifier.predict(text), None) for text in texts]
+
+    def _predict(self, text, user_id):
+        if hasattr(self.classifier, 'log_feedback'):
+            return self.classifier.predict(text, user_id=user_id)
+        return self.classifier.predict(text)
+
+    def _record(self, used, user_id):
+        """Kullanılan sonuçların katmanlarını sayar ve emin olunamayanları kaydeder."""
+        if not hasattr(self.classifier, 'classify_batch'):
+            return
+        self.classifier.count_tiers([tier for _, (_, _, tier) in used])
+        for part, (intent, confidence, tier) in used:
+            self.classifier.log_feedback(part, (intent, confidence), tier, user_id)
+
+
+def merge_responses(responses):
+    """Alt komut yanıtlarını tek bir seslendirilebilir metinde birleştirir."""
+    merged = []
+    for response in responses:
+        response = response.strip()
+        if not response:
+            continue
+        if response[-1] not in '.!?':
+            response += '.'
+        merged.append(response)
+    return ' '.join(merged)
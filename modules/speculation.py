@@ -0,0 +1,226 @@
+import threading
+import time
+
+from modules.metrics import METRICS
+
+
+# Yan etkisi olmayan intent'ler: yanıt önceden hesaplanıp atılabilir.
+# Not/hatırlatıcı/zamanlayıcı gibi veri değiştiren komutlar asla spekülatif çalışmaz.
+SAFE_INTENTS = frozenset({'time', 'date', 'study_advice', 'motivate'})
+
+
+class Speculation:
+    def __init__(self, text, intent, confidence):
+        """
+        Kısmi transkripsiyondan önceden hesaplanan yanıt.
+
+        Args:
+            text: Tahminin yapıldığı kısmi metin
+            intent: Tahmin edilen intent
+            confidence: Tahmin güveni
+        """
+        self.text = text
+        self.intent = intent
+        self.confidence = confidence
+        self.created = time.monotonic()
+        self.response = None
+        self.audio_path = None
+        self.error = None
+
+        # Handler ve seslendirme arka planda bitince kurulur
+        self.done = threading.Event()
+        self.future = None  # Spekülasyon havuzundaki hazırlık işi
+
+        # Boşa giden iş için harcanan süre (milisaniye)
+        self.cost_ms = 0.0
+
+    def age(self):
+        """Oluşturulduğundan beri geçen süre (saniye)."""
+        return time.monotonic() - self.created
+
+
+class SpeculationStats:
+    def __init__(self):
+        """Spekülasyon sayaçları (tüm oturumlar için ortak)."""
+        self._lock = threading.Lock()
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.wasted_ms = 0.0
+
+    def start(self):
+        with self._lock:
+            self.started += 1
+
+    def record(self, hit, cost_ms=0.0):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self.wasted_ms += cost_ms
+
+    def hit_rate(self):
+        """Sonuçlanan spekülasyonlardan kullanılanların oranı."""
+        decided = self.hits + self.misses
+        return self.hits / decided if decided else 0.0
+
+    def waste_rate(self):
+        """Sonuçlanan spekülasyonlardan atılanların oranı (boşa giden iş)."""
+        decided = self.hits + self.misses
+        return self.misses / decided if decided else 0.0
+
+    def to_dict(self):
+        return {
+            'started': self.started,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate(),
+            'waste_rate': self.waste_rate(),
+            'wasted_ms': self.wasted_ms,
+        }
+
+
+class SpeculativeSession:
+    def __init__(self, assistant, user_id, min_confidence=0.6, stable_count=2, max_age=3.0,
+                 safe_intents=SAFE_INTENTS, max_wait=0.5):
+        """
+        Tek bir ifadenin kısmi transkripsiyonları üzerinde spekülatif çalışma.
+
+        Akış kaynağı (ör. istemcideki artımlı tanıyıcı) her kısmi metni
+        partial() ile verir. Aynı intent art arda stable_count kez, yeterli
+        güvenle ve güvenli listeden tahmin edilirse komut yanıtı ve
+        seslendirmesi arka planda hazırlanır. Son metin geldiğinde
+        Assistant.process_text(..., speculation=session) bu işi ya kullanır
+        ya da atar.
+
+        Args:
+            assistant: Assistant (sınıflandırıcı, handler, tts ve executor için)
+            user_id: İsteği yapan kullanıcı
+            min_confidence: Spekülasyon için en düşük intent güveni
+            stable_count: Aynı intent'in art arda görülmesi gereken kısmi sayısı
+            max_age: Bundan eski yanıtlar kullanılmaz (saniye; 'time' bayatlamasın)
+            safe_intents: Spekülatif çalıştırılabilecek intent'ler
+            max_wait: take() içinde hazırlığın bitmesi için en fazla bekleme
+                (saniye); bitmezse komut çağıran thread'de çalıştırılır
+        """
+        self.assistant = assistant
+        self.user_id = user_id
+        self.min_confidence = min_confidence
+        self.stable_count = stable_count
+        self.max_age = max_age
+        self.safe_intents = safe_intents
+        self.max_wait = max_wait
+
+        self.current = None
+        self._last_intent = None
+        self._streak = 0
+        self._last_text = None
+
+    def partial(self, text):
+        """
+        Yeni kısmi transkripsiyonu işler.
+
+        Args:
+            text: Şimdiye kadar tanınan metin
+
+        Returns:
+            Speculation: Başlatılan veya süren spekülasyon (yoksa None)
+        """
+        text = text.strip()
+        if not text or text == self._last_text:
+            return self.current
+        self._last_text = text
+
+        # Kısmi metin: katman sayaçlarına ve geri bildirim kuyruğuna yazılmaz
+        with METRICS.timed('speculate'):
+            intent, confidence, _ = self.assistant.classifier.classify_batch([text])[0]
+
+        if intent == self._last_intent:
+            self._streak += 1
+        else:
+            self._last_intent, self._streak = intent, 1
+
+        if self.current is not None and self.current.intent == intent:
+            return self.current
+
+        if (self._streak >= self.stable_count and confidence >= self.min_confidence
+                and intent in self.safe_intents):
+            self._discard()
+            self.current = Speculation(text, intent, confidence)
+            self.assistant.speculation_stats.start()
+            self.current.future = self.assistant._speculation.submit(self._prepare, self.current)
+
+        return self.current
+
+    def take(self, intent):
+        """
+        Son metnin intent'i belliyken hazır spekülasyonu teslim alır.
+
+        Eşleşmeyen, bayatlamış veya hatalı spekülasyon atılır ve boşa
+        giden iş olarak sayılır.
+
+        Args:
+            intent: Son metin için tahmin edilen intent
+
+        Returns:
+            Speculation veya None (None ise komut normal yoldan işlenir)
+        """
+        speculation, self.current = self.current, None
+        if speculation is None:
+            return None
+
+        if speculation.intent != intent or speculation.age() > self.max_age:
+            self._record_waste(speculation)
+            return None
+
+        # Handler çoğunlukla çoktan bitmiştir; bitmemişse kısa süre beklenir,
+        # hâlâ sürüyorsa (ör. havuz dolu) komut senkron çalıştırılır
+        if not speculation.done.wait(self.max_wait):
+            self._record_waste(speculation)
+            return None
+        if speculation.error is not None or speculation.age() > self.max_age:
+            self._record_waste(speculation)
+            return None
+
+        self.assistant.speculation_stats.record(hit=True)
+        return speculation
+
+    def reset(self):
+        """İfade iptal edildi; hazırlanan iş atılır."""
+        self._discard()
+        self._last_intent, self._streak, self._last_text = None, 0, None
+
+    def _discard(self):
+        speculation, self.current = self.current, None
+        if speculation is not None:
+            self._record_waste(speculation)
+
+    def _record_waste(self, speculation):
+        def record():
+            self.assistant.speculation_stats.record(hit=False, cost_ms=speculation.cost_ms)
+            if speculation.audio_path:
+                self.assistant.tts.discard_file(speculation.audio_path)
+
+        # Arka plandaki iş sürüyorsa maliyeti bitince (havuz thread'inde) sayılır;
+        # iş bitmişse callback hemen çalışır
+        if speculation.future is None:
+            record()
+        else:
+            speculation.future.add_done_callback(lambda _: record())
+
+    def _prepare(self, speculation):
+        start = time.perf_counter()
+        try:
+            speculation.response = self.assistant.handler.handle_command(
+                speculation.intent, speculation.text, speculation.confidence, user_id=self.user_id)
+            tts = self.assistant.tts
+            if tts is not None:
+                # Motor gerçek bir yanıtı konuşuyorsa ön seslendirme atlanır;
+                # yanıt kullanılırsa normal yoldan seslendirilir
+                speculation.audio_path = tts.render(speculation.response, speculative=True)
+        except Exception as e:
+            speculation.error = e
+        finally:
+            speculation.cost_ms = (time.perf_counter() - start) * 1000
+            speculation.done.set()
@@ -1,17 +1,16 @@
-import whisper
-import json
-import queue
-from vosk import Model, KaldiRecognizer
-import sounddevice as sd
-import soundfile as sf
 import numpy as np
-from datetime import datetime
-import os
-import tempfile
+
+from modules.audio_input import InputSession
+
+# whisper (torch ile birlikte) ve sounddevice ağırdır; yalnızca model yüklenirken
+# ve kayıt yapılırken içe aktarılır, böylece arayüz modeller yüklenmeden açılır
+
+# Whisper'ın tek seferde işlediği pencere (saniye); daha uzun ses toplu çözülemez
+BATCH_WINDOW_SECONDS = 30
 
 
 class SpeechToText:
-    def __init__(self, model_size="base"):
+    def __init__(self, model_size="base", persistent_input=True, pre_roll=0.3):
         """
         Args:
             model_size: Whisper model boyutu
@@ -20,10 +19,17 @@ class SpeechToText:
                 - small: Orta hız, iyi doğruluk (~2GB RAM)
                 - medium: Yavaş, yüksek doğruluk (~5GB RAM)
                 - large: En yavaş, en yüksek doğruluk (~10GB RAM)
+            persistent_input: Mikrofon akışı ilk kayıtta açılıp açık tutulsun mu
+                (False = her kayıtta sd.rec)
+            pre_roll: Kayda eklenecek, tetikten önceki ses (saniye)
         """
+        import whisper
+
         print(f"Whisper{model_size} modeli yükleniyor...")
         self.model = whisper.load_model(model_size)
         self.sample_rate = 16000
+        self.input = InputSession(self.sample_rate, max_seconds=BATCH_WINDOW_SECONDS,
+                                  pre_roll=pre_roll) if persistent_input else None
         print("Ses tanıma modülü hazır!")
 
     def record_audio(self, duration=5, sample_rate=None):
@@ -37,11 +43,24 @@ class SpeechToText:
         Returns:
           numpy array: Ses verisi
         """
+        import sounddevice as sd
+
         if sample_rate is None:
             sample_rate = self.sample_rate
 
         print(f"🎤 Kayıt başlıyor... {duration} saniye konuşun!")
 
+        # Açık akıştan kayıt: cihaz açılış gecikmesi yok, ilk hece pre-roll'da
+        if self.input is not None and sample_rate == self.input.sample_rate and duration <= self.input.max_seconds:
+            try:
+                audio = self.input.record(duration)
+                print("✓ Kayıt tamamlandı!")
+                return audio
+            except Exception as e:
+                print(f"⚠ Sürekli mikrofon akışı kullanılamadı, tek seferlik kayda geçiliyor: {e}")
+                self.close()
+                self.input = None
+
         try:
             audio = sd.rec(
                 int(duration * sample_rate),
@@ -73,17 +92,16 @@ class SpeechToText:
 
         try:
             if audio_data is not None:
-                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-                    temp_path = temp_file.name
-                    sf.write(temp_path, audio_data, self.sample_rate)
-                    audio_data = temp_path
-
-            if audio_data is None:
+                # Whisper 16 kHz float32 diziyi doğrudan alır; geçici dosyaya gerek yok
+                source = np.asarray(audio_data, dtype=np.float32).flatten()
+            elif audio_file is not None:
+                source = audio_file
+            else:
                 return ""
             print("🔍 Ses analiz ediliyor...")
 
             result = self.model.transcribe(
-                audio_file,
+                source,
                 language=language,
                 fp16=False
             )
@@ -91,15 +109,55 @@ class SpeechToText:
             text = result["text"].strip()
             print(f"✓ Algılanan metin: '{text}'")
 
-            if audio_data is not None and os.path.exists(temp_path):
-                os.unlink(temp_path)
-
             return text
 
         except Exception as e:
             print(f"❌ Transkripsiyon hatası: {e}")
             return ""
 
+    def transcribe_batch(self, audios, language="tr"):
+        """
+        Birden fazla kısa sesi tek bir dolgulu (padded) batch olarak çözer.
+
+        Her ses 30 saniyelik pencereye doldurulur/kırpılır, log-mel
+        spektrogramları üst üste konup modelden birlikte geçirilir; CPU'da
+        matris çarpımları tek tek çağrılara göre çok daha verimli olur.
+
+        Args:
+            audios: 16 kHz mono float32 NumPy dizileri (her biri en fazla 30 sn)
+            language: Dil kodu
+
+        Returns:
+            list: Her ses için tanınan metin (aynı sırada)
+        """
+        import torch
+        import whisper
+
+        if not audios:
+            return []
+
+        mels = []
+        for audio in audios:
+            audio = whisper.pad_or_trim(np.asarray(audio, dtype=np.float32).flatten())
+            mels.append(whisper.log_mel_spectrogram(audio, n_mels=self.model.dims.n_mels))
+
+        mel = torch.stack(mels).to(self.model.device)
+        options = whisper.DecodingOptions(language=language, fp16=False, without_timestamps=True)
+
+        with torch.no_grad():
+            results = whisper.decode(self.model, mel, options)
+
+        return [result.text.strip() for result in results]
+
+    def close(self):
+        """Açık mikrofon akışını kapatır."""
+        if self.input is not None:
+            self.input.stop()
+
+    def warmup(self):
+        """Kısa bir sessizliği çözerek ilk gerçek isteğin ek yükünü (bellek ayırma vb.) önceden öder."""
+        self.model.transcribe(np.zeros(self.sample_rate, dtype=np.float32), language="tr", fp16=False)
+
     def listen_and_transcribe(self, duration=5):
 
         audio = self.record_audio(duration)
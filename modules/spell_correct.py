@@ -0,0 +1,181 @@
+from modules.turkish_text import fold_ascii, stem_word
+
+
+def edit_distance(a, b, limit):
+    """
+    Sınırlı Damerau-Levenshtein (bitişik harf yer değiştirmesi dahil) uzaklığı.
+
+    Args:
+        a, b: Karşılaştırılacak kelimeler
+        limit: Bu değeri aşan uzaklıklar için erken çıkılır
+
+    Returns:
+        int: Uzaklık (limit aşıldıysa limit + 1)
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def _deletes(word, distance):
+    """Kelimeden en fazla distance harf silinerek elde edilen tüm biçimler."""
+    result = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier if len(w) > 1 for i in range(len(w))}
+        result |= frontier
+    return result
+
+
+def _inflection_of(token, candidate, min_stem):
+    """
+    Aday, token'ın yazım hatası değil de aynı kelimenin başka bir çekimi mi?
+
+    Sözlükte olmayan doğru bir kelimeye ek eklemek ("market" → "marketle")
+    veya ekini değiştirmek ("marketten" → "marketle") anlamı değiştirir.
+    Kök min_stem'den kısaysa ("not") ek hatası yazım hatasından ayırt
+    edilemediği için yalnızca ilk durum sayılır.
+    """
+    if candidate.startswith(token):
+        return True
+    stem = stem_word(candidate)
+    return len(stem) >= min_stem and stem != candidate and token.startswith(stem)
+
+
+class SymSpellIndex:
+    def __init__(self, words=(), max_distance=2, min_length=4, cache_size=4096):
+        """
+        Simetrik silme (SymSpell) sözlüğü ile yazım hatası düzeltme.
+
+        Sözlükteki her kelimenin ASCII'ye katlanmış biçiminden en fazla
+        max_distance harf silinmiş varyantları önceden indekslenir. Sorgu
+        anında yalnızca sorgunun silme varyantlarına bakılır; böylece
+        düzeltme sözlük boyutundan bağımsız, mikro saniyeler sürer.
+        "notlarimi" gibi Türkçe karakteri düşmüş ASR çıktısı katlanmış
+        biçim üzerinden doğrudan eşleşir.
+
+        Args:
+            words: Başlangıç kelimeleri (tekrarlar sıklık olarak sayılır)
+            max_distance: Kabul edilen en büyük düzeltme uzaklığı
+            min_length: Bundan kısa kelimeler yalnızca katlanmış eşleşmeyle
+                düzeltilir ("ve" → "ne" gibi yanlış düzeltmeleri önler)
+            cache_size: Bellekte tutulacak sorgu sonucu sayısı
+        """
+        self.max_distance = max_distance
+        self.min_length = min_length
+        self.cache_size = cache_size
+
+        self.counts = {}
+        self._canonical = {}  # katlanmış biçim → en sık kanonik kelime
+        self._index = {}      # silme varyantı → katlanmış kelimeler
+        self._cache = {}
+
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __contains__(self, word):
+        return word in self.counts
+
+    def add(self, word, count=1):
+        """Kelimeyi sözlüğe ekler (sıklığını artırır)."""
+        if not word or word.isdigit():
+            return
+
+        self.counts[word] = self.counts.get(word, 0) + count
+        folded = fold_ascii(word)
+        best = self._canonical.get(folded)
+        if best is None or self.counts[word] > self.counts[best]:
+            self._canonical[folded] = word
+
+        if best is None:
+            for variant in _deletes(folded, self.max_distance):
+                self._index.setdefault(variant, set()).add(folded)
+        self._cache.clear()
+
+    def lookup(self, token):
+        """
+        Token için sözlükteki en yakın kelimeyi bulur.
+
+        Args:
+            token: preprocess_text çıktısındaki kelime
+
+        Returns:
+            tuple: (kelime, uzaklık) veya eşleşme yoksa None
+        """
+        if token in self.counts:
+            return token, 0
+
+        cached = self._cache.get(token, False)
+        if cached is not False:
+            return cached
+
+        result = self._lookup(token)
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[token] = result
+        return result
+
+    def _lookup(self, token):
+        folded = fold_ascii(token)
+        if folded in self._canonical:
+            return self._canonical[folded], 0
+        if len(folded) < self.min_length or token.isdigit():
+            return None
+
+        # Kısa kelimelerde tek hata bile anlamı değiştirebilir
+        limit = 1 if len(folded) <= 6 else self.max_distance
+
+        best = None
+        seen = set()
+        for variant in _deletes(folded, limit):
+            for candidate in self._index.get(variant, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                if _inflection_of(folded, candidate, self.min_length):
+                    continue
+                distance = edit_distance(folded, candidate, limit)
+                if distance > limit:
+                    continue
+                word = self._canonical[candidate]
+                key = (distance, -self.counts[word], word)
+                if best is None or key < best[0]:
+                    best = (key, word, distance)
+
+        return (best[1], best[2]) if best else None
+
+    def correct(self, text):
+        """
+        Boşlukla ayrılmış metindeki bilinmeyen kelimeleri düzeltir.
+
+        Args:
+            text: preprocess_text çıktısı
+
+        Returns:
+            str: Düzeltilmiş metin (eşleşmeyen kelimeler olduğu gibi kalır)
+        """
+        words = []
+        for token in text.split():
+            match = self.lookup(token)
+            words.append(match[0] if match else token)
+        return ' '.join(words)
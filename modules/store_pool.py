@@ -0,0 +1,203 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from modules.note_store import NoteStore
+
+
+DEFAULT_USER = "default"
+
+_UNSAFE_CHARS_RE = re.compile(r'[^A-Za-z0-9_-]')
+
+
+class _Shard:
+    def __init__(self, store=None):
+        self.store = store
+        self.refs = 0
+        self.last_used = time.monotonic()
+
+        # Shard havuz kilidi dışında açılır; aynı anda gelenler açılışı bekler
+        self.ready = threading.Event()
+        self.error = None
+        if store is not None:
+            self.ready.set()
+
+
+class StorePool:
+    def __init__(self, default_db="data/assistant.db", users_dir="data/users", idle_timeout=600.0,
+                 max_open=64, notes_file="data/notes.json", reminders_file="data/reminders.json",
+                 **store_kwargs):
+        """
+        Kullanıcı başına ayrı NoteStore (shard) yöneten havuz.
+
+        Her kullanıcının notları ve hatırlatıcıları kendi SQLite dosyasındadır.
+        Shard'lar ilk erişimde açılır, boşta kalınca veya açık shard sayısı
+        max_open'ı aşınca kapatılır; bellek toplam değil aktif kullanıcı
+        sayısıyla büyür ve bir kullanıcının yazması diğerininkine dokunmaz.
+
+        Args:
+            default_db: Varsayılan kullanıcının veritabanı (eski tek kullanıcılı dosya)
+            users_dir: Diğer kullanıcıların shard klasörü
+            idle_timeout: Bu kadar saniye kullanılmayan shard kapatılır
+            max_open: Aynı anda açık tutulacak en fazla shard
+            notes_file: Varsayılan kullanıcıya taşınacak eski not JSON dosyası
+            reminders_file: Varsayılan kullanıcıya taşınacak eski hatırlatıcı JSON dosyası
+            **store_kwargs: NoteStore'a iletilecek ek ayarlar (flush_interval vb.)
+        """
+        self.default_db = default_db
+        self.users_dir = users_dir
+        self.idle_timeout = idle_timeout
+        self.max_open = max_open
+        self.notes_file = notes_file
+        self.reminders_file = reminders_file
+        self.store_kwargs = store_kwargs
+
+        self._shards = OrderedDict()  # shard anahtarı → _Shard (LRU sırası)
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    @staticmethod
+    def shard_key(user_id):
+        """
+        Kullanıcı kimliğinin dosya adına güvenli karşılığı.
+
+        Güvenli kimlikler olduğu gibi kalır; diğerlerinde geçersiz karakterler
+        '_' olur ve çakışmasın diye ("ali.veli" / "ali_veli") kısa bir özet eklenir.
+        """
+        user_id = user_id or DEFAULT_USER
+        safe = _UNSAFE_CHARS_RE.sub('_', user_id)
+        if safe != user_id:
+            safe += '-' + hashlib.sha1(user_id.encode('utf-8')).hexdigest()[:8]
+        return safe
+
+    def db_path(self, user_id):
+        """Kullanıcının shard dosya yolu."""
+        key = self.shard_key(user_id)
+        if key == DEFAULT_USER:
+            return self.default_db
+        return os.path.join(self.users_dir, f"{key}.db")
+
+    def user_ids(self):
+        """Diskte shard'ı bulunan tüm kullanıcıların shard anahtarları."""
+        users = [DEFAULT_USER] if os.path.exists(self.default_db) else []
+        if os.path.isdir(self.users_dir):
+            for name in sorted(os.listdir(self.users_dir)):
+                if name.endswith('.db'):
+                    users.append(name[:-3])
+        return users
+
+    @contextmanager
+    def acquire(self, user_id=None):
+        """
+        Kullanıcının NoteStore'unu kullanım süresince açık tutar.
+
+            with pool.acquire("ayse") as store:
+                store.add_note("...")
+
+        Args:
+            user_id: Kullanıcı kimliği (None = varsayılan kullanıcı)
+        """
+        shard = self._checkout(self.shard_key(user_id))
+        try:
+            yield shard.store
+        finally:
+            with self._lock:
+                shard.refs -= 1
+                shard.last_used = time.monotonic()
+
+    def _checkout(self, key):
+        with self._lock:
+            shard = self._shards.get(key)
+            opener = shard is None
+            if opener:
+                # Yer tutucu: açılış (şema, JSON taşıma, WAL) diğer kullanıcıları bekletmesin
+                shard = _Shard()
+                self._shards[key] = shard
+            self._shards.move_to_end(key)
+            shard.refs += 1
+            shard.last_used = time.monotonic()
+
+            evicted = self._collect_evictable(time.monotonic())
+
+        for store in evicted:
+            store.close()
+
+        if opener:
+            try:
+                shard.store = self._open(key)
+            except Exception as e:
+                shard.error = e
+                with self._lock:
+                    if self._shards.get(key) is shard:
+                        del self._shards[key]
+            finally:
+                shard.ready.set()
+        else:
+            shard.ready.wait()
+
+        if shard.error is not None:
+            with self._lock:
+                shard.refs -= 1
+            raise shard.error
+        return shard
+
+    def _open(self, key):
+        if key == DEFAULT_USER:
+            return NoteStore(self.default_db, notes_file=self.notes_file,
+                             reminders_file=self.reminders_file, **self.store_kwargs)
+        return NoteStore(self.db_path(key), notes_file=None, reminders_file=None, **self.store_kwargs)
+
+    def _collect_evictable(self, now, force_idle=False):
+        """Kapatılacak shard'ları havuzdan çıkarır (kilit altında çağrılır)."""
+        sweep = force_idle or now - self._last_sweep >= min(self.idle_timeout, 30.0)
+        if not sweep and len(self._shards) <= self.max_open:
+            return []
+
+        evicted = []
+        for key in list(self._shards):
+            shard = self._shards[key]
+            if shard.refs:
+                continue
+            idle = force_idle or now - shard.last_used >= self.idle_timeout
+            over_limit = len(self._shards) > self.max_open
+            if idle or over_limit:
+                del self._shards[key]
+                evicted.append(shard.store)
+
+        if sweep:
+            self._last_sweep = now
+        return evicted
+
+    def evict_idle(self, force=False):
+        """
+        Boşta kalan shard'ları kapatır.
+
+        Args:
+            force: True ise süreye bakmadan kullanılmayan tüm shard'ları kapatır
+
+        Returns:
+            int: Kapatılan shard sayısı
+        """
+        with self._lock:
+            evicted = self._collect_evictable(time.monotonic(), force_idle=force)
+        for store in evicted:
+            store.close()
+        return len(evicted)
+
+    def open_count(self):
+        """Bellekte açık shard sayısı."""
+        with self._lock:
+            return len(self._shards)
+
+    def close(self):
+        """Tüm shard'ları diske yazıp kapatır."""
+        with self._lock:
+            shards = list(self._shards.values())
+            self._shards.clear()
+        for shard in shards:
+            if shard.store is not None:
+                shard.store.close()
@@ -1,23 +1,114 @@
 import pyttsx3
+import os
 import platform
+import queue
+import tempfile
+import threading
+from concurrent.futures import Future
+from itertools import count
+
+# Kuyruk öncelikleri: gerçek konuşma her zaman önce, spekülatif ön seslendirme
+# sonra; durdurma işareti sıradaki her şeyden sonra işlenir
+_SPEECH, _SPECULATIVE, _STOP = 0, 1, 2
+
+
+def _init_com():
+    """Windows'ta çağıran thread için COM'u başlatır (sapi5 sürücüsü COM kullanır)."""
+    if platform.system() != "Windows":
+        return None
+    try:
+        import pythoncom
+    except ImportError:
+        return None
+    pythoncom.CoInitialize()
+    return pythoncom
 
 
 class TextToSpeech:
     def __init__(self):
-        """TTS motorunu başlatır ve Türkçe için optimize eder."""
+        """
+        TTS motorunu başlatır ve Türkçe için optimize eder.
+
+        pyttsx3 motoru oluşturulduğu thread'e bağlıdır: Windows'taki sapi5
+        sürücüsü bir COM nesnesidir ve başka thread'den kullanılınca hata
+        verir. Motor bu yüzden ayrı bir "tts" thread'inde oluşturulur ve
+        yalnızca orada kullanılır; metotlar işi bu thread'in kuyruğuna
+        bırakır. Tek kuyruk, hatırlatıcı ile arayüzün aynı anda konuşmasını
+        da önler. Spekülatif ön seslendirme kuyrukta gerçek konuşmanın
+        önüne geçmez.
+        """
         print("TTS motoru başlatılıyor...")
 
+        self.engine = None
+        self._closed = False
+        self._queue = queue.PriorityQueue()
+        self._order = count()  # Aynı öncelikte geliş sırası
+        self._running = False
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="tts", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def _run(self, ready):
+        com = _init_com()
         try:
-            self.engine = pyttsx3.init()
-
-            # Ses ayarlarını yapılandır
-            self._configure_voice()
-
-            print("✓ TTS motoru hazır!")
+            try:
+                self.engine = pyttsx3.init()
+
+                # Ses ayarlarını yapılandır
+                self._configure_voice()
+
+                print("✓ TTS motoru hazır!")
+
+            except Exception as e:
+                print(f"❌ TTS başlatma hatası: {e}")
+                self.engine = None
+            finally:
+                ready.set()
+
+            while True:
+                _, _, work, future = self._queue.get()
+                if work is None:
+                    return
+                if not future.set_running_or_notify_cancel():
+                    continue
+                self._running = True
+                try:
+                    future.set_result(work())
+                except Exception as e:
+                    future.set_exception(e)
+                finally:
+                    self._running = False
+        finally:
+            if com is not None:
+                com.CoUninitialize()
+
+    def _submit(self, work, priority=_SPEECH):
+        """
+        İşi motor thread'inde çalıştırılmak üzere kuyruğa ekler.
 
-        except Exception as e:
-            print(f"❌ TTS başlatma hatası: {e}")
-            self.engine = None
+        Returns:
+            Future: İşin sonucu (TTS kapatıldıysa None)
+        """
+        future = Future()
+        if self._closed:
+            future.set_result(None)
+            return future
+        self._queue.put((priority, next(self._order), work, future))
+        return future
+
+    @property
+    def busy(self):
+        """Motor konuşuyor veya sırada iş var mı."""
+        return self._running or not self._queue.empty()
+
+    def close(self):
+        """Kuyruktaki konuşmaları bitirir ve TTS thread'ini durdurur."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put((_STOP, next(self._order), None, None))
+        self._thread.join()
 
     def _configure_voice(self):
         """Ses parametrelerini ayarlar."""
@@ -60,20 +151,17 @@ class TextToSpeech:
         if self.engine is None or not text:
             return
 
-        try:
-            print(f"🔊 Konuşuluyor: '{text}'")
-
-            # Metni seslendir
-            self.engine.say(text)
+        print(f"🔊 Konuşuluyor: '{text}'")
 
-            if wait:
-                self.engine.runAndWait()
-            else:
-                # Asenkron çalış (arka planda)
-                self.engine.startLoop(False)
-                self.engine.iterate()
-                self.engine.endLoop()
+        # wait=False: motor thread'i sıradaki iş olarak konuşur, çağıran beklemez
+        future = self._submit(lambda: self._say(text))
+        if wait:
+            future.result()
 
+    def _say(self, text):
+        try:
+            self.engine.say(text)
+            self.engine.runAndWait()
         except Exception as e:
             print(f"❌ TTS hatası: {e}")
 
@@ -86,7 +174,7 @@ class TextToSpeech:
         """
         if self.engine:
             rate = max(50, min(300, rate))  # 50-300 arasında sınırla
-            self.engine.setProperty('rate', rate)
+            self._submit(lambda: self.engine.setProperty('rate', rate))
             print(f"Konuşma hızı: {rate}")
 
     def set_volume(self, volume):
@@ -98,7 +186,7 @@ class TextToSpeech:
         """
         if self.engine:
             volume = max(0.0, min(1.0, volume))  # 0-1 arasında sınırla
-            self.engine.setProperty('volume', volume)
+            self._submit(lambda: self.engine.setProperty('volume', volume))
             print(f"Ses seviyesi: {volume}")
 
     def list_voices(self):
@@ -106,7 +194,7 @@ class TextToSpeech:
         if self.engine is None:
             return []
 
-        voices = self.engine.getProperty('voices')
+        voices = self._submit(lambda: self.engine.getProperty('voices')).result() or []
         voice_list = []
 
         print("\n=== Mevcut Sesler ===")
@@ -128,6 +216,9 @@ class TextToSpeech:
         if self.engine is None:
             return
 
+        self._submit(lambda: self._save(text, filename)).result()
+
+    def _save(self, text, filename):
         try:
             self.engine.save_to_file(text, filename)
             self.engine.runAndWait()
@@ -136,6 +227,74 @@ class TextToSpeech:
             print(f"❌ Dosya kaydetme hatası: {e}")
 
 
+    def render(self, text, speculative=False):
+        """
+        Metni geçici bir WAV dosyasına seslendirir (çalmadan).
+
+        Spekülatif yanıtlar önceden hazırlanırken kullanılır; dosya
+        play_file ile çalınır, kullanılmazsa discard_file ile silinir.
+
+        Args:
+            text: Seslendirilecek metin
+            speculative: True ise motor meşgulken hiç denenmez (sıra beklemek
+                spekülasyonu zaten geciktirir) ve kuyrukta gerçek konuşmanın
+                arkasında kalır
+
+        Returns:
+            str: WAV dosya yolu (motor yoksa, meşgulse veya hata olursa None)
+        """
+        if self.engine is None or not text:
+            return None
+        if speculative and self.busy:
+            return None
+
+        priority = _SPECULATIVE if speculative else _SPEECH
+        return self._submit(lambda: self._render(text), priority).result()
+
+    def _render(self, text):
+        fd, path = tempfile.mkstemp(prefix="tts-", suffix=".wav")
+        os.close(fd)
+        try:
+            self.engine.save_to_file(text, path)
+            self.engine.runAndWait()
+            return path
+        except Exception as e:
+            print(f"❌ Önceden seslendirme hatası: {e}")
+            self.discard_file(path)
+            return None
+
+    def play_file(self, path, wait=True):
+        """
+        render ile hazırlanan WAV dosyasını çalar ve siler.
+
+        Çalma da TTS thread'inde sıraya girer; böylece speak ile üst üste binmez.
+        """
+        future = self._submit(lambda: self._play(path))
+        if wait:
+            future.result()
+
+    def _play(self, path):
+        try:
+            import sounddevice as sd
+            import soundfile as sf
+
+            audio, sample_rate = sf.read(path, dtype='float32')
+            sd.play(audio, sample_rate)
+            sd.wait()
+        except Exception as e:
+            print(f"❌ Ses dosyası çalma hatası: {e}")
+        finally:
+            self.discard_file(path)
+
+    @staticmethod
+    def discard_file(path):
+        """Kullanılmayan önceden seslendirilmiş dosyayı siler."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
 # Test fonksiyonu
 if __name__ == "__main__":
     print("=== METIN-SES DÖNÜŞTÜRME TESTİ ===\n")
@@ -0,0 +1,275 @@
+import re
+from functools import lru_cache
+
+
+# "İ".lower() Python'da "i̇" (noktalı i + birleşik nokta) üretir, "I" ise "i" olur.
+# Türkçede doğru karşılıkları önce elle çeviriyoruz.
+_TURKISH_LOWER_MAP = str.maketrans("İI", "iı")
+
+# ASR çıktısı ve klavye girişi çoğu zaman Türkçe karakter içermez
+# ("notlarimi", "hatirlat"), bu yüzden arama için ASCII'ye katlıyoruz.
+_ASCII_FOLD_MAP = str.maketrans("ığüşöçâîû", "igusocaiu")
+
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_SPACES_RE = re.compile(r'\s+')
+
+# Arama sorgusunda kök bulmak için atılan hal ekleri (katlanmış biçimde).
+# Uzundan kısaya sıralı; ilk eşleşen atılır.
+_CASE_SUFFIXES = sorted([
+    'ler', 'lar', 'le', 'la', 'yle', 'yla',
+    'de', 'da', 'te', 'ta', 'deki', 'daki', 'teki', 'taki',
+    'den', 'dan', 'ten', 'tan', 'nden', 'ndan',
+    'nin', 'nun', 'in', 'un', 'yi', 'yu', 'ye', 'ya',
+    'e', 'a', 'i', 'u',
+], key=len, reverse=True)
+
+
+def turkish_lower(text):
+    """
+    Türkçe kurallarına uygun küçük harfe çevirir.
+
+    Args:
+        text: Ham metin
+
+    Returns:
+        str: Küçük harfli metin
+    """
+    return text.translate(_TURKISH_LOWER_MAP).lower()
+
+
+def fold_ascii(text):
+    """Türkçe karakterleri ASCII karşılıklarına katlar (ı→i, ş→s, ...)."""
+    return text.translate(_ASCII_FOLD_MAP)
+
+
+def normalize_for_search(text):
+    """
+    Metni arama indeksi için normalize eder.
+
+    Küçük harf, ASCII katlama, noktalama temizliği ve boşluk sadeleştirme yapar.
+
+    Args:
+        text: Ham metin
+
+    Returns:
+        str: Normalize edilmiş metin
+    """
+    text = fold_ascii(turkish_lower(text))
+    text = _NON_WORD_RE.sub(' ', text)
+    return _SPACES_RE.sub(' ', text).strip()
+
+
+def strip_case_suffix(word, min_stem=3):
+    """
+    Katlanmış bir kelimeden tek bir hal ekini atar ("marketle" → "market").
+
+    Args:
+        word: normalize_for_search çıktısındaki kelime
+        min_stem: Geriye kalması gereken en kısa kök uzunluğu
+
+    Returns:
+        str: Kök (ek bulunamazsa kelimenin kendisi)
+    """
+    for suffix in _CASE_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= min_stem:
+            return word[:-len(suffix)]
+    return word
+
+
+# Sınıflandırıcı için atılan çekim ekleri (katlanmış biçimde): çoğul,
+# iyelik ve hal ekleri. Ünlü uyumu katlamada birleştiği için (ı/i, ü/u)
+# her ekin en fazla iki biçimi vardır.
+_INFLECTION_SUFFIXES = sorted({
+    'ler', 'lar',
+    'im', 'um', 'imiz', 'umuz', 'iniz', 'unuz', 'si', 'su', 'leri', 'lari',
+    'i', 'u', 'yi', 'yu', 'ni', 'nu',
+    'e', 'a', 'ye', 'ya', 'ne', 'na',
+    'de', 'da', 'te', 'ta', 'nde', 'nda',
+    'den', 'dan', 'ten', 'tan', 'nden', 'ndan',
+    'in', 'un', 'nin', 'nun',
+    'le', 'la', 'yle', 'yla',
+}, key=len, reverse=True)
+
+
+@lru_cache(maxsize=8192)
+def stem_word(word, min_stem=3, max_suffixes=3):
+    """
+    Kelimeden çekim eklerini atarak katlanmış kökünü bulur
+    ("notlarımı" → "not", "notlarımızı" → "not").
+
+    Sözlük küçük ve tekrarlı olduğu için sonuçlar sınırlı bir önbellekte
+    tutulur. Kök bulma kurallıdır, sözlük kullanmaz; amaç doğru kök değil,
+    aynı kelimenin çekimlerini tek özelliğe indirmektir.
+
+    Args:
+        word: Küçük harfli kelime
+        min_stem: Geriye kalması gereken en kısa kök uzunluğu
+        max_suffixes: Atılacak en fazla ek sayısı
+
+    Returns:
+        str: Katlanmış kök
+    """
+    word = fold_ascii(word)
+    if word.isdigit():
+        return word
+
+    for _ in range(max_suffixes):
+        for suffix in _INFLECTION_SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= min_stem:
+                word = word[:-len(suffix)]
+                break
+        else:
+            break
+    return word
+
+
+# ============= DOLGU KELİMELERİ =============
+# Tek başına bir komutu belirlemeyen sık kelimeler (zamirler, bağlaçlar, soru
+# ekleri, genel fiiller). Türkçe karakterli küçük harf biçimindedir;
+# IntentClassifier bunları anahtar kelime saymaz.
+
+STOPWORDS = frozenset({
+    'bir', 'bu', 'şu', 'o', 'bunu', 'şunu', 'onu', 'bunlar', 'şey', 'şeyi',
+    'ben', 'beni', 'bana', 'benim', 'sen', 'seni', 'sana', 'senin', 'biz', 'siz',
+    've', 'veya', 'ile', 'ya', 'de', 'da', 'ki', 'ama', 'fakat', 'çünkü', 'gibi', 'için',
+    'mi', 'mı', 'mu', 'mü', 'ne', 'neden', 'niye', 'nasıl', 'hangi', 'kaç', 'kim', 'nerede',
+    'çok', 'az', 'daha', 'en', 'her', 'hep', 'hiç', 'biraz', 'iyi', 'kötü', 'tüm', 'bütün',
+    'var', 'yok', 'evet', 'hayır', 'lütfen', 'şimdi', 'artık',
+    'ver', 'al', 'et', 'yap', 'ol', 'eder', 'olur', 'oldu', 'ettim', 'yaptım', 'olsun',
+})
+
+
+# ============= SAYI KELİMELERİ =============
+# Anahtarlar katlanmış biçimde (fold_ascii) tutulur; "üç" ve "uc" aynı kelimedir.
+
+UNIT_WORDS = {
+    'sifir': 0, 'bir': 1, 'iki': 2, 'uc': 3, 'dort': 4,
+    'bes': 5, 'alti': 6, 'yedi': 7, 'sekiz': 8, 'dokuz': 9,
+}
+
+TENS_WORDS = {
+    'on': 10, 'yirmi': 20, 'otuz': 30, 'kirk': 40, 'elli': 50,
+    'altmis': 60, 'yetmis': 70, 'seksen': 80, 'doksan': 90,
+}
+
+SCALE_WORDS = {
+    'bin': 1000, 'milyon': 10 ** 6, 'milyar': 10 ** 9,
+}
+
+NUMBER_WORDS = set(UNIT_WORDS) | set(TENS_WORDS) | set(SCALE_WORDS) | {'yuz'}
+
+
+def parse_number_words(words, start=0):
+    """
+    Katlanmış kelime listesinden bir Türkçe sayı okur ("iki bin üç yüz" → 2300).
+
+    Okuma, sayının dilbilgisine uymayan ilk kelimede durur; böylece
+    "beş beş" iki ayrı sayı olarak okunur.
+
+    Args:
+        words: fold_ascii uygulanmış kelimeler
+        start: Okumaya başlanacak indeks
+
+    Returns:
+        tuple: (sayı veya None, okunan son kelimeden sonraki indeks)
+    """
+    total = 0
+    current = 0
+    seen = False
+    i = start
+
+    while i < len(words):
+        word = words[i]
+
+        if word in UNIT_WORDS:
+            # "sıfır" tek başına bir sayıdır; birler basamağı doluysa yeni sayı başlar
+            if (word == 'sifir' and seen) or current % 10:
+                break
+            current += UNIT_WORDS[word]
+            seen = True
+            if word == 'sifir':
+                i += 1
+                break
+        elif word in TENS_WORDS:
+            if current % 100:
+                break
+            current += TENS_WORDS[word]
+        elif word == 'yuz':
+            if current >= 100:
+                break
+            current = (current or 1) * 100
+        elif word in SCALE_WORDS:
+            scale = SCALE_WORDS[word]
+            # Ölçekler büyükten küçüğe gelir ("bir milyon iki bin"); "bin bin" iki sayıdır
+            if total and total % (scale * 1000) and not current:
+                break
+            total += (current or 1) * scale
+            current = 0
+        else:
+            break
+
+        seen = True
+        i += 1
+
+    if not seen:
+        return None, start
+
+    return total + current, i
+
+
+# Sayılara gelen hal ekleri: "beşin", "ikiye", "dörtte", "ona", "bine"
+_NUMBER_SUFFIXES = sorted([
+    'in', 'un', 'nin', 'nun', 'i', 'u', 'yi', 'yu', 'e', 'a', 'ye', 'ya', 'na', 'ne',
+    'de', 'da', 'te', 'ta', 'den', 'dan', 'ten', 'tan', 'le', 'la', 'yle', 'yla',
+], key=len, reverse=True)
+
+
+def number_word_stem(word):
+    """
+    Ek almış bir sayı kelimesinin kökünü bulur ("beşin" → "bes", "dörde" → "dort").
+
+    Args:
+        word: Katlanmış kelime
+
+    Returns:
+        str veya None: Sayı kelimesi kökü, kelime sayı değilse None
+    """
+    if word in NUMBER_WORDS:
+        return word
+
+    for suffix in _NUMBER_SUFFIXES:
+        if not word.endswith(suffix):
+            continue
+        stem = word[:-len(suffix)]
+        if stem in NUMBER_WORDS:
+            return stem
+        # Ünsüz yumuşaması: dört → dördü
+        if stem.endswith('d') and stem[:-1] + 't' in NUMBER_WORDS:
+            return stem[:-1] + 't'
+
+    return None
+
+
+# Sıra sayı ekleri (katlanmış): birinci, ikinci, üçüncü, dördüncü, altıncı
+_ORDINAL_SUFFIXES = ('inci', 'uncu', 'nci', 'ncu')
+
+
+def ordinal_word_stem(word):
+    """
+    Sıra sayı kelimesinin sayı kökünü bulur ("üçüncü" → "uc", "dördüncü" → "dort").
+
+    Args:
+        word: Katlanmış kelime
+
+    Returns:
+        str veya None: Sayı kelimesi kökü, kelime sıra sayı değilse None
+    """
+    for suffix in _ORDINAL_SUFFIXES:
+        if not word.endswith(suffix):
+            continue
+        stem = word[:-len(suffix)]
+        if stem in NUMBER_WORDS:
+            return stem
+        if stem.endswith('d') and stem[:-1] + 't' in NUMBER_WORDS:
+            return stem[:-1] + 't'
+    return None
@@ -0,0 +1,530 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+import numpy as np
+from aiohttp import WSMsgType, web
+
+# Modül yolunu ekle
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from modules.assistant import Assistant
+from modules.command_handler import CommandHandler
+from modules.data_transfer import import_jsonl
+from modules.intent_classifier import IntentClassifier
+from modules.metrics import METRICS, Histogram
+from modules.online_learner import enable_online_learning
+from modules.reminder_scheduler import ReminderScheduler
+from modules.store_pool import DEFAULT_USER
+
+
+SAMPLE_RATE = 16000
+
+# İçe aktarılan gövde bu kadar satırlık parçalar halinde işlenir (bellekte tek parça)
+IMPORT_CHUNK_LINES = 500
+
+
+class Overloaded(Exception):
+    """Kuyruk dolu; istek kabul edilmedi."""
+
+
+class AdmissionGate:
+    def __init__(self, max_concurrent, max_waiting):
+        """
+        Aynı anda işlenen ve sırada bekleyen istek sayısını sınırlar.
+
+        Sıra doluysa yeni istek beklemeden reddedilir (503); böylece yük
+        arttığında gecikme sınırsız büyümek yerine istemciye geri basınç olur.
+
+        Args:
+            max_concurrent: Aynı anda işlenecek en fazla istek
+            max_waiting: Sırada bekleyebilecek en fazla istek
+        """
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._waiting = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def enter(self):
+        if self._semaphore.locked() and self._waiting >= self.max_waiting:
+            self.rejected += 1
+            raise Overloaded()
+
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+    def stats(self):
+        return {'waiting': self._waiting, 'rejected': self.rejected, 'max_concurrent': self.max_concurrent}
+
+
+# ============= STT WORKER SÜREÇLERİ =============
+
+_worker_stt = None
+
+
+def _init_stt_worker(model_size):
+    """Her worker sürecinde Whisper modelini bir kez yükler."""
+    global _worker_stt
+    from modules.speech_to_text import SpeechToText
+    _worker_stt = SpeechToText(model_size=model_size)
+
+
+def _pcm_to_float(pcm):
+    """16 kHz mono int16 PCM baytlarını [-1, 1] aralığında float32 diziye çevirir."""
+    return np.frombuffer(pcm, dtype='<i2').astype(np.float32) / 32768.0
+
+
+def _transcribe_pcm(pcm, language):
+    """PCM baytlarını metne çevirir (worker sürecinde çalışır)."""
+    return _worker_stt.transcribe_audio(audio_data=_pcm_to_float(pcm), language=language)
+
+
+# ============= SUNUCU =============
+
+class AssistantServer:
+    def __init__(self, assistant, stt_workers=2, model_size="base", max_concurrent=32, max_waiting=128,
+                 max_audio_waiting=16, request_timeout=30.0, max_audio_seconds=30, stt_batch=0, batch_wait=0.02,
+                 stt_tiers=None, stt_slo=3.0, max_import_bytes=256 * 1024 * 1024):
+        """
+        Asistan pipeline'ını HTTP ve WebSocket üzerinden sunar.
+
+        Sınıflandırma ve komut işleme bir thread havuzunda, CPU yoğun ses
+        tanıma ayrı bir süreç havuzunda çalışır; event loop hiçbir aşamada
+        bloklanmaz.
+
+        Args:
+            assistant: STT'siz kurulmuş Assistant (ses tanıma süreç havuzunda yapılır)
+            stt_workers: Ses tanıma süreç sayısı (0 = ses uç noktası kapalı)
+            model_size: Worker'larda yüklenecek Whisper modeli
+            max_concurrent: Aynı anda işlenecek en fazla metin komutu
+            max_waiting: Sırada bekleyebilecek en fazla metin komutu
+            max_audio_waiting: Sırada bekleyebilecek en fazla ses isteği
+            request_timeout: İstek başına süre sınırı (saniye, sıra beklemesi dahil)
+            max_audio_seconds: Tek seferde kabul edilecek en uzun ses
+            stt_batch: 0'dan büyükse süreç havuzu yerine tek modelde bu boyuta kadar
+                eşzamanlı istekleri toplayan BatchTranscriber kullanılır
+            batch_wait: Batch'i doldurmak için ilk istekten sonra bekleme (saniye)
+            stt_tiers: Verilirse bu Whisper modelleri (hızlıdan doğruya) birlikte
+                yüklenir ve p95 gecikmesi stt_slo altında kalacak şekilde yüke göre
+                seçilir; kuyruk görülebilsin diye BatchTranscriber kullanılır
+            stt_slo: Uyarlamalı seçimde p95 transkripsiyon hedefi (saniye)
+            max_import_bytes: /api/import gövdesinin en büyük boyutu; gövde akış
+                olarak okunduğu için ses isteklerinin sınırı (client_max_size)
+                bu uç noktaya uygulanmaz
+        """
+        self.assistant = assistant
+        self.request_timeout = request_timeout
+        self.max_audio_bytes = int(max_audio_seconds * SAMPLE_RATE * 2)
+        self.max_import_bytes = max_import_bytes
+        if stt_tiers:
+            stt_batch = stt_batch or 1
+
+        self.text_gate = AdmissionGate(max_concurrent, max_waiting)
+        self.audio_gate = AdmissionGate(stt_batch or max(stt_workers, 1), max_audio_waiting)
+
+        self._threads = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="server")
+        self._stt_pool = None
+        self._batcher = None
+        self._adaptive_stt = None
+        if stt_batch:
+            from modules.batch_transcriber import BatchTranscriber
+            from modules.speech_to_text import SpeechToText
+            if stt_tiers:
+                from modules.adaptive_stt import AdaptiveSpeechToText
+                stt = AdaptiveSpeechToText.load(
+                    stt_tiers, start=model_size if model_size in stt_tiers else None, slo_seconds=stt_slo
+                )
+            else:
+                stt = SpeechToText(model_size=model_size)
+            self._batcher = BatchTranscriber(stt, max_batch=stt_batch, max_wait=batch_wait)
+            if stt_tiers:
+                # Kuyruk ısınmadan ve ilk istekten önce bağlanır
+                stt.set_backlog(self._batcher.backlog)
+                stt.warmup(batched=True)
+                self._adaptive_stt = stt
+        elif stt_workers:
+            self._stt_pool = ProcessPoolExecutor(max_workers=stt_workers, initializer=_init_stt_worker,
+                                                 initargs=(model_size,))
+
+        self.latency = {'text': Histogram(), 'audio': Histogram()}
+        self.status_counts = {}
+
+    def make_app(self):
+        app = web.Application(client_max_size=self.max_audio_bytes + 1024 * 1024)
+        app.add_routes([
+            web.post('/api/command', self.handle_text),
+            web.get('/ws/audio', self.handle_audio_ws),
+            web.get('/api/reminders/fired', self.handle_fired),
+            web.post('/api/import', self.handle_import),
+            web.get('/api/feedback', self.handle_feedback_list),
+            web.post('/api/feedback', self.handle_feedback_label),
+            web.get('/health', self.handle_health),
+            web.get('/stats', self.handle_stats),
+            web.get('/metrics', self.handle_metrics),
+        ])
+        app.on_shutdown.append(self._shutdown)
+        return app
+
+    # ----- Metin komutu -----
+
+    async def handle_text(self, request):
+        """POST /api/command  {"text": "...", "user_id": "...", "request_id": "..."}"""
+        try:
+            body = await request.json()
+            text = str(body['text'])
+        except (ValueError, KeyError, TypeError):
+            return self._json({'error': "Gövde {'text': ...} biçiminde JSON olmalı"}, status=400)
+
+        status, payload = await self._timed(
+            'text', self._process_text(text, body.get('user_id'), request_id=body.get('request_id')))
+        return self._json(payload, status=status)
+
+    async def _process_text(self, text, user_id, extra_timings=None, request_id=None, speculation=None):
+        async with self.text_gate.enter():
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._threads,
+                lambda: self.assistant.process_text(text, user_id=user_id, speak=False, request_id=request_id,
+                                                    speculation=speculation))
+
+        payload = result.to_dict()
+        if extra_timings:
+            payload['timings_ms'] = {**extra_timings, **payload['timings_ms']}
+        return (200 if result.ok else 422), payload
+
+    # ----- Ses akışı -----
+
+    async def handle_audio_ws(self, request):
+        """
+        GET /ws/audio
+
+        İstemci 16 kHz mono int16 PCM baytlarını binary mesajlarla gönderir,
+        {"type": "end", "user_id": "..."} ile ifadeyi bitirir ve sonucu JSON
+        olarak alır. Aynı bağlantı ardışık ifadeler için kullanılabilir.
+
+        Cihaz üstünde artımlı tanıyıcısı olan istemciler konuşma sürerken
+        {"type": "partial", "text": "...", "user_id": "..."} gönderebilir;
+        kararlı ve yan etkisiz intent'lerin yanıtı son transkripsiyondan
+        önce hazırlanır (Assistant.speculate).
+        """
+        ws = web.WebSocketResponse(max_msg_size=self.max_audio_bytes)
+        await ws.prepare(request)
+        loop = asyncio.get_running_loop()
+
+        chunks = []
+        size = 0
+        speculation = None
+        async for msg in ws:
+            if msg.type == WSMsgType.BINARY:
+                size += len(msg.data)
+                if size > self.max_audio_bytes:
+                    await ws.send_json({'status': 413, 'error': "Ses çok uzun"})
+                    chunks, size = [], 0
+                    continue
+                chunks.append(msg.data)
+
+            elif msg.type == WSMsgType.TEXT:
+                try:
+                    control = json.loads(msg.data)
+                except ValueError:
+                    await ws.send_json({'status': 400, 'error': "Geçersiz kontrol mesajı"})
+                    continue
+
+                if control.get('type') == 'partial':
+                    if speculation is None:
+                        speculation = self.assistant.speculate(control.get('user_id'))
+                    await loop.run_in_executor(self._threads, speculation.partial, str(control.get('text', '')))
+                elif control.get('type') == 'end':
+                    pcm = b''.join(chunks)
+                    chunks, size = [], 0
+                    session, speculation = speculation, None
+                    status, payload = await self._timed(
+                        'audio', self._process_audio(pcm, control.get('user_id'), control.get('language', 'tr'),
+                                                     speculation=session))
+                    if session is not None:
+                        # Hata/zaman aşımı durumunda kullanılmamış iş atılır (kullanıldıysa boştur)
+                        session.reset()
+                    await ws.send_json({'status': status, **payload})
+                elif control.get('type') == 'reset':
+                    chunks, size = [], 0
+                    if speculation is not None:
+                        speculation.reset()
+                        speculation = None
+
+            elif msg.type == WSMsgType.ERROR:
+                break
+
+        if speculation is not None:
+            speculation.reset()
+        return ws
+
+    async def _process_audio(self, pcm, user_id, language, speculation=None):
+        if self._stt_pool is None and self._batcher is None:
+            return 503, {'error': "Ses tanıma kapalı"}
+        if len(pcm) < 2:
+            return 400, {'error': "Ses verisi yok"}
+
+        async with self.audio_gate.enter():
+            loop = asyncio.get_running_loop()
+            start = time.perf_counter()
+            if self._batcher is not None:
+                # Toplu çözümde dil sunucu başına sabittir (batch tek DecodingOptions ile çözülür)
+                text = await asyncio.wrap_future(self._batcher.submit(_pcm_to_float(pcm)))
+            else:
+                text = await loop.run_in_executor(self._stt_pool, _transcribe_pcm, pcm, language)
+            transcribe_seconds = time.perf_counter() - start
+            transcribe_ms = transcribe_seconds * 1000
+            METRICS.observe('transcribe', transcribe_seconds)
+
+        if not text:
+            return 422, {'error': "Ses tanınamadı", 'timings_ms': {'transcribe': transcribe_ms}}
+
+        return await self._process_text(text, user_id, extra_timings={'transcribe': transcribe_ms},
+                                        speculation=speculation)
+
+    # ----- Durum -----
+
+    async def handle_fired(self, request):
+        """GET /api/reminders/fired?user_id=...  Tetiklenmiş, henüz alınmamış hatırlatıcılar."""
+        scheduler = self.assistant.handler.scheduler
+        fired = scheduler.pop_fired(request.query.get('user_id')) if scheduler else []
+        return self._json({'reminders': fired})
+
+    async def handle_import(self, request):
+        """
+        POST /api/import?user_id=...  Gövde: data_transfer export çıktısı (JSON Lines).
+
+        Çalışan sunucuya aktarılan bekleyen hatırlatıcılar hemen zamanlanır;
+        komut satırından aktarılanlar sunucu yeniden başlatılınca yüklenir.
+        Gövde akış olarak okunur; max_import_bytes aşılırsa 413, UTF-8
+        olmayan satırda 400 döner (önceki parçalar aktarılmış olarak kalır).
+        """
+        user_id = request.query.get('user_id')
+        report = {'added': 0, 'duplicates': 0, 'invalid': 0, 'errors': []}
+        chunk, first_line, size = [], 1, 0
+
+        # Gövde belleğe alınmadan satır satır okunur ve parça parça aktarılır
+        try:
+            async for raw in request.content:
+                size += len(raw)
+                if size > self.max_import_bytes:
+                    return self._json({'error': f"Gövde en fazla {self.max_import_bytes} bayt olabilir",
+                                       'report': report}, status=413)
+                chunk.append(raw.decode('utf-8'))
+                if len(chunk) >= IMPORT_CHUNK_LINES:
+                    await self._import_chunk(chunk, user_id, report, first_line)
+                    first_line += len(chunk)
+                    chunk = []
+        except UnicodeDecodeError:
+            return self._json({'error': f"{first_line + len(chunk)}. satır UTF-8 değil",
+                               'report': report}, status=400)
+        except ValueError as e:
+            # aiohttp'nin satır sınırını aşan tek satır
+            return self._json({'error': f"{first_line + len(chunk)}. satır okunamadı: {e}",
+                               'report': report}, status=400)
+
+        if chunk:
+            await self._import_chunk(chunk, user_id, report, first_line)
+        return self._json(report)
+
+    async def _import_chunk(self, lines, user_id, report, first_line):
+        handler = self.assistant.handler
+        await asyncio.get_running_loop().run_in_executor(
+            self._threads,
+            lambda: import_jsonl(handler.stores, lines, user=user_id, scheduler=handler.scheduler,
+                                 report=report, first_line=first_line)
+        )
+
+    async def handle_feedback_list(self, request):
+        """GET /api/feedback?user_id=...&limit=20  Kullanıcının düzeltilmeyi bekleyen düşük güvenli ifadeleri."""
+        feedback = self.assistant.classifier.feedback
+        if feedback is None:
+            return self._json({'error': "Geri bildirim kapalı"}, status=404)
+        try:
+            limit = min(int(request.query.get('limit', 20)), 200)
+        except ValueError:
+            return self._json({'error': "limit sayı olmalı"}, status=400)
+        user_id = request.query.get('user_id')
+        payload = await asyncio.get_running_loop().run_in_executor(
+            self._threads,
+            lambda: {'pending': feedback.pending(user_id, limit), 'stats': feedback.stats(user_id or DEFAULT_USER)}
+        )
+        return self._json(payload)
+
+    async def handle_feedback_label(self, request):
+        """
+        POST /api/feedback
+
+        {"id": 12, "intent": "time", "user_id": "..."}: kullanıcının kuyruktaki ifadesini etiketler.
+        {"text": "...", "intent": "time", "user_id": "..."}: yanlış tahmin edilmiş ifadeyi doğrudan düzeltir.
+        """
+        classifier = self.assistant.classifier
+        if classifier.feedback is None:
+            return self._json({'error': "Geri bildirim kapalı"}, status=404)
+        try:
+            body = await request.json()
+            intent = str(body['intent'])
+        except (ValueError, KeyError, TypeError):
+            return self._json({'error': "Gövde {'id' veya 'text', 'intent'} biçiminde JSON olmalı"}, status=400)
+
+        if intent not in {item['tag'] for item in classifier.intents}:
+            return self._json({'error': f"Bilinmeyen intent: {intent}"}, status=422)
+
+        user_id = body.get('user_id')
+        loop = asyncio.get_running_loop()
+        # SQLite yazımı kilidi öğrenici thread'iyle paylaşır; event loop'ta beklenmez
+        if 'id' in body:
+            found = await loop.run_in_executor(
+                self._threads, lambda: classifier.label_feedback(body['id'], intent, user_id=user_id))
+            if not found:
+                return self._json({'error': "Kayıt bulunamadı"}, status=404)
+            return self._json({'id': body['id'], 'intent': intent})
+        if body.get('text'):
+            feedback_id = await loop.run_in_executor(
+                self._threads, lambda: classifier.add_correction(str(body['text']), intent, user_id=user_id))
+            return self._json({'id': feedback_id, 'intent': intent})
+        return self._json({'error': "'id' veya 'text' gerekli"}, status=400)
+
+    async def handle_health(self, request):
+        return self._json({'status': 'ok', 'stt': self._stt_pool is not None or self._batcher is not None})
+
+    async def handle_stats(self, request):
+        learner = self.assistant.classifier.learner
+        return self._json({
+            'latency_ms': {
+                kind: {
+                    'count': hist.count,
+                    'p50': hist.percentile(0.50) * 1000,
+                    'p95': hist.percentile(0.95) * 1000,
+                    'p99': hist.percentile(0.99) * 1000,
+                }
+                for kind, hist in self.latency.items()
+            },
+            'status': self.status_counts,
+            'text_gate': self.text_gate.stats(),
+            'audio_gate': self.audio_gate.stats(),
+            'stt_batch': {
+                'batches': self._batcher.batch_sizes.count,
+                'mean_size': self._batcher.mean_batch_size(),
+            } if self._batcher else None,
+            'stt_tiers': self._adaptive_stt.stats() if self._adaptive_stt else None,
+            'handlers': self.assistant.handler.registry.stats(),
+            'speculation': self.assistant.speculation_stats.to_dict(),
+            'intent_tiers': self.assistant.classifier.tier_stats(),
+            'feedback': self.assistant.classifier.feedback.stats() if self.assistant.classifier.feedback else None,
+            'online_learning': {
+                'ready': learner.ready,
+                'updates': learner.updates,
+                'last_update_ms': learner.last_update_ms,
+            } if learner else None,
+        })
+
+    async def handle_metrics(self, request):
+        """GET /metrics  Aşama süreleri (Prometheus metin biçimi)."""
+        return web.Response(body=METRICS.to_prometheus().encode('utf-8'),
+                            headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'})
+
+    # ----- Yardımcılar -----
+
+    async def _timed(self, kind, coro):
+        """İstek süre sınırını uygular, geri basınç ve zaman aşımını HTTP durumuna çevirir."""
+        start = time.perf_counter()
+        try:
+            status, payload = await asyncio.wait_for(coro, self.request_timeout)
+        except Overloaded:
+            status, payload = 503, {'error': "Sunucu meşgul, lütfen tekrar deneyin"}
+        except asyncio.TimeoutError:
+            # Not: süreç havuzuna verilmiş iş iptal edilemez, yalnızca yanıt beklenmez
+            status, payload = 504, {'error': "İstek zaman aşımına uğradı"}
+        except Exception as e:
+            print(f"❌ İstek hatası: {e}")
+            status, payload = 500, {'error': "Sunucu hatası"}
+
+        self.latency[kind].observe(time.perf_counter() - start)
+        self.status_counts[str(status)] = self.status_counts.get(str(status), 0) + 1
+        return status, payload
+
+    @staticmethod
+    def _json(payload, status=200):
+        return web.json_response(payload, status=status, dumps=lambda o: json.dumps(o, ensure_ascii=False))
+
+    async def _shutdown(self, app):
+        self._threads.shutdown(wait=False)
+        if self._stt_pool is not None:
+            self._stt_pool.shutdown(wait=False, cancel_futures=True)
+        if self._batcher is not None:
+            self._batcher.stop()
+
+
+def build_assistant():
+    """Sınıflandırıcıyı, komut işleyiciyi ve hatırlatıcı zamanlayıcısını kurar."""
+    classifier = IntentClassifier()
+    if not classifier.load_model():
+        print("📚 Model bulunamadı, eğitiliyor...")
+        classifier.train()
+        classifier.save_model()
+    enable_online_learning(classifier)
+
+    handler = CommandHandler()
+    handler.scheduler = ReminderScheduler(handler.stores)
+    handler.scheduler.start()
+
+    return Assistant(classifier, handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Asistanı HTTP/WebSocket servisi olarak çalıştırır")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--stt-workers', type=int, default=2, help="Ses tanıma süreç sayısı (0 = kapalı)")
+    parser.add_argument('--model-size', default='base', help="Whisper model boyutu")
+    parser.add_argument('--max-concurrent', type=int, default=32, help="Aynı anda işlenen metin komutu")
+    parser.add_argument('--max-waiting', type=int, default=128, help="Sırada bekleyebilecek metin komutu")
+    parser.add_argument('--max-audio-waiting', type=int, default=16, help="Sırada bekleyebilecek ses isteği")
+    parser.add_argument('--timeout', type=float, default=30.0, help="İstek başına süre sınırı (saniye)")
+    parser.add_argument('--max-audio-seconds', type=float, default=30.0)
+    parser.add_argument('--stt-batch', type=int, default=0,
+                        help="0'dan büyükse ses istekleri tek modelde bu boyuta kadar toplu çözülür")
+    parser.add_argument('--batch-wait', type=float, default=0.02, help="Batch doldurma beklemesi (saniye)")
+    parser.add_argument('--stt-tiers', help="Yüke göre seçilecek Whisper modelleri, hızlıdan doğruya (ör. tiny,base,small)")
+    parser.add_argument('--stt-slo', type=float, default=3.0, help="Uyarlamalı seçimde p95 transkripsiyon hedefi (saniye)")
+    parser.add_argument('--max-import-mb', type=float, default=256.0, help="/api/import gövdesinin en büyük boyutu (MB)")
+    args = parser.parse_args()
+
+    server = AssistantServer(
+        build_assistant(),
+        stt_workers=args.stt_workers,
+        model_size=args.model_size,
+        max_concurrent=args.max_concurrent,
+        max_waiting=args.max_waiting,
+        max_audio_waiting=args.max_audio_waiting,
+        request_timeout=args.timeout,
+        max_audio_seconds=args.max_audio_seconds,
+        stt_batch=args.stt_batch,
+        batch_wait=args.batch_wait,
+        stt_tiers=tuple(args.stt_tiers.split(',')) if args.stt_tiers else None,
+        stt_slo=args.stt_slo,
+        max_import_bytes=int(args.max_import_mb * 1024 * 1024),
+    )
+
+    print(f"✓ Sunucu http://{args.host}:{args.port} adresinde başlıyor")
+    web.run_app(server.make_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
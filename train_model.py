@@ -10,7 +10,8 @@ def main():
 
     # Classifier başlat
     print("\n📂 Komutlar yükleniyor...")
-    classifier = IntentClassifier(commands_file="data/commands.json")
+    # --stem: çekim ekleri atılarak eğitilir ("notlarımı" → "not"); ayar modelle kaydedilir
+    classifier = IntentClassifier(commands_file="data/commands.json", stem='--stem' in sys.argv)
 
     if not classifier.intents:
         print("❌ HATA: Komut dosyası bulunamadı veya boş!")